@@ -18,6 +18,13 @@ class Settings(BaseSettings):
         validation_alias="SONOS_REFRESH_TOKEN"
     )
 
+    # Send all Sonos requests (OAuth and Control API) to a stand-in server,
+    # e.g. http://127.0.0.1:8765 for benchmarks/fake_sonos.py ("" = real Sonos)
+    sonos_api_base_url: str = Field(
+        default="",
+        validation_alias="SONOS_API_BASE_URL"
+    )
+
     # API Settings
     api_secret_key: str = Field(
         default="sonos-cloud-secret-key-change-in-production",
@@ -36,6 +43,97 @@ class Settings(BaseSettings):
         validation_alias="TIMEZONE"
     )
 
+    # Persisted access token / household ID for fast cold starts ("" disables)
+    sonos_token_cache_path: str = Field(
+        default="./sonos_token_cache.json",
+        validation_alias="SONOS_TOKEN_CACHE_PATH"
+    )
+
+    # Sonos topology cache - how long a /groups response is reused (seconds)
+    group_cache_ttl: int = Field(
+        default=60,
+        validation_alias="GROUP_CACHE_TTL"
+    )
+
+    # Sonos request retry policy (429/5xx/timeouts) - backoff doubles from the base delay
+    sonos_retry_max_attempts: int = Field(
+        default=4,
+        validation_alias="SONOS_RETRY_MAX_ATTEMPTS"
+    )
+    sonos_retry_base_delay: float = Field(
+        default=0.25,
+        validation_alias="SONOS_RETRY_BASE_DELAY"
+    )
+    sonos_retry_after_cap: float = Field(
+        default=5.0,
+        validation_alias="SONOS_RETRY_AFTER_CAP"
+    )
+    sonos_request_timeout: float = Field(
+        default=10.0,
+        validation_alias="SONOS_REQUEST_TIMEOUT"
+    )
+
+    # Last-known per-player volume cache TTL (seconds)
+    volume_cache_ttl: int = Field(
+        default=120,
+        validation_alias="VOLUME_CACHE_TTL"
+    )
+
+    # Client-side token-bucket rate limiting in front of the Control API
+    sonos_rate_limit_enabled: bool = Field(
+        default=True,
+        validation_alias="SONOS_RATE_LIMIT_ENABLED"
+    )
+
+    # Shared playback status snapshot refresh cadence (seconds)
+    status_poll_interval: float = Field(
+        default=5.0,
+        validation_alias="STATUS_POLL_INTERVAL"
+    )
+    status_poll_interval_active: float = Field(
+        default=2.0,
+        validation_alias="STATUS_POLL_INTERVAL_ACTIVE"
+    )
+    status_poll_interval_idle: float = Field(
+        default=30.0,
+        validation_alias="STATUS_POLL_INTERVAL_IDLE"
+    )
+
+    # What happens when a program is started while another one is running:
+    # "preempt" (stop the running one at its next step), "queue" (run after it)
+    # or "drop_duplicate" (queue, but drop if the same program is already running/queued)
+    program_overlap_policy: str = Field(
+        default="preempt",
+        validation_alias="PROGRAM_OVERLAP_POLICY"
+    )
+
+    # Seconds before each scheduled slot to refresh the token, verify the group
+    # and prime the volume cache (0 disables pre-warming)
+    prewarm_lead_seconds: int = Field(
+        default=20,
+        validation_alias="PREWARM_LEAD_SECONDS"
+    )
+
+    # How schedule slots are fired: "cron" (one APScheduler CronTrigger per
+    # slot) or "dispatcher" (compiled weekly timetable and a single timer)
+    scheduler_mode: str = Field(
+        default="cron",
+        validation_alias="SCHEDULER_MODE"
+    )
+
+    # Seconds to wait after a schedule edit before reconciling jobs, so
+    # bursts of edits collapse into a single reload
+    schedule_reload_debounce: float = Field(
+        default=0.5,
+        validation_alias="SCHEDULE_RELOAD_DEBOUNCE"
+    )
+
+    # Max seconds a program step may spend on Sonos calls (including retries)
+    program_step_deadline: float = Field(
+        default=8.0,
+        validation_alias="PROGRAM_STEP_DEADLINE"
+    )
+
     # CORS Origins (for frontend)
     cors_origins: list[str] = ["*"]
 
@@ -179,3 +179,13 @@ DEFAULT_BLOCKS = {
         ],
     },
 }
+
+
+def default_slot_rows() -> list[tuple[str, str, str, str]]:
+    """Flatten DEFAULT_BLOCKS into (day_of_week, time, program_name, block_type) rows"""
+    return [
+        (day, time_str, program_name, block_name)
+        for day, blocks in DEFAULT_BLOCKS.items()
+        for block_name, rows in blocks.items()
+        for time_str, program_name in rows
+    ]
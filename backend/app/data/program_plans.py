@@ -0,0 +1,203 @@
+# Program definitions and the step plans compiled from them
+#
+# A program is an ordered list of steps: load a favorite, set per-speaker
+# volumes, play, then wait before the next step. Definitions are stored as
+# JSON in programs.favorite_ids; programs without a row, or whose row still
+# holds the original plain list of favorite IDs, fall back to the default
+# sequence for their type (taken from the original scripts/).
+#
+# This module has no app dependencies so the legacy program runner can
+# compile plans from the same definitions.
+import json
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+# Level used for announcement steps unless the definition says otherwise
+ANNOUNCEMENT_VOLUME = 85
+
+# Level used to mute a speaker without dropping it from the group
+MUTED_VOLUME = 1
+
+# Speakers next to the fire pit, muted for fire programs and in fire show mode
+FIRE_MUTED_SPEAKERS = ("STAGE", "RIGHT_POLE_01")
+
+# Key in a step's volume map that sets the level for all other speakers
+ALL_SPEAKERS = "*"
+
+DEFAULT_VOLUME = 75
+
+_FIRE_MUTES = {speaker: MUTED_VOLUME for speaker in FIRE_MUTED_SPEAKERS}
+
+# Default step definitions per program type. Step delays match the
+# announcement clip durations; the last step is the main playlist and plays
+# at the program's volume.
+DEFAULT_SEQUENCES = {
+    # Business Ad: 75ad.py - playlist 32 (14s), 35 (15s), then music
+    "ad": [{"favorite": "32", "delay": 14}, {"favorite": "35", "delay": 15}, {"favorite": "36"}],
+    # Flea Market Ad: 75fm.py - same as ad
+    "fm": [{"favorite": "32", "delay": 14}, {"favorite": "35", "delay": 15}, {"favorite": "36"}],
+    # Social Media: 75sm.py - playlist 30 (23s), 31 (27s), then music
+    "sm": [{"favorite": "30", "delay": 23}, {"favorite": "31", "delay": 27}, {"favorite": "36"}],
+    # Parking: 75parking.py - playlist 41 (17s), 44 (24s), then music
+    "parking": [{"favorite": "41", "delay": 17}, {"favorite": "44", "delay": 24}, {"favorite": "36"}],
+    # Gift Shop (TIGS): 75TIGS.py - playlist 43 (35s), then music
+    "TIGS": [{"favorite": "43", "delay": 35}, {"favorite": "36"}],
+    # Fire Show Ad: 85adfire.py - playlist 40 (22s), then music
+    "adfire": [
+        {"favorite": "40", "delay": 22, "volume": _FIRE_MUTES},
+        {"favorite": "36", "volume": _FIRE_MUTES},
+    ],
+    # Fire Parking: 75fireparking.py - playlist 41 (17s), 44 (24s), then music
+    "fireparking": [
+        {"favorite": "41", "delay": 17, "volume": _FIRE_MUTES},
+        {"favorite": "44", "delay": 24, "volume": _FIRE_MUTES},
+        {"favorite": "36", "volume": _FIRE_MUTES},
+    ],
+    # Pause: no steps, the runner pauses playback instead
+    "pause": [],
+}
+
+# Unknown types just start the main playlist
+FALLBACK_SEQUENCE = [{"favorite": "36"}]
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One compiled step: load a favorite, set volumes, play, then wait"""
+    favorite_id: str
+    volumes: tuple[tuple[str, int], ...]  # (player ID, level) for every speaker
+    fire_volumes: tuple[tuple[str, int], ...]  # volumes with FIRE_MUTED_SPEAKERS muted
+    delay: float
+
+
+@dataclass(frozen=True)
+class ProgramPlan:
+    """Immutable step plan for a program, built once and reused across runs"""
+    name: str
+    program_type: str
+    volume: int
+    steps: tuple[PlanStep, ...]
+    source: str  # "db" or "default"
+
+    @property
+    def is_pause(self) -> bool:
+        return self.program_type == "pause"
+
+
+def program_key(program_name: str) -> str:
+    """Normalize a program name ("65sm.py" or "65sm") to its cache/registry key"""
+    return program_name[:-3] if program_name.endswith(".py") else program_name
+
+
+def parse_program_name(program_name: str) -> tuple[int, str]:
+    """Get (volume, program_type) from a program name, e.g. "75fm.py" -> (75, "fm")"""
+    name = program_key(program_name)
+    digits = ""
+    for char in name:
+        if char.isdigit():
+            digits += char
+        else:
+            break
+    volume = int(digits) if digits else DEFAULT_VOLUME
+    return volume, name[len(digits):] or "fm"
+
+
+def default_sequence(program_type: str) -> list:
+    """Get the default step definitions for a program type"""
+    return DEFAULT_SEQUENCES.get(program_type, FALLBACK_SEQUENCE)
+
+
+def _compile_volumes(spec, default_level: int, speakers: Mapping[str, str]) -> tuple[tuple[str, int], ...]:
+    """Expand a step's volume spec into a (player ID, level) vector over all speakers
+
+    spec is None (default level), an int (level for every speaker), or a map
+    of speaker name -> level where "*" replaces the default level.
+    """
+    if spec is None:
+        spec = {}
+    elif isinstance(spec, int) and not isinstance(spec, bool):
+        spec = {ALL_SPEAKERS: spec}
+    elif not isinstance(spec, dict):
+        raise ValueError(f"Invalid volume {spec!r}")
+
+    levels = {name: spec.get(ALL_SPEAKERS, default_level) for name in speakers}
+    for name, level in spec.items():
+        if name == ALL_SPEAKERS:
+            continue
+        if name not in speakers:
+            raise ValueError(f"Unknown speaker {name!r}")
+        levels[name] = level
+
+    for name, level in levels.items():
+        if not isinstance(level, int) or isinstance(level, bool) or not 0 <= level <= 100:
+            raise ValueError(f"Invalid volume {level!r} for {name}")
+    return tuple((speakers[name], level) for name, level in levels.items())
+
+
+def _is_legacy_definition(definition) -> bool:
+    """Check for the original favorite_ids format: a plain list of favorite IDs"""
+    return isinstance(definition, list) and all(
+        isinstance(step, (str, int)) and not isinstance(step, bool) for step in definition
+    )
+
+
+def compile_plan(program_name: str, definition=None, speakers: Mapping[str, str] = None,
+                 volume: Optional[int] = None, program_type: Optional[str] = None) -> ProgramPlan:
+    """Compile a program definition into a ProgramPlan
+
+    definition is the programs.favorite_ids value - a JSON string or an
+    already-parsed list - or None for the type's default sequence. Each step
+    is an object:
+
+        {"favorite": "32", "delay": 14, "volume": 85}
+        {"favorite": "36", "volume": {"*": 90, "STAGE": 1}}
+
+    An empty list or a plain list of favorite IDs (["32", "35", "36"]) is the
+    format rows were stored in before step definitions existed. Those IDs
+    never drove playback, so such rows also get the type's default sequence.
+
+    Steps without a volume play at ANNOUNCEMENT_VOLUME, except the last
+    (main playlist) step which plays at the program's volume. volume and
+    program_type default to what the program name encodes.
+
+    Raises ValueError for malformed definitions.
+    """
+    if speakers is None:
+        raise ValueError("speakers mapping is required")
+    name_volume, name_type = parse_program_name(program_name)
+    volume = name_volume if volume is None else volume
+    program_type = program_type or name_type
+
+    source = "db"
+    if isinstance(definition, str):
+        try:
+            definition = json.loads(definition) if definition.strip() else None
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid program definition JSON: {e}")
+    if definition is None or _is_legacy_definition(definition):
+        definition = default_sequence(program_type)
+        source = "default"
+    if not isinstance(definition, list):
+        raise ValueError("Program definition must be a list of steps")
+
+    steps = []
+    for index, step in enumerate(definition):
+        if not isinstance(step, dict) or "favorite" not in step:
+            raise ValueError(f"Step {index} needs a favorite")
+        unknown = set(step) - {"favorite", "delay", "volume"}
+        if unknown:
+            raise ValueError(f"Step {index} has unknown keys: {', '.join(sorted(unknown))}")
+
+        delay = step.get("delay", 0)
+        if not isinstance(delay, (int, float)) or isinstance(delay, bool) or delay < 0:
+            raise ValueError(f"Step {index} has invalid delay {delay!r}")
+
+        is_last = index == len(definition) - 1
+        volumes = _compile_volumes(step.get("volume"), volume if is_last else ANNOUNCEMENT_VOLUME, speakers)
+        muted = {speakers[name] for name in FIRE_MUTED_SPEAKERS if name in speakers}
+        fire_volumes = tuple(
+            (player_id, MUTED_VOLUME if player_id in muted else level) for player_id, level in volumes
+        )
+        steps.append(PlanStep(str(step["favorite"]), volumes, fire_volumes, delay))
+
+    return ProgramPlan(program_key(program_name), program_type, volume, tuple(steps), source)
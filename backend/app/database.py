@@ -1,6 +1,7 @@
+import sqlite3
 import databases
 import sqlalchemy
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
 from .config import get_settings
 
 settings = get_settings()
@@ -12,7 +13,45 @@ if DATABASE_URL.startswith("sqlite:///"):
 else:
     ASYNC_DATABASE_URL = DATABASE_URL
 
-database = databases.Database(ASYNC_DATABASE_URL)
+IS_SQLITE = ASYNC_DATABASE_URL.startswith("sqlite")
+
+# Applied to every SQLite connection. WAL lets dashboard reads proceed while
+# the scheduler writes logs; NORMAL sync is durable across app crashes in WAL
+# mode. cache_size is negative KiB (64 MiB), mmap_size is bytes (256 MiB).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+
+
+def apply_sqlite_pragmas(connection):
+    """Run SQLITE_PRAGMAS on a DB-API connection"""
+    cursor = connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+class TunedSQLiteConnection(sqlite3.Connection):
+    """sqlite3 connection that applies SQLITE_PRAGMAS when opened
+
+    databases/aiosqlite open a fresh connection per acquire, so the pragmas are
+    applied through the sqlite3.connect factory rather than once at startup.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        apply_sqlite_pragmas(self)
+
+
+if IS_SQLITE:
+    database = databases.Database(ASYNC_DATABASE_URL, factory=TunedSQLiteConnection)
+else:
+    database = databases.Database(ASYNC_DATABASE_URL)
 metadata = MetaData()
 
 # Schedule Slots Table
@@ -27,6 +66,8 @@ schedule_slots = sqlalchemy.Table(
     sqlalchemy.Column("is_active", sqlalchemy.Boolean, default=True),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=sqlalchemy.func.now()),
     sqlalchemy.Column("updated_at", sqlalchemy.DateTime, default=sqlalchemy.func.now(), onupdate=sqlalchemy.func.now()),
+    sqlalchemy.Index("ix_schedule_slots_day_time", "day_of_week", "time"),
+    sqlalchemy.Index("ix_schedule_slots_is_active", "is_active"),
 )
 
 # Programs Table
@@ -37,9 +78,10 @@ programs = sqlalchemy.Table(
     sqlalchemy.Column("name", sqlalchemy.String(50), unique=True, nullable=False),
     sqlalchemy.Column("volume", sqlalchemy.Integer, nullable=False),
     sqlalchemy.Column("program_type", sqlalchemy.String(20), nullable=False),
-    sqlalchemy.Column("favorite_ids", sqlalchemy.String(100)),  # JSON array as string
+    sqlalchemy.Column("favorite_ids", sqlalchemy.Text),  # JSON step definition (see data/program_plans.py)
     sqlalchemy.Column("description", sqlalchemy.String(255)),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=sqlalchemy.func.now()),
+    sqlalchemy.Column("updated_at", sqlalchemy.DateTime, default=sqlalchemy.func.now(), onupdate=sqlalchemy.func.now()),
 )
 
 # Execution Logs Table
@@ -51,6 +93,14 @@ execution_logs = sqlalchemy.Table(
     sqlalchemy.Column("executed_at", sqlalchemy.DateTime, default=sqlalchemy.func.now()),
     sqlalchemy.Column("status", sqlalchemy.String(20), nullable=False),
     sqlalchemy.Column("error_message", sqlalchemy.String(500)),
+    sqlalchemy.Column("started_at", sqlalchemy.DateTime),  # When the executor began the run
+    sqlalchemy.Column("finished_at", sqlalchemy.DateTime),
+    # Start timing - scheduled fire time vs. handler entry and first Sonos acks
+    sqlalchemy.Column("scheduled_at", sqlalchemy.DateTime),
+    sqlalchemy.Column("handler_at", sqlalchemy.DateTime),
+    sqlalchemy.Column("first_load_at", sqlalchemy.DateTime),
+    sqlalchemy.Column("first_play_at", sqlalchemy.DateTime),
+    sqlalchemy.Index("ix_execution_logs_executed_at", "executed_at"),
 )
 
 # Settings Table
@@ -65,10 +115,71 @@ app_settings = sqlalchemy.Table(
 # Create engine for table creation
 sync_engine = create_engine(DATABASE_URL.replace("+aiosqlite", ""))
 
+if IS_SQLITE:
+    @event.listens_for(sync_engine, "connect")
+    def _on_sync_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection)
+
 
 def create_tables():
     """Create all tables in the database"""
     metadata.create_all(sync_engine)
+    add_missing_columns()
+    add_missing_indexes()
+
+
+def add_missing_columns():
+    """Add columns defined in metadata but missing from existing tables
+
+    create_all() only creates new tables, so columns added to a table
+    definition later are added here with ALTER TABLE.
+    """
+    inspector = sqlalchemy.inspect(sync_engine)
+    with sync_engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=sync_engine.dialect)
+                    conn.execute(sqlalchemy.text(
+                        f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                    ))
+
+
+def add_missing_indexes():
+    """Create indexes defined in metadata but missing from existing tables"""
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_engine, checkfirst=True)
+
+
+async def bulk_insert_schedule_slots(rows: list[tuple[str, str, str, str]], replace: bool = False):
+    """Insert (day_of_week, time, program_name, block_type) slot rows in one transaction
+
+    With replace=True existing slots are deleted first, in the same transaction.
+    On SQLite the rows go through a single executemany on the driver connection
+    rather than one statement round trip per row.
+    """
+    async with database.transaction():
+        if replace:
+            await database.execute(schedule_slots.delete())
+        connection = database.connection()
+        if database.url.dialect == "sqlite":
+            await connection.raw_connection.executemany(
+                "INSERT INTO schedule_slots "
+                "(day_of_week, time, program_name, block_type, is_active, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+                rows
+            )
+        else:
+            await connection.execute_many(
+                schedule_slots.insert(),
+                [
+                    {"day_of_week": day, "time": time_str, "program_name": program_name,
+                     "block_type": block_type, "is_active": True}
+                    for day, time_str, program_name, block_type in rows
+                ]
+            )
 
 
 async def connect_db():
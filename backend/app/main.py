@@ -2,9 +2,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import time
 
 from .config import get_settings
-from .database import database, create_tables, schedule_slots
+from .database import database, create_tables, bulk_insert_schedule_slots
 from .routes import (
     schedule_router,
     playback_router,
@@ -12,9 +13,12 @@ from .routes import (
     favorites_router,
     programs_router,
     system_router,
+    events_router,
 )
 from .services.scheduler_service import scheduler_service
-from .data.default_schedule import DEFAULT_BLOCKS
+from .services.sonos_api import sonos_api
+from .services.status_poller import status_poller
+from .data.default_schedule import default_slot_rows
 
 # Configure logging
 logging.basicConfig(
@@ -32,18 +36,10 @@ async def initialize_default_schedule():
     count = await database.fetch_val("SELECT COUNT(*) FROM schedule_slots")
     if count == 0:
         logger.info("Initializing default schedule...")
-        for day, blocks in DEFAULT_BLOCKS.items():
-            for block_name, rows in blocks.items():
-                for time_str, program_name in rows:
-                    query = schedule_slots.insert().values(
-                        day_of_week=day,
-                        time=time_str,
-                        program_name=program_name,
-                        block_type=block_name,
-                        is_active=True
-                    )
-                    await database.execute(query)
-        logger.info("Default schedule initialized")
+        started = time.perf_counter()
+        rows = default_slot_rows()
+        await bulk_insert_schedule_slots(rows)
+        logger.info(f"Default schedule initialized: {len(rows)} slots in {(time.perf_counter() - started) * 1000:.1f}ms")
 
 
 @asynccontextmanager
@@ -68,11 +64,20 @@ async def lifespan(app: FastAPI):
     await scheduler_service.load_schedule_from_db()
     logger.info("Scheduler started and loaded")
 
+    # Keep the Sonos access token renewed ahead of expiry
+    sonos_api.start_token_renewal()
+
+    # Keep one shared playback status snapshot for all dashboard clients
+    status_poller.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Sonos Cloud Backend...")
     scheduler_service.stop()
+    await status_poller.stop()
+    await sonos_api.stop_token_renewal()
+    await sonos_api.close()
     await database.disconnect()
     logger.info("Shutdown complete")
 
@@ -101,6 +106,7 @@ app.include_router(speakers_router, prefix="/api/v1")
 app.include_router(favorites_router, prefix="/api/v1")
 app.include_router(programs_router, prefix="/api/v1")
 app.include_router(system_router, prefix="/api/v1")
+app.include_router(events_router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -124,6 +130,7 @@ async def api_root():
             "speakers": "/api/v1/speakers",
             "favorites": "/api/v1/favorites",
             "programs": "/api/v1/programs",
-            "system": "/api/v1/system"
+            "system": "/api/v1/system",
+            "events": "/api/v1/events"
         }
     }
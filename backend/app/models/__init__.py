@@ -1,4 +1,6 @@
-from .schedule import ScheduleSlot, ScheduleSlotCreate, ScheduleSlotUpdate, DaySchedule
+from .schedule import (
+    ScheduleSlot, ScheduleSlotCreate, ScheduleSlotUpdate, ScheduleBatchOperation, ScheduleBatch, DaySchedule
+)
 from .program import Program, ProgramCreate
 from .playback import PlaybackStatus, PlaybackCommand, VolumeCommand, PlayFavoriteCommand
 from .speaker import Speaker, SpeakerVolume, AllSpeakersVolume
@@ -7,6 +9,8 @@ __all__ = [
     "ScheduleSlot",
     "ScheduleSlotCreate",
     "ScheduleSlotUpdate",
+    "ScheduleBatchOperation",
+    "ScheduleBatch",
     "DaySchedule",
     "Program",
     "ProgramCreate",
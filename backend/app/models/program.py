@@ -7,7 +7,7 @@ class ProgramBase(BaseModel):
     name: str
     volume: int
     program_type: str  # ad, fm, sm, parking, TIGS, adfire, fireparking, pause
-    favorite_ids: Optional[str] = None  # JSON array as string
+    favorite_ids: Optional[str] = None  # JSON step definition, None for the type's defaults
     description: Optional[str] = None
 
 
@@ -18,6 +18,7 @@ class ProgramCreate(ProgramBase):
 class Program(ProgramBase):
     id: int
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 
@@ -31,6 +31,20 @@ class ScheduleSlot(ScheduleSlotBase):
         from_attributes = True
 
 
+class ScheduleBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    day: Optional[str] = None  # Required for create
+    slot_id: Optional[int] = None  # Required for update/delete
+    time: Optional[str] = None  # HH:MM format
+    program_name: Optional[str] = None
+    block_type: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+class ScheduleBatch(BaseModel):
+    operations: list[ScheduleBatchOperation]
+
+
 class DaySchedule(BaseModel):
     day: str
     slots: list[ScheduleSlot]
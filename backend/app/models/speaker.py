@@ -8,6 +8,7 @@ class Speaker(BaseModel):
     is_online: bool = True
     is_grouped: bool = False
     volume: Optional[int] = None
+    volume_age: Optional[float] = None  # Seconds since the volume was last confirmed
 
 
 class SpeakerVolume(BaseModel):
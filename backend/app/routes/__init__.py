@@ -4,6 +4,7 @@ from .speakers import router as speakers_router
 from .favorites import router as favorites_router
 from .programs import router as programs_router
 from .system import router as system_router
+from .events import router as events_router
 
 __all__ = [
     "schedule_router",
@@ -12,4 +13,5 @@ __all__ = [
     "favorites_router",
     "programs_router",
     "system_router",
+    "events_router",
 ]
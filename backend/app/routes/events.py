@@ -0,0 +1,52 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+from ..services.event_bus import event_bus
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Seconds between heartbeat comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+def format_event(event: dict) -> str:
+    """Format an event as a Server-Sent Events message"""
+    payload = json.dumps({**event["data"], "timestamp": event["timestamp"]})
+    return f"id: {event_bus.format_id(event['id'])}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+@router.get("")
+async def stream_events(request: Request, last_event_id: Optional[str] = Header(default=None)):
+    """Server-Sent Events stream of playback, scheduler and speaker state changes
+
+    Event types: playback, program_started, program_finished, fire_show,
+    pause, volume, topology. Reconnecting clients send Last-Event-ID to
+    receive the events they missed; after a server restart they get a
+    resync event instead and should refetch their state.
+    """
+    queue, missed = event_bus.subscribe(last_event_id)
+
+    async def generate():
+        try:
+            # Tell the browser how long to wait before reconnecting
+            yield "retry: 3000\n\n"
+            for event in missed:
+                yield format_event(event)
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+                    yield format_event(event)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+        finally:
+            event_bus.unsubscribe(queue)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
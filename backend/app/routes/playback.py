@@ -2,65 +2,46 @@ from fastapi import APIRouter, HTTPException
 from ..models import PlaybackStatus, PlaybackCommand, VolumeCommand, PlayFavoriteCommand
 from ..services.sonos_api import sonos_api
 from ..services.scheduler_service import scheduler_service
+from ..services.rate_limiter import RateLimitedError
+from ..services.status_poller import status_poller
 
 router = APIRouter(prefix="/playback", tags=["playback"])
 
 
 @router.get("/status")
 async def get_playback_status():
-    """Get current playback status"""
-    try:
-        # Get current group
-        group_id = await sonos_api.ensure_group()
+    """Get current playback status
 
-        # Get playback info
-        status = await sonos_api.get_playback_status(group_id)
+    Sonos state comes from the shared snapshot kept by the status poller;
+    snapshot_age is how many seconds old it is.
+    """
+    try:
+        snapshot, snapshot_age = await status_poller.get_snapshot()
 
         # Get next scheduled item
         next_job = scheduler_service.get_next_job()
 
-        is_playing = status.get("playbackState") == "PLAYBACK_STATE_PLAYING"
-
-        # Try to get track metadata (may fail if nothing playing)
-        track_name = None
-        artist = None
-        album = None
-        image_url = None
-        container_name = None
-
-        try:
-            metadata = await sonos_api.get_playback_metadata(group_id)
-            current_item = metadata.get("currentItem", {})
-            track = current_item.get("track", {})
-            track_name = track.get("name")
-            artist_info = track.get("artist")
-            artist = artist_info.get("name") if isinstance(artist_info, dict) else None
-            album_info = track.get("album")
-            album = album_info.get("name") if isinstance(album_info, dict) else None
-            image_url = track.get("imageUrl")
-            container = metadata.get("container", {})
-            container_name = container.get("name") if isinstance(container, dict) else None
-        except Exception:
-            pass  # Metadata not available, continue without it
-
         # Get pause status
         pause_status = scheduler_service.get_pause_status()
 
         return {
-            "is_playing": is_playing,
+            "is_playing": snapshot["is_playing"],
             "current_program": scheduler_service.current_program,
-            "track_name": track_name,
-            "artist": artist,
-            "album": album,
-            "image_url": image_url,
-            "station": container_name,
+            "track_name": snapshot["track_name"],
+            "artist": snapshot["artist"],
+            "album": snapshot["album"],
+            "image_url": snapshot["image_url"],
+            "station": snapshot["station"],
             "current_volume": None,
-            "group_id": group_id,
+            "group_id": snapshot["group_id"],
             "next_scheduled": next_job["program"] if next_job else None,
             "next_scheduled_time": f"{next_job['day']} {next_job['time']}" if next_job else None,
             "is_paused_until_midnight": pause_status["is_paused"],
-            "paused_until": pause_status["paused_until_display"]
+            "paused_until": pause_status["paused_until_display"],
+            "snapshot_age": round(snapshot_age, 1)
         }
+    except RateLimitedError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -75,18 +56,20 @@ async def play(command: PlaybackCommand = None):
         group_id = await sonos_api.ensure_group()
 
         if command and command.program_name:
-            # Run specific program (manual trigger)
-            await scheduler_service.run_program(command.program_name, manual=True)
-            return {"message": f"Playing program: {command.program_name}"}
+            # Run specific program in the background (manual trigger)
+            job = scheduler_service.submit_program(command.program_name, manual=True)
+            return {"message": f"Playing program: {command.program_name}", "job_id": job.id}
 
         if command and command.favorite_id:
             # Play specific favorite
             await sonos_api.load_favorite(group_id, command.favorite_id)
             await sonos_api.play(group_id)
+            status_poller.request_refresh()
             return {"message": f"Playing favorite: {command.favorite_id}"}
 
         # Just resume playback
         await sonos_api.play(group_id)
+        status_poller.request_refresh()
         return {"message": "Playback started"}
 
     except Exception as e:
@@ -101,6 +84,7 @@ async def play_favorite(command: PlayFavoriteCommand):
             command.favorite_id,
             command.volume or 75
         )
+        status_poller.request_refresh()
         return {"message": f"Playing favorite {command.favorite_id} at volume {command.volume}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -111,6 +95,7 @@ async def pause():
     """Pause all playback until midnight (or until play is pressed)"""
     try:
         result = await scheduler_service.pause_until_midnight()
+        status_poller.request_refresh()
         return {"message": result["message"], "paused_until": result["paused_until"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -123,7 +108,7 @@ async def set_volume(command: VolumeCommand):
         if command.volume < 0 or command.volume > 100:
             raise HTTPException(status_code=400, detail="Volume must be between 0 and 100")
 
-        await sonos_api.set_all_volumes(command.volume)
+        await sonos_api.set_all_volumes(command.volume, force=True)
         return {"message": f"Volume set to {command.volume}"}
 
     except Exception as e:
@@ -140,8 +125,8 @@ async def skip_to_next():
 
         # Clear pause state since user is manually starting playback
         scheduler_service.resume_playback()
-        await scheduler_service.run_program(next_job["program"], manual=True)
-        return {"message": f"Skipped to: {next_job['program']}"}
+        job = scheduler_service.submit_program(next_job["program"], manual=True)
+        return {"message": f"Skipped to: {next_job['program']}", "job_id": job.id}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,11 +134,39 @@ async def skip_to_next():
 
 @router.post("/run-program/{program_name}")
 async def run_program(program_name: str):
-    """Run a specific program immediately (manual trigger, ignores pause state)"""
+    """Start a program immediately in the background (manual trigger, ignores pause state)
+
+    Returns a job ID; poll GET /playback/jobs/{job_id} for per-step progress.
+    """
     try:
         # Clear pause state since user is manually starting playback
         scheduler_service.resume_playback()
-        await scheduler_service.run_program(program_name, manual=True)
-        return {"message": f"Running program: {program_name}"}
+        job = scheduler_service.submit_program(program_name, manual=True)
+        return {"message": f"Running program: {program_name}", "job_id": job.id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs")
+async def list_jobs():
+    """List recent program jobs (manual and scheduled), newest first"""
+    jobs = sorted(scheduler_service.jobs.values(), key=lambda j: j.created_at, reverse=True)
+    return {"jobs": [job.to_dict() for job in jobs]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get status and per-step progress of a background program job"""
+    job = scheduler_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a running background program job"""
+    job = await scheduler_service.cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"message": f"Cancel requested for job {job_id}", "status": job.status}
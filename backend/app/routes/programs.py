@@ -1,7 +1,12 @@
 from fastapi import APIRouter, HTTPException
 from pathlib import Path
+from ..config import get_settings
 from ..database import database, programs
 from ..models import Program, ProgramCreate
+from ..data.program_plans import compile_plan
+from ..services.program_registry import program_registry
+
+settings = get_settings()
 
 router = APIRouter(prefix="/programs", tags=["programs"])
 
@@ -118,6 +123,42 @@ async def get_volume_presets():
     }
 
 
+def _validate_definition(program: ProgramCreate):
+    """Compile the program's definition, rejecting it with a 400 if invalid"""
+    try:
+        compile_plan(
+            program.name, program.favorite_ids, speakers=settings.speakers,
+            volume=program.volume, program_type=program.program_type
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid program definition: {e}")
+
+
+@router.get("/{program_name}/plan")
+async def get_program_plan(program_name: str):
+    """Get the compiled step plan a program runs (from its row or type defaults)"""
+    try:
+        plan = await program_registry.get_plan(program_name)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=f"Invalid program definition: {e}")
+    players = {player_id: name for name, player_id in settings.speakers.items()}
+    return {
+        "name": plan.name,
+        "program_type": plan.program_type,
+        "volume": plan.volume,
+        "source": plan.source,
+        "is_pause": plan.is_pause,
+        "steps": [
+            {
+                "favorite_id": step.favorite_id,
+                "delay": step.delay,
+                "volumes": {players.get(player_id, player_id): level for player_id, level in step.volumes},
+            }
+            for step in plan.steps
+        ],
+    }
+
+
 @router.post("")
 async def create_program(program: ProgramCreate):
     """Create a new program entry"""
@@ -127,6 +168,7 @@ async def create_program(program: ProgramCreate):
     )
     if existing:
         raise HTTPException(status_code=400, detail="Program already exists")
+    _validate_definition(program)
 
     query = programs.insert().values(
         name=program.name,
@@ -136,6 +178,7 @@ async def create_program(program: ProgramCreate):
         description=program.description
     )
     last_id = await database.execute(query)
+    program_registry.invalidate(program.name)
 
     return Program(
         id=last_id,
@@ -145,3 +188,43 @@ async def create_program(program: ProgramCreate):
         favorite_ids=program.favorite_ids,
         description=program.description
     )
+
+
+@router.put("/{program_name}")
+async def update_program(program_name: str, program: ProgramCreate):
+    """Replace a program entry; its cached plan is recompiled on next run"""
+    existing = await program_registry.fetch_row(program_name)
+    if not existing:
+        raise HTTPException(status_code=404, detail="Program not found")
+    # Renaming onto another program (stored with or without ".py") would hit the unique name
+    other = await program_registry.fetch_row(program.name)
+    if other and other["id"] != existing["id"]:
+        raise HTTPException(status_code=400, detail="Program already exists")
+    _validate_definition(program)
+
+    await database.execute(
+        programs.update().where(programs.c.id == existing["id"]).values(
+            name=program.name,
+            volume=program.volume,
+            program_type=program.program_type,
+            favorite_ids=program.favorite_ids,
+            description=program.description
+        )
+    )
+    program_registry.invalidate(existing["name"])
+    program_registry.invalidate(program.name)
+
+    row = await database.fetch_one(programs.select().where(programs.c.id == existing["id"]))
+    return Program(**dict(row))
+
+
+@router.delete("/{program_name}")
+async def delete_program(program_name: str):
+    """Delete a program entry; the program falls back to its type's default sequence"""
+    existing = await program_registry.fetch_row(program_name)
+    if not existing:
+        raise HTTPException(status_code=404, detail="Program not found")
+
+    await database.execute(programs.delete().where(programs.c.id == existing["id"]))
+    program_registry.invalidate(existing["name"])
+    return {"message": f"Program {existing['name']} deleted"}
@@ -1,45 +1,79 @@
-from fastapi import APIRouter, HTTPException
+import logging
+import time
+from fastapi import APIRouter, Header, HTTPException, Response
 from typing import Optional
-from ..database import database, schedule_slots
-from ..models import ScheduleSlot, ScheduleSlotCreate, ScheduleSlotUpdate, DaySchedule
+from ..database import database, schedule_slots, bulk_insert_schedule_slots
+from ..models import ScheduleSlot, ScheduleSlotCreate, ScheduleSlotUpdate, ScheduleBatch, DaySchedule
 from ..services.scheduler_service import scheduler_service
+from ..services.schedule_cache import schedule_cache, WEEKLY
+from ..services.program_registry import program_registry
 
 router = APIRouter(prefix="/schedule", tags=["schedule"])
+logger = logging.getLogger(__name__)
 
 DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
 
 
+async def _cached_response(key: str, if_none_match: Optional[str]) -> Response:
+    """Serve a cached schedule payload, or 304 if the client's copy is current"""
+    if schedule_cache.matches(key, if_none_match):
+        return Response(status_code=304, headers={"ETag": schedule_cache.etag(key)})
+    payload, etag = await schedule_cache.get_payload(key)
+    # no-cache: browsers keep the copy but revalidate it with If-None-Match
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
 @router.get("", response_model=dict)
-async def get_full_schedule():
+async def get_full_schedule(if_none_match: Optional[str] = Header(default=None)):
     """Get the complete weekly schedule"""
-    query = schedule_slots.select().order_by(schedule_slots.c.time)
-    rows = await database.fetch_all(query)
+    return await _cached_response(WEEKLY, if_none_match)
 
-    schedule = {day: [] for day in DAYS}
-    for row in rows:
-        day = row["day_of_week"].lower()
-        if day in schedule:
-            schedule[day].append(ScheduleSlot(**dict(row)))
 
-    return schedule
+# Fixed paths must be declared before the /{day} routes, which would match them first
+@router.post("/reset")
+async def reset_schedule():
+    """Reset schedule to default (from original scheduler.py)"""
+    from ..data.default_schedule import default_slot_rows
+
+    # Replace existing schedule with the defaults in one transaction
+    started = time.perf_counter()
+    rows = default_slot_rows()
+    await bulk_insert_schedule_slots(rows, replace=True)
+    schedule_cache.bump()
+    inserted_ms = (time.perf_counter() - started) * 1000
+
+    # Reload scheduler
+    await scheduler_service.load_schedule_from_db()
+    logger.info(
+        f"Schedule reset: {len(rows)} slots inserted in {inserted_ms:.1f}ms, "
+        f"reconciled in {scheduler_service.last_reconcile['duration_ms']}ms"
+    )
+
+    return {"message": "Schedule reset to default"}
+
+
+@router.post("/reload")
+async def reload_schedule():
+    """Reload schedule and program definitions from database into scheduler"""
+    # The database may have been edited outside the API
+    schedule_cache.bump()
+    program_registry.invalidate()
+    job_count = await scheduler_service.load_schedule_from_db()
+    return {"message": f"Reloaded {job_count} jobs", "reconcile": scheduler_service.last_reconcile}
 
 
 @router.get("/{day}", response_model=DaySchedule)
-async def get_day_schedule(day: str):
+async def get_day_schedule(day: str, if_none_match: Optional[str] = Header(default=None)):
     """Get schedule for a specific day"""
     day = day.lower()
     if day not in DAYS:
         raise HTTPException(status_code=400, detail=f"Invalid day. Must be one of: {DAYS}")
 
-    query = schedule_slots.select().where(
-        schedule_slots.c.day_of_week == day
-    ).order_by(schedule_slots.c.time)
-    rows = await database.fetch_all(query)
-
-    return DaySchedule(
-        day=day,
-        slots=[ScheduleSlot(**dict(row)) for row in rows]
-    )
+    return await _cached_response(day, if_none_match)
 
 
 @router.post("/{day}", response_model=ScheduleSlot)
@@ -67,9 +101,10 @@ async def add_schedule_slot(day: str, slot: ScheduleSlotCreate):
         is_active=slot.is_active
     )
     last_id = await database.execute(query)
+    schedule_cache.bump()
 
-    # Reload scheduler
-    await scheduler_service.load_schedule_from_db()
+    # Reconcile scheduler (debounced)
+    scheduler_service.request_reload()
 
     return ScheduleSlot(
         id=last_id,
@@ -109,9 +144,10 @@ async def update_schedule_slot(day: str, slot_id: int, slot: ScheduleSlotUpdate)
             schedule_slots.c.id == slot_id
         ).values(**update_data)
         await database.execute(query)
+        schedule_cache.bump()
 
-    # Reload scheduler
-    await scheduler_service.load_schedule_from_db()
+    # Reconcile scheduler (debounced)
+    scheduler_service.request_reload()
 
     # Fetch updated record
     updated = await database.fetch_one(
@@ -131,43 +167,122 @@ async def delete_schedule_slot(day: str, slot_id: int):
 
     query = schedule_slots.delete().where(schedule_slots.c.id == slot_id)
     await database.execute(query)
+    schedule_cache.bump()
 
-    # Reload scheduler
-    await scheduler_service.load_schedule_from_db()
+    # Reconcile scheduler (debounced)
+    scheduler_service.request_reload()
 
     return {"message": "Slot deleted successfully"}
 
 
-@router.post("/reset")
-async def reset_schedule():
-    """Reset schedule to default (from original scheduler.py)"""
-    # This will be populated during initialization
-    from ..data.default_schedule import DEFAULT_BLOCKS
-
-    # Clear existing schedule
-    await database.execute(schedule_slots.delete())
-
-    # Insert default schedule
-    for day, blocks in DEFAULT_BLOCKS.items():
-        for block_name, rows in blocks.items():
-            for time_str, program_name in rows:
-                query = schedule_slots.insert().values(
-                    day_of_week=day,
-                    time=time_str,
-                    program_name=program_name,
-                    block_type=block_name,
-                    is_active=True
+def _validate_time(time_str: str, index: int) -> str:
+    """Reject times the scheduler could not parse as HH:MM; returns the zero-padded time
+
+    Slot times are compared and sorted as strings, so "3:5" must be stored as "03:05".
+    """
+    try:
+        hour, minute = map(int, time_str.split(":"))
+        valid = 0 <= hour < 24 and 0 <= minute < 60
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail=f"Operation {index}: invalid time {time_str!r}, expected HH:MM")
+    return f"{hour:02d}:{minute:02d}"
+
+
+@router.patch("/batch")
+async def batch_edit_schedule(batch: ScheduleBatch):
+    """Apply create/update/delete operations across days atomically
+
+    Operations are applied in order to an in-memory copy of the schedule and
+    checked for time conflicts before anything is written. All writes happen
+    in one transaction followed by a single scheduler reconcile.
+    """
+    if not batch.operations:
+        return {"created": [], "updated": [], "deleted": [], "reconcile": scheduler_service.last_reconcile}
+
+    rows = await database.fetch_all(schedule_slots.select())
+    slots = {row["id"]: dict(row) for row in rows}
+
+    creates: list[dict] = []
+    updates: dict[int, dict] = {}
+    deletes: set[int] = set()
+
+    for index, op in enumerate(batch.operations):
+        if op.op == "create":
+            day = (op.day or "").lower()
+            if day not in DAYS:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: invalid day. Must be one of: {DAYS}")
+            if op.time is None or op.program_name is None or op.block_type is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Operation {index}: create requires time, program_name and block_type"
+                )
+            creates.append({
+                "day_of_week": day,
+                "time": _validate_time(op.time, index),
+                "program_name": op.program_name,
+                "block_type": op.block_type,
+                "is_active": True if op.is_active is None else op.is_active,
+            })
+            continue
+
+        if op.slot_id is None or op.slot_id not in slots:
+            raise HTTPException(status_code=404, detail=f"Operation {index}: slot {op.slot_id} not found")
+
+        if op.op == "delete":
+            del slots[op.slot_id]
+            updates.pop(op.slot_id, None)
+            deletes.add(op.slot_id)
+            continue
+
+        # Update
+        update_data = {
+            field: getattr(op, field)
+            for field in ("time", "program_name", "block_type", "is_active")
+            if getattr(op, field) is not None
+        }
+        if op.day is not None:
+            update_data["day_of_week"] = op.day.lower()
+            if update_data["day_of_week"] not in DAYS:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: invalid day. Must be one of: {DAYS}")
+        if "time" in update_data:
+            update_data["time"] = _validate_time(update_data["time"], index)
+        slots[op.slot_id].update(update_data)
+        updates.setdefault(op.slot_id, {}).update(update_data)
+
+    # Time conflicts - a created or updated slot may not share a day and time with another slot
+    occupied: dict[tuple[str, str], object] = {}
+    touched = [(slot_id, slots[slot_id]) for slot_id in updates] + [(None, slot) for slot in creates]
+    touched_ids = set(updates)
+    for slot_id, slot in slots.items():
+        if slot_id not in touched_ids:
+            occupied.setdefault((slot["day_of_week"].lower(), slot["time"]), slot_id)
+    for slot_id, slot in touched:
+        key = (slot["day_of_week"].lower(), slot["time"])
+        if key in occupied:
+            raise HTTPException(status_code=400, detail=f"Slot already exists at {key[1]} on {key[0]}")
+        occupied[key] = slot_id
+
+    created_ids = []
+    async with database.transaction():
+        if deletes:
+            await database.execute(schedule_slots.delete().where(schedule_slots.c.id.in_(deletes)))
+        for slot_id, update_data in updates.items():
+            if update_data:
+                await database.execute(
+                    schedule_slots.update().where(schedule_slots.c.id == slot_id).values(**update_data)
                 )
-                await database.execute(query)
+        for slot in creates:
+            created_ids.append(await database.execute(schedule_slots.insert().values(**slot)))
+    schedule_cache.bump()
 
-    # Reload scheduler
+    # One reconcile for the whole batch
     await scheduler_service.load_schedule_from_db()
 
-    return {"message": "Schedule reset to default"}
-
-
-@router.post("/reload")
-async def reload_schedule():
-    """Reload schedule from database into scheduler"""
-    job_count = await scheduler_service.load_schedule_from_db()
-    return {"message": f"Reloaded {job_count} jobs"}
+    return {
+        "created": [ScheduleSlot(id=slot_id, **slot) for slot_id, slot in zip(created_ids, creates)],
+        "updated": [ScheduleSlot(**slots[slot_id]) for slot_id in updates],
+        "deleted": sorted(deletes),
+        "reconcile": scheduler_service.last_reconcile,
+    }
@@ -2,6 +2,7 @@ import asyncio
 from fastapi import APIRouter, HTTPException
 from ..models import Speaker, SpeakerVolume, AllSpeakersVolume
 from ..services.sonos_api import sonos_api
+from ..services.rate_limiter import RateLimitedError, PRIORITY_POLL
 from ..config import get_settings
 
 router = APIRouter(prefix="/speakers", tags=["speakers"])
@@ -10,13 +11,19 @@ settings = get_settings()
 
 @router.get("", response_model=list[Speaker])
 async def get_speakers():
-    """Get all speakers with their status and live volumes"""
+    """Get all speakers with their status and volumes
+
+    Volumes come from the last-known volume cache where fresh; only players
+    without a fresh entry are queried live. volume_age reports staleness.
+    """
     try:
-        # Get groups and volumes in parallel
-        groups, volumes = await asyncio.gather(
-            sonos_api.get_groups(),
-            sonos_api.get_all_volumes()
-        )
+        # Get groups and volumes in parallel - polled by the UI, so shed first
+        with sonos_api.priority(PRIORITY_POLL):
+            groups, volumes = await asyncio.gather(
+                sonos_api.get_groups(),
+                sonos_api.get_all_volumes(use_cache=True)
+            )
+        volume_ages = sonos_api.get_volume_ages()
 
         # Build set of all grouped player IDs
         grouped_players = set()
@@ -30,11 +37,14 @@ async def get_speakers():
                 name=name,
                 is_online=player_id in grouped_players,
                 is_grouped=len(grouped_players) == len(settings.speakers),
-                volume=volumes.get(name)  # Live volume from Sonos
+                volume=volumes.get(name),
+                volume_age=volume_ages.get(name)
             ))
 
         return speakers
 
+    except RateLimitedError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -101,7 +111,7 @@ async def set_all_speakers_volume(command: AllSpeakersVolume):
         raise HTTPException(status_code=400, detail="Volume must be between 0 and 100")
 
     try:
-        await sonos_api.set_all_volumes(command.volume)
+        await sonos_api.set_all_volumes(command.volume, force=True)
         return {"message": f"All speakers set to volume {command.volume}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+import base64
+import csv
+import io
+import json
+import math
+from typing import Optional
 import pytz
+from sqlalchemy import and_, literal, tuple_
 from ..database import database, execution_logs
 from ..services.scheduler_service import scheduler_service
 from ..services.sonos_api import sonos_api
+from ..services.schedule_cache import schedule_cache
+from ..services.program_registry import program_registry
+from ..services.legacy_import import import_legacy, LegacyImportError, SCHEDULE_FILES
 from ..config import get_settings
 
 router = APIRouter(prefix="/system", tags=["system"])
@@ -41,25 +52,216 @@ async def get_system_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/logs")
-async def get_execution_logs(limit: int = 50):
-    """Get recent execution logs"""
-    query = execution_logs.select().order_by(
-        execution_logs.c.executed_at.desc()
+# Rows fetched per query while streaming a log export
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id", "program_name", "executed_at", "status", "error_message",
+    "started_at", "finished_at", "scheduled_at", "first_play_at",
+]
+
+
+def _to_venue_time(value: Optional[datetime]) -> Optional[datetime]:
+    """Express a filter time as naive venue-local time, as executed_at is stored"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(pytz.timezone(settings.timezone)).replace(tzinfo=None)
+
+
+def _encode_cursor(row) -> str:
+    """Opaque keyset cursor for the (executed_at, id) position of a row"""
+    raw = f"{row['executed_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        executed_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(executed_at), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _log_filters(status: Optional[str], program: Optional[str],
+                 since: Optional[datetime], until: Optional[datetime]) -> list:
+    """WHERE clauses for the log filters; status accepts a comma-separated list"""
+    filters = [execution_logs.c.executed_at != None]
+    if status:
+        filters.append(execution_logs.c.status.in_([value.strip() for value in status.split(",")]))
+    if program:
+        filters.append(execution_logs.c.program_name == program)
+    if since:
+        filters.append(execution_logs.c.executed_at >= _to_venue_time(since))
+    if until:
+        filters.append(execution_logs.c.executed_at < _to_venue_time(until))
+    return filters
+
+
+def _keyset_page(filters: list, after: Optional[tuple[datetime, int]], limit: int):
+    """Newest-first page of logs strictly after a (executed_at, id) position
+
+    The executed_at index carries the rowid (id), so it serves this ordering
+    and the keyset condition without a sort.
+    """
+    clauses = list(filters)
+    if after:
+        executed_at, log_id = after
+        # Row-value comparison - the equivalent OR form makes SQLite sort
+        clauses.append(
+            tuple_(execution_logs.c.executed_at, execution_logs.c.id) <
+            tuple_(literal(executed_at, execution_logs.c.executed_at.type), literal(log_id))
+        )
+    return execution_logs.select().where(and_(*clauses)).order_by(
+        execution_logs.c.executed_at.desc(), execution_logs.c.id.desc()
     ).limit(limit)
+
+
+def _serialize_log(row) -> dict:
+    """Log row as JSON-ready dict"""
+    return {
+        column: row[column].isoformat() if isinstance(row[column], datetime) else row[column]
+        for column in EXPORT_COLUMNS
+    }
+
+
+@router.get("/logs")
+async def get_execution_logs(
+    limit: int = Query(default=50, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    program: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Get execution logs, newest first
+
+    Pass next_cursor from a response as cursor to get the following page.
+    Filters: status (comma-separated), program, and an executed_at range
+    [since, until). Naive times are venue-local.
+    """
+    filters = _log_filters(status, program, since, until)
+    after = _decode_cursor(cursor) if cursor else None
+    rows = await database.fetch_all(_keyset_page(filters, after, limit))
+
+    return {
+        "logs": [_serialize_log(row) for row in rows],
+        "next_cursor": _encode_cursor(rows[-1]) if len(rows) == limit else None,
+    }
+
+
+@router.get("/logs/export")
+async def export_execution_logs(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = None,
+    program: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Stream filtered execution logs as NDJSON or CSV
+
+    Rows are read in keyset-paged chunks, so memory use does not grow with
+    the size of the export.
+    """
+    filters = _log_filters(status, program, since, until)
+
+    async def generate():
+        if format == "csv":
+            yield ",".join(EXPORT_COLUMNS) + "\n"
+        after = None
+        while True:
+            rows = await database.fetch_all(_keyset_page(filters, after, EXPORT_CHUNK_SIZE))
+            if not rows:
+                break
+            buffer = io.StringIO()
+            if format == "csv":
+                writer = csv.writer(buffer, lineterminator="\n")
+                for row in rows:
+                    log = _serialize_log(row)
+                    writer.writerow(["" if log[column] is None else log[column] for column in EXPORT_COLUMNS])
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(_serialize_log(row)) + "\n")
+            yield buffer.getvalue()
+            if len(rows) < EXPORT_CHUNK_SIZE:
+                break
+            after = (rows[-1]["executed_at"], rows[-1]["id"])
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"execution_logs.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _percentile(sorted_values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[rank], 3)
+
+
+def _lateness_summary(values: list[float]) -> dict:
+    """Count and p50/p95/p99/max of lateness values in seconds"""
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "p99": _percentile(values, 99),
+        "max": round(values[-1], 3) if values else None,
+    }
+
+
+@router.get("/timing")
+async def get_start_timing(days: int = 7):
+    """Report how late scheduled programs actually start
+
+    Lateness is measured from the APScheduler fire time to the first play
+    acknowledgement (audible start), in seconds. handler_lateness is the
+    delay before the run_program handler was entered.
+    """
+    tz = pytz.timezone(settings.timezone)
+    since = datetime.now(tz) - timedelta(days=days)
+    query = execution_logs.select().where(
+        (execution_logs.c.scheduled_at != None) &
+        (execution_logs.c.first_play_at != None) &
+        (execution_logs.c.executed_at >= since)
+    )
     rows = await database.fetch_all(query)
 
+    overall, handler = [], []
+    by_type: dict[str, list[float]] = {}
+    by_hour: dict[str, list[float]] = {}
+    for row in rows:
+        lateness = (row["first_play_at"] - row["scheduled_at"]).total_seconds()
+        overall.append(lateness)
+        if row["handler_at"]:
+            handler.append((row["handler_at"] - row["scheduled_at"]).total_seconds())
+        program_type = scheduler_service._extract_type(row["program_name"])
+        by_type.setdefault(program_type, []).append(lateness)
+        by_hour.setdefault(f"{row['scheduled_at'].hour:02d}", []).append(lateness)
+
+    return {
+        "days": days,
+        "start_lateness": _lateness_summary(overall),
+        "handler_lateness": _lateness_summary(handler),
+        "by_program_type": {k: _lateness_summary(v) for k, v in sorted(by_type.items())},
+        "by_hour": {k: _lateness_summary(v) for k, v in sorted(by_hour.items())},
+    }
+
+
+@router.get("/sonos-stats")
+async def get_sonos_stats():
+    """Get Sonos API client cache counters"""
     return {
-        "logs": [
-            {
-                "id": row["id"],
-                "program_name": row["program_name"],
-                "executed_at": row["executed_at"].isoformat() if row["executed_at"] else None,
-                "status": row["status"],
-                "error_message": row["error_message"]
-            }
-            for row in rows
-        ]
+        "topology": sonos_api.get_topology_stats(),
+        "retries": sonos_api.get_retry_stats(),
+        "rate_limiter": sonos_api.get_rate_limiter_stats(),
+        "volume_planner": sonos_api.get_volume_plan_stats(),
+        "volume_ages": sonos_api.get_volume_ages()
     }
 
 
@@ -75,6 +277,31 @@ async def restart_scheduler():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/import-legacy")
+async def import_legacy_files(
+    schedule: Optional[str] = Query("scheduler.py", description="scheduler.py, backup.py or schedule_backup.py"),
+    source_tz: Optional[str] = Query(None, description="Timezone the schedule file's times are in"),
+    programs: bool = Query(True, description="Import scripts/ programs"),
+    dry_run: bool = Query(True, description="Only report the diff")
+):
+    """Import the legacy schedule file and scripts/ programs (diff report only by default)"""
+    if schedule and schedule not in SCHEDULE_FILES:
+        raise HTTPException(status_code=400, detail=f"schedule must be one of {', '.join(SCHEDULE_FILES)}")
+    if source_tz and source_tz not in pytz.all_timezones_set:
+        raise HTTPException(status_code=400, detail=f"Unknown timezone {source_tz}")
+    try:
+        report = await import_legacy(schedule or None, source_tz, import_programs=programs, dry_run=dry_run)
+    except LegacyImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not dry_run:
+        schedule_cache.bump()
+        program_registry.invalidate()
+        await scheduler_service.load_schedule_from_db()
+        report["reconcile"] = scheduler_service.last_reconcile
+    return report
+
+
 @router.get("/time")
 async def get_current_time():
     """Get current time in venue timezone"""
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Recent events kept for Last-Event-ID resume
+EVENT_HISTORY_SIZE = 500
+# Max undelivered events per subscriber before it is dropped
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Sent to a client resuming from an ID of another process lifetime - its
+# state may be stale in ways the history can't replay, so it must refetch
+RESYNC_EVENT = "resync"
+
+
+class EventBus:
+    """In-process publish/subscribe for state changes pushed to SSE clients
+
+    Events get increasing integer IDs and the most recent ones are kept so a
+    reconnecting client can resume from its Last-Event-ID. IDs restart with
+    the process, so on the wire they are prefixed with a boot epoch
+    ("<epoch>-<id>") and IDs from another epoch ask the client to resync.
+    """
+
+    def __init__(self):
+        self.epoch = format(time.time_ns() // 1_000_000, "x")
+        self._next_id = 1
+        self._history: deque[dict] = deque(maxlen=EVENT_HISTORY_SIZE)
+        self._subscribers: set[asyncio.Queue] = set()
+        self._listeners: list[Callable[[dict], None]] = []
+
+    def publish(self, event_type: str, data: dict) -> dict:
+        """Publish an event to all subscribers and listeners"""
+        event = {"id": self._next_id, "type": event_type, "data": data, "timestamp": time.time()}
+        self._next_id += 1
+        self._history.append(event)
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client - drop it, it will reconnect and resume from history
+                self._subscribers.discard(queue)
+                logger.warning("Dropping slow event subscriber")
+
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Event listener failed for {event_type}: {e}")
+        return event
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """Register an in-process callback invoked for every event"""
+        self._listeners.append(listener)
+
+    def format_id(self, event_id: int) -> str:
+        """Get the wire (SSE) ID for an event ID"""
+        return f"{self.epoch}-{event_id}"
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> tuple[asyncio.Queue, list[dict]]:
+        """Subscribe to new events
+
+        Returns the subscriber queue and any missed events after the wire ID
+        last_event_id. An ID from another epoch (or unparseable) yields a
+        single resync event instead.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        missed = []
+        if last_event_id:
+            epoch, _, event_id = last_event_id.rpartition("-")
+            if epoch == self.epoch and event_id.isdigit():
+                missed = [event for event in self._history if event["id"] > int(event_id)]
+            else:
+                missed = [{
+                    "id": self._next_id - 1, "type": RESYNC_EVENT,
+                    "data": {"epoch": self.epoch}, "timestamp": time.time(),
+                }]
+        return queue, missed
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a subscriber"""
+        self._subscribers.discard(queue)
+
+    def get_stats(self) -> dict:
+        """Get subscriber count and last event ID"""
+        return {"subscribers": len(self._subscribers), "last_event_id": self.format_id(self._next_id - 1)}
+
+
+# Global instance
+event_bus = EventBus()
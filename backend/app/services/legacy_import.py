@@ -0,0 +1,506 @@
+"""Import the legacy schedule files and scripts/ programs into the database
+
+The legacy scheduler keeps its timetable in scheduler.py (BLOCKS) or in
+backup.py / schedule_backup.py (schedule.every().<day>.at(...).do(...)
+calls), and each scripts/NNtype.py hardcodes its favorite sequence, volume
+maps and sleeps. Everything here is read with `ast` - nothing is imported,
+executed or sent over the network.
+
+Slots replace schedule_slots and programs are upserted into programs (as
+program_plans step definitions), both in one transaction. Every import
+returns a diff report against the current database; dry runs stop there.
+
+Usage (from backend/):
+    python -m app.services.legacy_import [--schedule scheduler.py] [--source-tz UTC] [--dry-run] [--json]
+"""
+import argparse
+import ast
+import asyncio
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+import pytz
+from ..config import get_settings
+from ..database import database, schedule_slots, programs, bulk_insert_schedule_slots
+from ..data.program_plans import (
+    ALL_SPEAKERS, ANNOUNCEMENT_VOLUME, compile_plan, parse_program_name, program_key
+)
+from .timetable import WEEK_DAYS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+# Legacy schedule files the importer understands
+SCHEDULE_FILES = ("scheduler.py", "backup.py", "schedule_backup.py")
+
+# Function names used by the scripts
+LOAD_FAVORITE_CALLS = {"load_favorite_playlist", "load_favorite"}
+SET_VOLUME_CALLS = {"set_player_volume"}
+PAUSE_CALLS = {"pause_playback"}
+
+
+class LegacyImportError(Exception):
+    """A legacy file could not be parsed"""
+
+
+def _call_name(call: ast.Call) -> Optional[str]:
+    """Name of the called function for f(...), module.f(...) or obj.f(...)"""
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
+
+
+def _literal(node, env: dict):
+    """Evaluate a literal node, resolving names assigned earlier in the script"""
+    if isinstance(node, ast.Name):
+        if node.id in env:
+            return env[node.id]
+        raise LegacyImportError(f"line {node.lineno}: {node.id} is not a literal")
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise LegacyImportError(f"line {node.lineno}: {ast.unparse(node)} is not a literal")
+
+
+# -------------------------
+# Schedules
+# -------------------------
+def block_for_time(time_str: str) -> str:
+    """Block a slot belongs to when the source file doesn't say (AM, DAY, PM_FIRE)"""
+    if time_str < "12:00":
+        return "AM"
+    if time_str < "17:45":
+        return "DAY"
+    return "PM_FIRE"
+
+
+def _to_venue_time(day: str, time_str: str, source_tz, venue_tz, reference: datetime) -> tuple[str, str]:
+    """Convert a weekly (day, HH:MM) in source_tz to the venue timezone
+
+    The offset is taken at the slot's next occurrence after `reference`, so
+    UTC schedules land on the venue's current DST offset.
+    """
+    hour, minute = map(int, time_str.split(":"))
+    days_ahead = (WEEK_DAYS.index(day) - reference.weekday()) % 7
+    date = (reference + timedelta(days=days_ahead)).date()
+    local = source_tz.localize(datetime(date.year, date.month, date.day, hour, minute)).astimezone(venue_tz)
+    return WEEK_DAYS[local.weekday()], local.strftime("%H:%M")
+
+
+def _blocks_slots(node: ast.Dict) -> list[tuple[str, str, str, str]]:
+    """Slots from a BLOCKS = {day: {block: [(time, program), ...]}} literal"""
+    blocks = ast.literal_eval(node)
+    return [
+        (day.lower(), time_str, program_name, block)
+        for day, day_blocks in blocks.items()
+        for block, rows in day_blocks.items()
+        for time_str, program_name in rows
+    ]
+
+
+def _every_slot(call: ast.Call) -> Optional[tuple[str, str, str, str]]:
+    """Slot from schedule.every().<day>.at("HH:MM").do(run_script, script="x.py")"""
+    if not (isinstance(call.func, ast.Attribute) and call.func.attr == "do"):
+        return None
+    at_call = call.func.value
+    if not (isinstance(at_call, ast.Call) and isinstance(at_call.func, ast.Attribute)
+            and at_call.func.attr == "at" and at_call.args):
+        return None
+    day_attr = at_call.func.value
+    if not (isinstance(day_attr, ast.Attribute) and day_attr.attr in WEEK_DAYS
+            and isinstance(day_attr.value, ast.Call) and _call_name(day_attr.value) == "every"):
+        return None
+
+    script = next((kw.value for kw in call.keywords if kw.arg == "script"), None)
+    if script is None and len(call.args) > 1:
+        script = call.args[1]
+    if script is None:
+        return None
+    time_str = ast.literal_eval(at_call.args[0])
+    return day_attr.attr, time_str, ast.literal_eval(script), block_for_time(time_str)
+
+
+def parse_schedule_file(path, source_tz: Optional[str] = None,
+                        reference: Optional[datetime] = None) -> list[tuple[str, str, str, str]]:
+    """Get (day_of_week, time, program_name, block_type) slots from a legacy schedule file
+
+    Reads a BLOCKS dict literal if the file has one, otherwise every
+    schedule.every().<day>.at().do() call. source_tz is the timezone the
+    file's times are written in (schedule_backup.py uses UTC); slots are
+    returned in venue time.
+    """
+    path = Path(path)
+    tree = ast.parse(path.read_text(), filename=str(path))
+
+    slots = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)
+                and any(isinstance(t, ast.Name) and t.id == "BLOCKS" for t in node.targets)):
+            slots = _blocks_slots(node.value)
+            break
+    else:
+        calls = sorted(
+            (node for node in ast.walk(tree) if isinstance(node, ast.Call)),
+            key=lambda node: (node.lineno, node.col_offset)
+        )
+        slots = [slot for slot in map(_every_slot, calls) if slot]
+    if not slots:
+        raise LegacyImportError(f"{path.name}: no BLOCKS or schedule.every() slots found")
+
+    venue_tz = pytz.timezone(settings.timezone)
+    if source_tz and pytz.timezone(source_tz).zone != venue_tz.zone:
+        reference = reference or datetime.now(venue_tz).replace(tzinfo=None)
+        tz = pytz.timezone(source_tz)
+        converted = []
+        for day, time_str, program_name, _ in slots:
+            day, time_str = _to_venue_time(day, time_str, tz, venue_tz, reference)
+            converted.append((day, time_str, program_name, block_for_time(time_str)))
+        slots = converted
+
+    for day, time_str, program_name, _ in slots:
+        if day not in WEEK_DAYS:
+            raise LegacyImportError(f"{path.name}: unknown day {day!r}")
+        hour, minute = map(int, time_str.split(":"))
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise LegacyImportError(f"{path.name}: invalid time {time_str!r}")
+    return sorted(set(slots), key=lambda s: (WEEK_DAYS.index(s[0]), s[1], s[2]))
+
+
+# -------------------------
+# Program scripts
+# -------------------------
+def _volume_spec(levels: dict, default_level: int):
+    """Compact volume spec for a speaker -> level map (see program_plans)
+
+    The most common level becomes "*" (dropped when it's the step's default)
+    and other speakers are listed individually.
+    """
+    common = Counter(levels.values()).most_common(1)[0][0]
+    overrides = {name: level for name, level in levels.items() if level != common}
+    if common != default_level:
+        return {ALL_SPEAKERS: common, **overrides} if overrides else common
+    return overrides or None
+
+
+def _statements(body):
+    """Statements in source order, descending into with/if/for/try blocks"""
+    for stmt in body:
+        if isinstance(stmt, (ast.With, ast.AsyncWith, ast.For, ast.AsyncFor, ast.While)):
+            yield from _statements(stmt.body)
+        elif isinstance(stmt, ast.If):
+            yield from _statements(stmt.body)
+        elif isinstance(stmt, ast.Try):
+            yield from _statements(stmt.body)
+        else:
+            yield stmt
+
+
+def parse_program_script(path) -> dict:
+    """Get a programs row (name, volume, program_type, favorite_ids) from a scripts/ file
+
+    Steps come from main()'s load_favorite_playlist calls in order; each
+    step takes the volume map passed to set_player_volume after its load
+    and the asyncio.sleep delays before the next load.
+    """
+    path = Path(path)
+    tree = ast.parse(path.read_text(), filename=str(path))
+    volume, program_type = parse_program_name(path.name)
+
+    env = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                env[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+
+    main = next((node for node in tree.body
+                 if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef)) and node.name == "main"), None)
+    if main is None:
+        calls = {_call_name(node) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+        if calls & PAUSE_CALLS:
+            return {"name": path.name, "volume": volume, "program_type": "pause", "favorite_ids": "[]"}
+        raise LegacyImportError(f"{path.name}: no main() or pause call found")
+
+    steps = []
+    for stmt in _statements(main.body):
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            try:
+                env[stmt.targets[0].id] = ast.literal_eval(stmt.value)
+            except ValueError:
+                pass
+
+        for call in sorted((n for n in ast.walk(stmt) if isinstance(n, ast.Call)),
+                           key=lambda n: (n.lineno, n.col_offset)):
+            name = _call_name(call)
+            if name in LOAD_FAVORITE_CALLS and len(call.args) >= 2:
+                favorite = _literal(call.args[1], env)
+                steps.append({"favorite": str(favorite), "delay": 0, "levels": None})
+            elif name in SET_VOLUME_CALLS and len(call.args) >= 2 and steps:
+                level = call.args[1]
+                if isinstance(level, ast.Subscript) and isinstance(level.value, ast.Name):
+                    levels = _literal(level.value, env)
+                    if not isinstance(levels, dict):
+                        raise LegacyImportError(f"{path.name}: line {level.lineno}: volume map is not a dict")
+                    steps[-1]["levels"] = dict(levels)
+                else:
+                    level = _literal(level, env)
+                    steps[-1]["levels"] = {speaker: level for speaker in settings.speakers}
+            elif name == "sleep" and call.args and steps:
+                steps[-1]["delay"] += _literal(call.args[0], env)
+
+    if not steps:
+        raise LegacyImportError(f"{path.name}: no favorite loads found in main()")
+
+    definition = []
+    for index, step in enumerate(steps):
+        default_level = volume if index == len(steps) - 1 else ANNOUNCEMENT_VOLUME
+        entry = {"favorite": step["favorite"]}
+        if step["delay"]:
+            entry["delay"] = step["delay"]
+        if step["levels"] is not None:
+            unknown = set(step["levels"]) - set(settings.speakers)
+            if unknown:
+                raise LegacyImportError(f"{path.name}: unknown speakers {', '.join(sorted(unknown))}")
+            spec = _volume_spec(step["levels"], default_level)
+            if spec is not None:
+                entry["volume"] = spec
+        definition.append(entry)
+
+    return {
+        "name": path.name,
+        "volume": volume,
+        "program_type": program_type,
+        "favorite_ids": json.dumps(definition, separators=(",", ":")),
+    }
+
+
+def parse_scripts_dir(scripts_dir) -> tuple[list[dict], dict[str, str]]:
+    """Parse every scripts/*.py; returns (program rows, {script: error})"""
+    rows, errors = [], {}
+    for path in sorted(Path(scripts_dir).glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        try:
+            rows.append(parse_program_script(path))
+        except (LegacyImportError, SyntaxError) as e:
+            errors[path.name] = str(e)
+    return rows, errors
+
+
+# -------------------------
+# Diff and load
+# -------------------------
+async def diff_schedule(slots: list[tuple[str, str, str, str]]) -> dict:
+    """Compare imported slots with the active schedule, keyed by (day, time)"""
+    rows = await database.fetch_all(schedule_slots.select().where(schedule_slots.c.is_active == True))
+    current: dict[tuple[str, str], set] = {}
+    for row in rows:
+        current.setdefault((row["day_of_week"].lower(), row["time"]), set()).add(row["program_name"])
+    imported: dict[tuple[str, str], set] = {}
+    for day, time_str, program_name, _ in slots:
+        imported.setdefault((day, time_str), set()).add(program_name)
+
+    def describe(key, names):
+        return {"day": key[0], "time": key[1], "programs": sorted(names)}
+
+    order = lambda key: (WEEK_DAYS.index(key[0]) if key[0] in WEEK_DAYS else 7, key[1])
+    return {
+        "added": [describe(k, imported[k]) for k in sorted(imported.keys() - current.keys(), key=order)],
+        "removed": [describe(k, current[k]) for k in sorted(current.keys() - imported.keys(), key=order)],
+        "changed": [
+            {"day": k[0], "time": k[1], "from": sorted(current[k]), "to": sorted(imported[k])}
+            for k in sorted(current.keys() & imported.keys(), key=order) if current[k] != imported[k]
+        ],
+        "unchanged": sum(1 for k in current.keys() & imported.keys() if current[k] == imported[k]),
+    }
+
+
+async def diff_programs(rows: list[dict]) -> dict:
+    """Compare imported programs with what each program runs today
+
+    A program without a row currently runs its type's default sequence, so
+    the comparison is between compiled plans, not raw definitions.
+    """
+    existing = {program_key(row["name"]): row for row in await database.fetch_all(programs.select())}
+    report = {"added": [], "changed": [], "unchanged": []}
+    for row in rows:
+        key = program_key(row["name"])
+        new_plan = compile_plan(key, row["favorite_ids"], speakers=settings.speakers,
+                                volume=row["volume"], program_type=row["program_type"])
+        old = existing.get(key)
+        if old is None:
+            old_plan = compile_plan(key, speakers=settings.speakers)
+        else:
+            try:
+                old_plan = compile_plan(key, old["favorite_ids"], speakers=settings.speakers,
+                                        volume=old["volume"], program_type=old["program_type"])
+            except ValueError:
+                old_plan = None
+
+        if old_plan == new_plan and old is not None:
+            report["unchanged"].append(row["name"])
+            continue
+        entry = {"name": row["name"], "was": old_plan.source if old_plan else "invalid"}
+        if old_plan != new_plan:
+            entry["steps"] = _describe_steps(new_plan)
+            if old_plan:
+                entry["previous_steps"] = _describe_steps(old_plan)
+        report["added" if old is None else "changed"].append(entry)
+    report["kept"] = sorted(
+        row["name"] for key, row in existing.items() if key not in {program_key(r["name"]) for r in rows}
+    )
+    return report
+
+
+def _describe_steps(plan) -> list[str]:
+    """Short human-readable form of a plan's steps, e.g. "36 @85 (STAGE 1) 14s" """
+    players = {player_id: name for name, player_id in settings.speakers.items()}
+    described = []
+    for step in plan.steps:
+        levels = dict(step.volumes)
+        common = Counter(levels.values()).most_common(1)[0][0] if levels else None
+        overrides = ", ".join(f"{players.get(p, p)} {v}" for p, v in levels.items() if v != common)
+        text = f"{step.favorite_id} @{common}"
+        if overrides:
+            text += f" ({overrides})"
+        if step.delay:
+            text += f" {step.delay:g}s"
+        described.append(text)
+    return described
+
+
+async def load_legacy(slots: list[tuple[str, str, str, str]], rows: list[dict]):
+    """Replace schedule_slots and upsert programs in one transaction"""
+    async with database.transaction():
+        if slots:
+            await bulk_insert_schedule_slots(slots, replace=True)
+        existing = {program_key(row["name"]): row for row in await database.fetch_all(programs.select())}
+        for row in rows:
+            values = {
+                "volume": row["volume"],
+                "program_type": row["program_type"],
+                "favorite_ids": row["favorite_ids"],
+                "description": f"Imported from scripts/{row['name']}",
+            }
+            current = existing.get(program_key(row["name"]))
+            if current is None:
+                await database.execute(programs.insert().values(name=row["name"], **values))
+            else:
+                await database.execute(programs.update().where(programs.c.id == current["id"]).values(**values))
+
+
+async def import_legacy(schedule_file: Optional[str] = "scheduler.py", source_tz: Optional[str] = None,
+                        scripts_dir=SCRIPTS_DIR, import_programs: bool = True,
+                        dry_run: bool = False) -> dict:
+    """Parse the legacy files, diff them against the database and (unless dry_run) load them
+
+    Returns the report. Raises LegacyImportError if the schedule file can't
+    be parsed; scripts that can't be parsed are listed under errors and skipped.
+    """
+    started = datetime.now()
+    slots = parse_schedule_file(REPO_ROOT / schedule_file, source_tz) if schedule_file else []
+    rows, errors = parse_scripts_dir(scripts_dir) if import_programs else ([], {})
+
+    report = {
+        "schedule_file": schedule_file,
+        "source_tz": source_tz or settings.timezone,
+        "slot_count": len(slots),
+        "program_count": len(rows),
+        "errors": errors,
+        "schedule": await diff_schedule(slots) if schedule_file else None,
+        "programs": await diff_programs(rows) if import_programs else None,
+        "unknown_programs": sorted(
+            {slot[2] for slot in slots} - {row["name"] for row in rows} - {"pause.py"}
+        ) if import_programs else [],
+        "dry_run": dry_run,
+    }
+    if not dry_run:
+        # Rewriting an identical schedule would only churn slot IDs (and jobs)
+        schedule = report["schedule"]
+        if schedule and not (schedule["added"] or schedule["removed"] or schedule["changed"]):
+            slots = []
+        await load_legacy(slots, rows)
+    report["duration_ms"] = round((datetime.now() - started).total_seconds() * 1000, 1)
+    return report
+
+
+def format_report(report: dict) -> str:
+    """Plain-text summary of an import report"""
+    lines = [f"{'Dry run' if report['dry_run'] else 'Imported'} in {report['duration_ms']}ms"]
+    schedule = report["schedule"]
+    if schedule is not None:
+        lines.append(
+            f"Schedule ({report['schedule_file']}, {report['source_tz']}): {report['slot_count']} slots - "
+            f"{len(schedule['added'])} added, {len(schedule['removed'])} removed, "
+            f"{len(schedule['changed'])} changed, {schedule['unchanged']} unchanged"
+        )
+        for slot in schedule["added"]:
+            lines.append(f"  + {slot['day']} {slot['time']} {', '.join(slot['programs'])}")
+        for slot in schedule["removed"]:
+            lines.append(f"  - {slot['day']} {slot['time']} {', '.join(slot['programs'])}")
+        for slot in schedule["changed"]:
+            lines.append(f"  ~ {slot['day']} {slot['time']} {', '.join(slot['from'])} -> {', '.join(slot['to'])}")
+    programs_diff = report["programs"]
+    if programs_diff is not None:
+        lines.append(
+            f"Programs: {report['program_count']} parsed - {len(programs_diff['added'])} added, "
+            f"{len(programs_diff['changed'])} changed, {len(programs_diff['unchanged'])} unchanged, "
+            f"{len(programs_diff['kept'])} kept (not in scripts/)"
+        )
+        for kind, mark in (("added", "+"), ("changed", "~")):
+            for entry in programs_diff[kind]:
+                lines.append(f"  {mark} {entry['name']} (was {entry['was']})")
+                if "previous_steps" in entry:
+                    lines.append(f"      before: {' | '.join(entry['previous_steps'])}")
+                if "steps" in entry:
+                    lines.append(f"      after:  {' | '.join(entry['steps'])}")
+    for name, error in report["errors"].items():
+        lines.append(f"  ! {name}: {error}")
+    if report["unknown_programs"]:
+        lines.append(f"Scheduled but not in scripts/: {', '.join(report['unknown_programs'])}")
+    return "\n".join(lines)
+
+
+async def _main(args):
+    from ..database import create_tables
+    create_tables()
+    await database.connect()
+    try:
+        return await import_legacy(
+            None if args.no_schedule else args.schedule, args.source_tz,
+            import_programs=not args.no_programs, dry_run=args.dry_run
+        )
+    finally:
+        await database.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedule", default="scheduler.py", choices=SCHEDULE_FILES,
+                        help="legacy schedule file to import")
+    parser.add_argument("--source-tz", help="timezone the schedule file's times are in (default: venue)")
+    parser.add_argument("--no-schedule", action="store_true", help="only import programs")
+    parser.add_argument("--no-programs", action="store_true", help="only import the schedule")
+    parser.add_argument("--dry-run", action="store_true", help="report the diff without writing")
+    parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(_main(args))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    if not args.dry_run:
+        # This process has its own scheduler; a running backend must re-read the tables itself
+        print("A running backend picks up the import with POST /api/v1/schedule/reload "
+              "(reconciles the slots and recompiles program plans).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Optional
+import pytz
+from ..config import get_settings
+
+settings = get_settings()
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_SKIPPED = "skipped"
+JOB_PREEMPTED = "preempted"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_SKIPPED, JOB_PREEMPTED)
+
+
+def _now() -> datetime:
+    """Current time in the venue timezone"""
+    return datetime.now(pytz.timezone(settings.timezone))
+
+
+class ProgramJob:
+    """Handle for one background program run, with per-step progress"""
+
+    def __init__(self, program_name: str, manual: bool = True, scheduled_at: Optional[datetime] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.program_name = program_name
+        self.manual = manual
+        self.status = JOB_QUEUED
+        self.error: Optional[str] = None
+        self.total_steps = 0
+        self.current_step = 0
+        self.steps: list[dict] = []
+        self.created_at = _now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        # Start timing for scheduled runs
+        self.scheduled_at = scheduled_at
+        self.handler_at = _now()
+        self.first_load_at: Optional[datetime] = None
+        self.first_play_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        # Set to stop the run at its next step boundary
+        self.cancel_event = asyncio.Event()
+        self.cancel_status: Optional[str] = None
+        self.cancel_reason: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def request_cancel(self, status: str = JOB_CANCELLED, reason: Optional[str] = None):
+        """Ask the run to stop at its next step boundary"""
+        if not self.is_finished and not self.cancel_requested:
+            self.cancel_status = status
+            self.cancel_reason = reason
+            self.cancel_event.set()
+
+    async def sleep(self, seconds: float) -> bool:
+        """Sleep between steps; returns True early if cancellation was requested"""
+        try:
+            await asyncio.wait_for(self.cancel_event.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def start(self, total_steps: int):
+        """Mark the job as running a sequence of total_steps steps"""
+        self.status = JOB_RUNNING
+        self.total_steps = total_steps
+        self.started_at = _now()
+
+    def mark_loaded(self):
+        """Record the first load_favorite acknowledgement"""
+        if self.first_load_at is None:
+            self.first_load_at = _now()
+
+    def mark_playing(self):
+        """Record the first play acknowledgement"""
+        if self.first_play_at is None:
+            self.first_play_at = _now()
+
+    def step(self, index: int, favorite_id: str, duration: int):
+        """Record that step `index` (0-based) has started playing"""
+        self.current_step = index + 1
+        if self.steps:
+            self.steps[-1]["finished_at"] = _now().isoformat()
+        self.steps.append({
+            "step": index + 1,
+            "favorite_id": favorite_id,
+            "duration": duration,
+            "started_at": _now().isoformat(),
+            "finished_at": None,
+        })
+
+    def finish(self, status: str, error: Optional[str] = None):
+        """Mark the job finished with a final status"""
+        if self.is_finished:
+            return
+        self.status = status
+        self.error = error
+        self.finished_at = _now()
+        if self.steps and self.steps[-1]["finished_at"] is None:
+            self.steps[-1]["finished_at"] = self.finished_at.isoformat()
+
+    def to_dict(self) -> dict:
+        """Serialize for the API"""
+        return {
+            "id": self.id,
+            "program_name": self.program_name,
+            "manual": self.manual,
+            "status": self.status,
+            "error": self.error,
+            "current_step": self.current_step,
+            "total_steps": self.total_steps,
+            "steps": self.steps,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "scheduled_at": self.scheduled_at.isoformat() if self.scheduled_at else None,
+            "first_play_at": self.first_play_at.isoformat() if self.first_play_at else None,
+        }
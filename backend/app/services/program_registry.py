@@ -0,0 +1,72 @@
+import logging
+from typing import Optional
+from ..config import get_settings
+from ..database import database, programs
+from ..data.program_plans import ProgramPlan, compile_plan, program_key
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class ProgramRegistry:
+    """Compiled program plans, cached by program name
+
+    Plans are compiled from the programs table (or the type's default
+    sequence when a program has no row) on first use and reused until the
+    program's row changes. Writers call invalidate(); a plan compiled while
+    an invalidation happened is returned but not cached.
+    """
+
+    def __init__(self):
+        self._plans: dict[str, ProgramPlan] = {}
+        self._generation = 0
+        self.stats = {"hits": 0, "compiles": 0, "invalidations": 0}
+
+    async def get_plan(self, program_name: str) -> ProgramPlan:
+        """Get the compiled plan for a program ("65sm.py" or "65sm")
+
+        Raises ValueError if the program's stored definition is invalid.
+        """
+        key = program_key(program_name)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self.stats["hits"] += 1
+            return plan
+
+        generation = self._generation
+        row = await self.fetch_row(key)
+        if row is None:
+            plan = compile_plan(key, speakers=settings.speakers)
+        else:
+            plan = compile_plan(
+                key, row["favorite_ids"], speakers=settings.speakers,
+                volume=row["volume"], program_type=row["program_type"]
+            )
+        self.stats["compiles"] += 1
+        if self._generation == generation:
+            self._plans[key] = plan
+        return plan
+
+    async def fetch_row(self, program_name: str):
+        """Get the programs row for a program, stored with or without ".py" """
+        key = program_key(program_name)
+        return await database.fetch_one(
+            programs.select().where(programs.c.name.in_([key, f"{key}.py"]))
+        )
+
+    def invalidate(self, program_name: Optional[str] = None):
+        """Drop one program's cached plan, or all plans"""
+        self._generation += 1
+        self.stats["invalidations"] += 1
+        if program_name is None:
+            self._plans.clear()
+        else:
+            self._plans.pop(program_key(program_name), None)
+
+    def get_stats(self) -> dict:
+        """Get cache counters and the cached program names"""
+        return {**self.stats, "cached": sorted(self._plans)}
+
+
+# Global instance
+program_registry = ProgramRegistry()
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import Optional
+
+# Request priorities, highest first
+PRIORITY_PROGRAM = "program"  # Scheduled/manual program execution - never shed
+PRIORITY_INTERACTIVE = "interactive"  # Dashboard button presses
+PRIORITY_POLL = "poll"  # Dashboard status polling - shed first
+
+# Fraction of each bucket held back from a priority (0 = may drain it completely)
+PRIORITY_RESERVE = {
+    PRIORITY_PROGRAM: 0.0,
+    PRIORITY_INTERACTIVE: 0.25,
+    PRIORITY_POLL: 0.5,
+}
+
+# Max seconds a request of a given priority waits for a token before being shed
+PRIORITY_MAX_WAIT = {
+    PRIORITY_PROGRAM: None,
+    PRIORITY_INTERACTIVE: 5.0,
+    PRIORITY_POLL: 1.0,
+}
+
+
+class RateLimitedError(Exception):
+    """Raised when a low-priority request is shed because the budget is exhausted"""
+
+
+class TokenBucket:
+    """Async token bucket with priority reserves
+
+    Higher priorities may dig deeper into the bucket, so when the budget runs
+    low polling is refused first while program traffic keeps flowing.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: int):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self.stats = {"acquired": 0, "waited": 0, "shed": 0}
+
+    def _refill(self):
+        """Add tokens for the time elapsed since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, priority: str = PRIORITY_INTERACTIVE, deadline: Optional[float] = None):
+        """Take one token, waiting or shedding according to priority
+
+        deadline is an absolute time.monotonic() after which waiting is pointless.
+        It only shortens the wait of priorities that may be shed; program
+        requests always wait for their token.
+        """
+        floor = self.capacity * PRIORITY_RESERVE.get(priority, 0.0)
+        max_wait = PRIORITY_MAX_WAIT.get(priority)
+        give_up_at = None
+        if max_wait is not None:
+            give_up_at = time.monotonic() + max_wait
+            if deadline is not None:
+                give_up_at = min(give_up_at, deadline)
+        waited = False
+
+        while True:
+            self._refill()
+            if self.tokens - 1 >= floor:
+                self.tokens -= 1
+                self.stats["acquired"] += 1
+                if waited:
+                    self.stats["waited"] += 1
+                return
+
+            wait = (floor + 1 - self.tokens) / self.rate
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                self.stats["shed"] += 1
+                raise RateLimitedError(
+                    f"Sonos {self.name} rate limit budget exhausted - {priority} request shed"
+                )
+            waited = True
+            await asyncio.sleep(wait)
+
+    def get_stats(self) -> dict:
+        """Get bucket level and counters"""
+        self._refill()
+        return {
+            **self.stats,
+            "tokens": round(self.tokens, 2),
+            "capacity": self.capacity,
+            "rate": self.rate,
+        }
+
+
+class RateLimiter:
+    """Separate token buckets for household-, group- and player-level endpoints"""
+
+    def __init__(self, limits: dict):
+        self.buckets = {
+            scope: TokenBucket(scope, rate, capacity)
+            for scope, (rate, capacity) in limits.items()
+        }
+
+    def scope_for(self, url: str) -> str:
+        """Map a Control API URL to its bucket"""
+        if "/players/" in url:
+            return "player"
+        if "/groups/" in url and "/households/" not in url:
+            return "group"
+        return "household"
+
+    async def acquire(self, url: str, priority: str = PRIORITY_INTERACTIVE, deadline: Optional[float] = None):
+        """Take a token from the bucket for this URL"""
+        await self.buckets[self.scope_for(url)].acquire(priority, deadline)
+
+    def get_stats(self) -> dict:
+        """Get stats for every bucket"""
+        return {scope: bucket.get_stats() for scope, bucket in self.buckets.items()}
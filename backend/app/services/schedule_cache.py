@@ -0,0 +1,90 @@
+import json
+import uuid
+from typing import Optional
+from fastapi.encoders import jsonable_encoder
+from ..database import database, schedule_slots
+from ..models import ScheduleSlot, DaySchedule
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Cache key for the full weekly payload (per-day payloads are keyed by day name)
+WEEKLY = "week"
+
+
+class ScheduleCache:
+    """Pre-serialized schedule payloads, rebuilt only when the schedule changes
+
+    Every schedule write bumps the version; payloads are JSON bytes cached
+    for the current version. ETags combine a per-process ID with the version,
+    so they never collide across restarts.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._process_id = uuid.uuid4().hex[:8]
+        self._payloads: dict[str, bytes] = {}
+        self._payload_version = 0
+        self.stats = {"hits": 0, "builds": 0, "not_modified": 0}
+
+    def bump(self):
+        """Invalidate cached payloads after a schedule write"""
+        self.version += 1
+
+    def etag(self, key: str) -> str:
+        """Strong ETag for a payload at the current version"""
+        return f'"{self._process_id}-{self.version}-{key}"'
+
+    def matches(self, key: str, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against the current ETag"""
+        if not if_none_match:
+            return False
+        current = self.etag(key)
+        matched = any(tag.strip() in (current, "*") for tag in if_none_match.split(","))
+        if matched:
+            self.stats["not_modified"] += 1
+        return matched
+
+    async def get_payload(self, key: str) -> tuple[bytes, str]:
+        """Get (JSON bytes, ETag) for the weekly schedule or one day"""
+        version = self.version
+        if self._payload_version != version:
+            self._payloads = {}
+            self._payload_version = version
+
+        payload = self._payloads.get(key)
+        if payload is not None:
+            self.stats["hits"] += 1
+            return payload, self.etag(key)
+
+        payload = await self._build(key)
+        self.stats["builds"] += 1
+        # Keep the payload only if no write happened while it was being built
+        if self.version == version:
+            self._payloads[key] = payload
+        return payload, f'"{self._process_id}-{version}-{key}"'
+
+    async def _build(self, key: str) -> bytes:
+        """Query slots and serialize the payload for key"""
+        query = schedule_slots.select().order_by(schedule_slots.c.time)
+        if key != WEEKLY:
+            query = query.where(schedule_slots.c.day_of_week == key)
+        rows = await database.fetch_all(query)
+
+        if key == WEEKLY:
+            content = {day: [] for day in DAYS}
+            for row in rows:
+                day = row["day_of_week"].lower()
+                if day in content:
+                    content[day].append(ScheduleSlot(**dict(row)))
+        else:
+            content = DaySchedule(day=key, slots=[ScheduleSlot(**dict(row)) for row in rows])
+
+        return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+
+    def get_stats(self) -> dict:
+        """Get version and cache counters"""
+        return {**self.stats, "version": self.version, "cached": sorted(self._payloads)}
+
+
+# Global instance
+schedule_cache = ScheduleCache()
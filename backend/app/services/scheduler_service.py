@@ -1,14 +1,25 @@
 import asyncio
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.events import EVENT_JOB_SUBMITTED
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 import pytz
 from ..config import get_settings
 from ..database import database, schedule_slots, execution_logs
-from .sonos_api import sonos_api
+from .sonos_api import sonos_api, SonosAPIError
+from .rate_limiter import PRIORITY_PROGRAM
+from .event_bus import event_bus
+from .program_registry import program_registry
+from ..data.program_plans import PlanStep, parse_program_name
+from .timetable import Timetable, WEEK_DAYS
+from .program_jobs import (
+    ProgramJob, JOB_QUEUED, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_SKIPPED, JOB_PREEMPTED
+)
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -25,6 +36,28 @@ PROGRAM_TYPE_NAMES = {
     "pause": "Pause"
 }
 
+# Finished program jobs kept for GET /playback/jobs
+MAX_JOB_HISTORY = 100
+
+# Job ID prefixes - slot jobs are keyed by schedule_slots.id, and each has
+# a pre-warm job registered ahead of it
+SLOT_JOB_PREFIX = "slot_"
+PREWARM_JOB_PREFIX = "prewarm_"
+
+# Program overlap policies (see settings.program_overlap_policy)
+OVERLAP_PREEMPT = "preempt"
+OVERLAP_QUEUE = "queue"
+OVERLAP_DROP_DUPLICATE = "drop_duplicate"
+
+# Slot scheduling modes (see settings.scheduler_mode)
+SCHEDULER_MODE_CRON = "cron"
+SCHEDULER_MODE_DISPATCHER = "dispatcher"
+
+# Dispatcher: longest single sleep, so wall-clock jumps are noticed promptly
+DISPATCH_MAX_SLEEP = 60
+# Dispatcher: slots reached more than this many seconds late are skipped
+DISPATCH_MISFIRE_GRACE = 30
+
 
 class SchedulerService:
     """APScheduler-based service for running scheduled programs"""
@@ -38,11 +71,32 @@ class SchedulerService:
         self.paused_until: Optional[datetime] = None  # Pause until this time (midnight)
         self._fire_show_job_id = "fire_show_hourly"
         self._midnight_reset_job_id = "midnight_reset"
+        self.jobs: dict[str, ProgramJob] = {}  # Program runs by job ID
+        # Single executor for the all-speakers group - one program at a time
+        self._executor_lock = asyncio.Lock()
+        self._active_job: Optional[ProgramJob] = None
+        # APScheduler job ID -> scheduled fire time of its pending run
+        self._fire_times: dict[str, datetime] = {}
+        # Slot job ID -> (day, time, program) it was registered with
+        self._slot_jobs: dict[str, tuple[str, str, str]] = {}
+        self._reload_lock = asyncio.Lock()
+        self._reload_task: Optional[asyncio.Task] = None
+        self.last_reconcile: Optional[dict] = None
+        # Dispatcher mode - compiled week, swapped whole on reload
+        self._timetable = Timetable([], self.timezone)
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._dispatch_wake = asyncio.Event()
+        self._dispatch_runs: set[asyncio.Task] = set()
+
+    @property
+    def dispatcher_mode(self) -> bool:
+        return settings.scheduler_mode == SCHEDULER_MODE_DISPATCHER
 
     def start(self):
         """Start the scheduler"""
         if self.scheduler is None:
             self.scheduler = AsyncIOScheduler(timezone=self.timezone)
+            self.scheduler.add_listener(self._on_job_submitted, EVENT_JOB_SUBMITTED)
         if not self.scheduler.running:
             self.scheduler.start()
             self.is_running = True
@@ -50,6 +104,9 @@ class SchedulerService:
 
             # Always add the midnight reset job
             self._add_midnight_reset_job()
+        if self.dispatcher_mode and (self._dispatch_task is None or self._dispatch_task.done()):
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+            logger.info("Timetable dispatcher started")
 
     def stop(self):
         """Stop the scheduler"""
@@ -57,6 +114,19 @@ class SchedulerService:
             self.scheduler.shutdown()
             self.is_running = False
             logger.info("Scheduler stopped")
+        if self._dispatch_task and not self._dispatch_task.done():
+            self._dispatch_task.cancel()
+        self._dispatch_task = None
+
+    def _on_job_submitted(self, event):
+        """Remember each job's scheduled fire time for start-jitter measurement"""
+        if event.scheduled_run_times:
+            self._fire_times[event.job_id] = event.scheduled_run_times[-1]
+
+    async def run_scheduled_program(self, program_name: str, job_id: Optional[str] = None):
+        """APScheduler entry point - runs a program with its scheduled fire time attached"""
+        scheduled_at = self._fire_times.pop(job_id, None) if job_id else None
+        await self.run_program(program_name, scheduled_at=scheduled_at)
 
     def _add_midnight_reset_job(self):
         """Add job to reset Fire Show Mode at midnight"""
@@ -92,6 +162,7 @@ class SchedulerService:
 
         self.fire_show_mode = True
         logger.info("Fire Show Mode ENABLED - will run 85adfire.py hourly")
+        event_bus.publish("fire_show", self.get_fire_show_status())
 
         # Remove existing fire show job if present
         try:
@@ -105,9 +176,10 @@ class SchedulerService:
         # Add hourly job (runs at the top of each hour)
         trigger = IntervalTrigger(hours=1, timezone=self.timezone)
         self.scheduler.add_job(
-            self.run_program,
+            self.run_scheduled_program,
             trigger=trigger,
             args=["85adfire.py"],
+            kwargs={"job_id": self._fire_show_job_id},
             id=self._fire_show_job_id,
             replace_existing=True
         )
@@ -118,6 +190,7 @@ class SchedulerService:
         """Disable Fire Show Mode - return to regular programming"""
         self.fire_show_mode = False
         logger.info("Fire Show Mode DISABLED - returning to regular schedule")
+        event_bus.publish("fire_show", self.get_fire_show_status())
 
         # Remove the hourly fire show job
         try:
@@ -147,6 +220,7 @@ class SchedulerService:
             midnight = midnight + timedelta(days=1)
         self.paused_until = midnight
         logger.info(f"Scheduler paused until {midnight.strftime('%Y-%m-%d %H:%M:%S')}")
+        event_bus.publish("pause", self.get_pause_status())
 
         # Also pause Sonos playback immediately
         await sonos_api.pause_all()
@@ -163,6 +237,7 @@ class SchedulerService:
         self.paused_until = None
         if was_paused:
             logger.info("Scheduler resumed - pause cleared")
+            event_bus.publish("pause", self.get_pause_status())
         return {"status": "resumed", "message": "Playback resumed, scheduler active"}
 
     def is_paused(self) -> bool:
@@ -174,6 +249,7 @@ class SchedulerService:
             # Pause period has expired, clear it
             self.paused_until = None
             logger.info("Pause period expired, scheduler resuming")
+            event_bus.publish("pause", {"is_paused": False, "paused_until": None, "paused_until_display": None})
             return False
         return True
 
@@ -188,160 +264,438 @@ class SchedulerService:
         return {"is_paused": False, "paused_until": None, "paused_until_display": None}
 
     async def load_schedule_from_db(self):
-        """Load schedule from database and register jobs"""
+        """Reconcile scheduled slots with the active schedule slots in the database
+
+        In cron mode jobs are keyed by slot ID and only slots that were added,
+        changed or removed since the last reconcile touch APScheduler. In
+        dispatcher mode the week is recompiled and swapped in whole.
+        """
         if not self.scheduler:
             self.start()
 
-        # Clear existing jobs except fire show and midnight reset
-        for job in self.scheduler.get_jobs():
-            if job.id not in [self._fire_show_job_id, self._midnight_reset_job_id]:
-                job.remove()
+        async with self._reload_lock:
+            started = time.perf_counter()
 
-        # Load active schedule slots from database
-        query = schedule_slots.select().where(schedule_slots.c.is_active == True)
-        rows = await database.fetch_all(query)
+            # Load active schedule slots from database
+            query = schedule_slots.select().where(schedule_slots.c.is_active == True)
+            rows = await database.fetch_all(query)
 
-        job_count = 0
-        for row in rows:
-            day_of_week = row["day_of_week"].lower()
-            time_str = row["time"]
-            program_name = row["program_name"]
-
-            # Parse time
-            hour, minute = map(int, time_str.split(":"))
-
-            # Map day names to APScheduler day_of_week values
-            day_map = {
-                "monday": "mon",
-                "tuesday": "tue",
-                "wednesday": "wed",
-                "thursday": "thu",
-                "friday": "fri",
-                "saturday": "sat",
-                "sunday": "sun"
+            if self.dispatcher_mode:
+                total, added, modified, removed = self._swap_timetable(rows)
+            else:
+                total, added, modified, removed = self._reconcile_jobs(rows)
+
+            self.last_reconcile = {
+                "mode": settings.scheduler_mode,
+                "added": added,
+                "modified": modified,
+                "removed": removed,
+                "unchanged": total - added - modified,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "at": datetime.now(self.timezone).isoformat(),
             }
 
-            trigger = CronTrigger(
-                day_of_week=day_map.get(day_of_week, day_of_week),
-                hour=hour,
-                minute=minute,
-                timezone=self.timezone
-            )
-
-            self.scheduler.add_job(
-                self.run_program,
-                trigger=trigger,
-                args=[program_name],
-                id=f"{day_of_week}_{time_str}_{program_name}",
-                replace_existing=True
-            )
-            job_count += 1
-
-        logger.info(f"Loaded {job_count} scheduled jobs from database")
-        return job_count
-
-    def _get_fire_show_volumes(self, base_volume: int, is_announcement: bool = True) -> dict:
-        """Get per-speaker volumes for fire show - mutes STAGE and RIGHT_POLE_01"""
-        vol = 85 if is_announcement else base_volume
-        return {
-            "BATHROOM_DOORS": vol,
-            "STAGE": 1,  # Muted near fire
-            "RIGHT_POLE_01": 1,  # Muted near fire
-            "RIGHT_POLE_02": vol,
-            "RIGHT_POLE_03": vol,
-            "LEFT_POLE_01": vol,
-            "LEFT_POLE_02": vol,
-            "LEFT_POLE_03": vol,
-            "CENTER_POLE": vol
+        logger.info(
+            f"Schedule reconciled: {total} slots "
+            f"(+{added} ~{modified} -{removed}) in {self.last_reconcile['duration_ms']}ms"
+        )
+        return total
+
+    def _reconcile_jobs(self, rows) -> tuple[int, int, int, int]:
+        """Diff slot rows against registered cron jobs; returns (total, added, modified, removed)"""
+        wanted = {}
+        for row in rows:
+            signature = (row["day_of_week"].lower(), row["time"], row["program_name"])
+            wanted[f"{SLOT_JOB_PREFIX}{row['id']}"] = signature
+
+        registered = {
+            job.id for job in self.scheduler.get_jobs() if job.id.startswith(SLOT_JOB_PREFIX)
         }
 
-    def _is_fire_program(self, program_type: str) -> bool:
-        """Check if this is a fire show program that needs zone muting"""
-        return program_type in ["adfire", "fireparking"]
+        added = modified = removed = 0
+        for job_id in registered - wanted.keys():
+            self.scheduler.remove_job(job_id)
+            self._remove_prewarm_job(job_id)
+            self._slot_jobs.pop(job_id, None)
+            removed += 1
+
+        for job_id, signature in wanted.items():
+            if job_id in registered and self._slot_jobs.get(job_id) == signature:
+                continue
+            self._add_slot_job(job_id, *signature)
+            if job_id in registered:
+                modified += 1
+            else:
+                added += 1
+
+        return len(wanted), added, modified, removed
+
+    def _swap_timetable(self, rows) -> tuple[int, int, int, int]:
+        """Compile slot rows into a new timetable and swap it in; returns (total, added, modified, removed)"""
+        timetable = Timetable(
+            ((row["id"], row["day_of_week"], row["time"], row["program_name"]) for row in rows),
+            self.timezone
+        )
+        previous = self._timetable.slots
+        current = timetable.slots
+        added = len(current.keys() - previous.keys())
+        removed = len(previous.keys() - current.keys())
+        modified = sum(1 for slot_id in current.keys() & previous.keys() if current[slot_id] != previous[slot_id])
+
+        self._timetable = timetable
+        self._dispatch_wake.set()
+        return len(timetable), added, modified, removed
+
+    async def _dispatch_loop(self):
+        """Dispatcher mode - a single timer that sleeps until the next timetable entry"""
+        cursor = datetime.now(self.timezone)  # Entries at or before this have been handled
+        prewarmed_for: Optional[datetime] = None
+        lead = timedelta(seconds=settings.prewarm_lead_seconds)
+
+        while True:
+            self._dispatch_wake.clear()
+            upcoming = self._timetable.next_after(cursor)
+            now = datetime.now(self.timezone)
+            if upcoming is None:
+                await self._wait_dispatch(DISPATCH_MAX_SLEEP)
+                cursor = max(cursor, datetime.now(self.timezone))
+                continue
+
+            fire_at, entries = upcoming
+            warm_at = fire_at - lead
+            if lead and prewarmed_for != fire_at and warm_at <= now < fire_at:
+                prewarmed_for = fire_at
+                self._spawn_dispatch(self.prewarm())
+
+            target = warm_at if lead and prewarmed_for != fire_at and now < warm_at else fire_at
+            delay = (target - now).total_seconds()
+            if delay > 0:
+                if await self._wait_dispatch(min(delay, DISPATCH_MAX_SLEEP)):
+                    # Reloaded - don't fire slots that were added in the past
+                    cursor = max(cursor, min(datetime.now(self.timezone), fire_at) - timedelta(microseconds=1))
+                continue
+
+            lateness = (now - fire_at).total_seconds()
+            if lateness > DISPATCH_MISFIRE_GRACE:
+                logger.warning(f"Skipping {len(entries)} slot(s) due at {fire_at.isoformat()}: {lateness:.0f}s late")
+            else:
+                for slot_id, program_name in entries:
+                    job_id = f"{SLOT_JOB_PREFIX}{slot_id}"
+                    self._fire_times[job_id] = fire_at
+                    self._spawn_dispatch(self.run_scheduled_program(program_name, job_id=job_id))
+            cursor = fire_at
+
+    async def _wait_dispatch(self, seconds: float) -> bool:
+        """Sleep in the dispatcher; returns True if woken early by a reload"""
+        try:
+            await asyncio.wait_for(self._dispatch_wake.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _spawn_dispatch(self, coro):
+        """Run a dispatched coroutine as a task, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._dispatch_runs.add(task)
+        task.add_done_callback(self._dispatch_runs.discard)
+
+    def request_reload(self):
+        """Debounced reconcile - rapid schedule edits collapse into one reload"""
+        if self._reload_task and not self._reload_task.done():
+            self._reload_task.cancel()
+        self._reload_task = asyncio.create_task(self._debounced_reload())
+
+    async def _debounced_reload(self):
+        """Wait out the debounce window, then reconcile"""
+        try:
+            await asyncio.sleep(settings.schedule_reload_debounce)
+        except asyncio.CancelledError:
+            return
+        # Past the debounce window - no longer cancellable by request_reload
+        self._reload_task = None
+        try:
+            await self.load_schedule_from_db()
+        except Exception as e:
+            logger.error(f"Debounced schedule reload failed: {e}")
+
+    def _add_slot_job(self, job_id: str, day_of_week: str, time_str: str, program_name: str):
+        """Register (or replace) the cron job and pre-warm job for one slot"""
+        # Parse time
+        hour, minute = map(int, time_str.split(":"))
+
+        # Map day names to APScheduler day_of_week values
+        day_map = {
+            "monday": "mon",
+            "tuesday": "tue",
+            "wednesday": "wed",
+            "thursday": "thu",
+            "friday": "fri",
+            "saturday": "sat",
+            "sunday": "sun"
+        }
+
+        trigger = CronTrigger(
+            day_of_week=day_map.get(day_of_week, day_of_week),
+            hour=hour,
+            minute=minute,
+            timezone=self.timezone
+        )
+
+        self.scheduler.add_job(
+            self.run_scheduled_program,
+            trigger=trigger,
+            args=[program_name],
+            kwargs={"job_id": job_id},
+            id=job_id,
+            replace_existing=True
+        )
+        self._remove_prewarm_job(job_id)
+        self._add_prewarm_job(job_id, day_of_week, hour, minute)
+        self._slot_jobs[job_id] = (day_of_week, time_str, program_name)
+
+    def _remove_prewarm_job(self, slot_job_id: str):
+        """Remove the pre-warm job belonging to a slot job, if any"""
+        try:
+            self.scheduler.remove_job(f"{PREWARM_JOB_PREFIX}{slot_job_id}")
+        except JobLookupError:
+            pass
+
+    def _add_prewarm_job(self, slot_job_id: str, day_of_week: str, hour: int, minute: int):
+        """Register a pre-warm job prewarm_lead_seconds before a slot"""
+        lead = settings.prewarm_lead_seconds
+        if lead <= 0 or day_of_week not in WEEK_DAYS:
+            return
+
+        # Step back from the slot in seconds-of-week, wrapping Monday 00:00 to Sunday
+        slot_second = (WEEK_DAYS.index(day_of_week) * 24 * 60 + hour * 60 + minute) * 60
+        warm_second = (slot_second - lead) % (7 * 24 * 60 * 60)
+        warm_day, rest = divmod(warm_second, 24 * 60 * 60)
+        warm_hour, rest = divmod(rest, 60 * 60)
+        warm_minute, warm_sec = divmod(rest, 60)
+
+        trigger = CronTrigger(
+            day_of_week=WEEK_DAYS[warm_day][:3],
+            hour=warm_hour,
+            minute=warm_minute,
+            second=warm_sec,
+            timezone=self.timezone
+        )
+        self.scheduler.add_job(
+            self.prewarm,
+            trigger=trigger,
+            id=f"{PREWARM_JOB_PREFIX}{slot_job_id}",
+            replace_existing=True
+        )
+
+    async def prewarm(self):
+        """Resolve token, group and volumes ahead of the next slot"""
+        if self.is_paused():
+            return
+        try:
+            with sonos_api.priority(PRIORITY_PROGRAM):
+                result = await sonos_api.warm_up()
+            logger.info(f"Pre-warmed for next slot in {result['duration']}s (group {result['group_id']})")
+        except Exception as e:
+            logger.warning(f"Pre-warm failed, slot will resolve on demand: {e}")
+
+    def _is_slot_job(self, job) -> bool:
+        """Check if an APScheduler job is a scheduled program slot"""
+        return (
+            job.id not in [self._fire_show_job_id, self._midnight_reset_job_id]
+            and not job.id.startswith(PREWARM_JOB_PREFIX)
+        )
 
-    async def run_program(self, program_name: str, manual: bool = False):
+    async def run_program(self, program_name: str, manual: bool = False,
+                          job: Optional[ProgramJob] = None, policy: Optional[str] = None,
+                          scheduled_at: Optional[datetime] = None):
         """Execute a program
 
+        Runs go through a single executor for the speaker group. If another
+        program is active, the overlap policy (settings.program_overlap_policy
+        unless given) decides whether to preempt it at its next step boundary,
+        queue behind it, or drop a duplicate.
+
         Args:
             program_name: Name of the program to run
             manual: If True, this is a manual trigger (ignores pause state)
+            job: Optional job handle that receives per-step progress
+            policy: Optional overlap policy override
+            scheduled_at: Scheduled fire time, for start-jitter measurement
         """
+        if job is None:
+            job = ProgramJob(program_name, manual=manual, scheduled_at=scheduled_at)
+            self._register_job(job)
+        policy = policy or settings.program_overlap_policy
+
+        active = self._active_job
+        if active and not active.is_finished:
+            if policy == OVERLAP_DROP_DUPLICATE and self._has_pending_duplicate(job):
+                logger.info(f"Dropping {program_name} - already running or queued")
+                job.finish(JOB_SKIPPED, "Duplicate of a running or queued program")
+                await self._log_execution(program_name, "skipped", job.error, job=job)
+                return
+            if policy == OVERLAP_PREEMPT:
+                logger.info(f"Preempting {active.program_name} for {program_name}")
+                active.request_cancel(JOB_PREEMPTED, f"Preempted by {program_name}")
+
+        async with self._executor_lock:
+            # Cancelled while queued - already finished and logged by cancel_job
+            if job.is_finished:
+                return
+            self._active_job = job
+            try:
+                # Program traffic gets the rate limiter's priority lane
+                with sonos_api.priority(PRIORITY_PROGRAM):
+                    await self._run_program(program_name, manual, job)
+            finally:
+                self._active_job = None
+
+    def submit_program(self, program_name: str, manual: bool = True) -> ProgramJob:
+        """Run a program in the background and return its job handle immediately"""
+        job = ProgramJob(program_name, manual=manual)
+        self._register_job(job)
+        job.task = asyncio.create_task(self.run_program(program_name, manual=manual, job=job))
+        return job
+
+    def _register_job(self, job: ProgramJob):
+        """Track a job and drop the oldest finished jobs beyond MAX_JOB_HISTORY"""
+        self.jobs[job.id] = job
+        finished = [j for j in self.jobs.values() if j.is_finished]
+        for old in finished[:max(0, len(self.jobs) - MAX_JOB_HISTORY)]:
+            del self.jobs[old.id]
+
+    def _has_pending_duplicate(self, job: ProgramJob) -> bool:
+        """Check if another unfinished job is running the same program"""
+        return any(
+            other is not job and other.program_name == job.program_name and not other.is_finished
+            for other in self.jobs.values()
+        )
+
+    def get_job(self, job_id: str) -> Optional[ProgramJob]:
+        """Get a program job by ID"""
+        return self.jobs.get(job_id)
+
+    async def cancel_job(self, job_id: str) -> Optional[ProgramJob]:
+        """Cancel a program job
+
+        A running job stops at its next step boundary. A job still queued
+        behind the executor is finished as cancelled right away and skipped
+        when its turn comes.
+        """
+        job = self.jobs.get(job_id)
+        if job:
+            job.request_cancel(JOB_CANCELLED, "Cancelled by user")
+            if job.status == JOB_QUEUED and job is not self._active_job and job.cancel_requested:
+                job.finish(job.cancel_status, job.cancel_reason)
+                await self._log_execution(job.program_name, job.cancel_status, job.cancel_reason, job=job)
+        return job
+
+    async def _run_program(self, program_name: str, manual: bool, job: ProgramJob):
+        """Execute a program's favorite sequence (see run_program)"""
+        # Cancelled or preempted while still queued
+        if job.cancel_requested:
+            job.finish(job.cancel_status, job.cancel_reason)
+            await self._log_execution(program_name, job.cancel_status, job.cancel_reason, job=job)
+            return
+
         # Check if scheduler is paused (skip check for manual triggers)
         if not manual and self.is_paused():
             logger.info(f"Skipping program {program_name} - scheduler is paused until {self.paused_until}")
+            job.finish(JOB_SKIPPED, "Scheduler is paused")
             return
 
         self.current_program = program_name
         logger.info(f"Running program: {program_name}")
+        event_bus.publish("program_started", {
+            "program": program_name,
+            "display_name": self.get_program_display_name(program_name),
+            "manual": manual
+        })
 
         try:
+            plan = await program_registry.get_plan(program_name)
+
             # Handle pause specially
-            if program_name == "pause.py" or program_name == "pause":
+            if plan.is_pause:
+                job.start(1)
                 await sonos_api.pause_all()
-                await self._log_execution(program_name, "success")
-                self.current_program = None
+                job.mark_playing()
+                job.finish(JOB_COMPLETED)
+                await self._log_execution(program_name, "success", job=job)
                 return
 
-            # Extract volume from program name (e.g., "75fm.py" -> 75)
-            volume = self._extract_volume(program_name)
-            program_type = self._extract_type(program_name)
-
-            # Get favorite IDs based on program type
-            favorite_sequence = self._get_favorite_sequence(program_type)
-            is_fire_program = self._is_fire_program(program_type)
-
-            # Execute the program
-            group_id = await sonos_api.ensure_group()
-
-            for i, (favorite_id, duration, vol_override) in enumerate(favorite_sequence):
-                use_volume = vol_override if vol_override else volume
-                await sonos_api.load_favorite(group_id, favorite_id)
-
-                # When fire_show_mode is active OR running a fire program,
-                # use per-speaker volumes to mute STAGE and RIGHT_POLE_01
-                if self.fire_show_mode or is_fire_program:
-                    is_last = (i == len(favorite_sequence) - 1)
-                    fire_volumes = self._get_fire_show_volumes(volume, is_announcement=not is_last)
-                    await sonos_api.set_per_speaker_volumes(fire_volumes)
-                else:
-                    await sonos_api.set_all_volumes(use_volume)
-
-                await sonos_api.play(group_id)
-
-                if duration > 0:
-                    await asyncio.sleep(duration)
+            job.start(len(plan.steps))
+
+            # Execute the program - each step's Sonos calls (including retries)
+            # must finish within program_step_deadline so the slot isn't pushed late
+            with sonos_api.deadline(settings.program_step_deadline):
+                group_id = await sonos_api.ensure_group()
+
+            for i, step in enumerate(plan.steps):
+                # Step boundary - stop here if cancelled or preempted
+                if job.cancel_requested:
+                    break
+
+                with sonos_api.deadline(settings.program_step_deadline):
+                    try:
+                        await self._play_step(group_id, step, job)
+                    except SonosAPIError as e:
+                        if not e.is_group_gone:
+                            raise
+                        # Regrouped under us - the failed request already dropped the
+                        # cached topology, so resolve the group again and retry once
+                        logger.warning(f"Group {group_id} gone during {program_name}, re-resolving")
+                        group_id = await sonos_api.ensure_group()
+                        await self._play_step(group_id, step, job)
+
+                job.step(i, step.favorite_id, step.delay)
+
+                if step.delay > 0:
+                    await job.sleep(step.delay)
+
+            if job.cancel_requested:
+                logger.info(f"Program {program_name} stopped: {job.cancel_reason}")
+                job.finish(job.cancel_status, job.cancel_reason)
+                await self._log_execution(program_name, job.cancel_status, job.cancel_reason, job=job)
+                return
 
-            await self._log_execution(program_name, "success")
+            job.finish(JOB_COMPLETED)
+            await self._log_execution(program_name, "success", job=job)
             logger.info(f"Program {program_name} completed successfully")
 
+        except asyncio.CancelledError:
+            logger.info(f"Program {program_name} cancelled")
+            job.finish(JOB_CANCELLED)
+            await self._log_execution(program_name, "cancelled", job=job)
+            raise
+
         except Exception as e:
             logger.error(f"Error running program {program_name}: {e}")
-            await self._log_execution(program_name, "error", str(e))
+            job.finish(JOB_FAILED, str(e))
+            await self._log_execution(program_name, "error", str(e), job=job)
 
         finally:
             self.current_program = None
 
+    async def _play_step(self, group_id: str, step: PlanStep, job: ProgramJob):
+        """Load a step's favorite, apply its volumes and start playback"""
+        await sonos_api.load_favorite(group_id, step.favorite_id)
+        job.mark_loaded()
+
+        # Fire show mode mutes STAGE and RIGHT_POLE_01 for every program
+        volumes = step.fire_volumes if self.fire_show_mode else step.volumes
+        await sonos_api.apply_volumes(dict(volumes))
+
+        await sonos_api.play(group_id)
+        job.mark_playing()
+
     def _extract_volume(self, program_name: str) -> int:
         """Extract volume level from program name"""
-        # Remove .py extension
-        name = program_name.replace(".py", "")
-        # Extract leading digits
-        digits = ""
-        for char in name:
-            if char.isdigit():
-                digits += char
-            else:
-                break
-        return int(digits) if digits else 75
+        return parse_program_name(program_name)[0]
 
     def _extract_type(self, program_name: str) -> str:
         """Extract program type from program name"""
-        name = program_name.replace(".py", "")
-        # Remove leading digits
-        for i, char in enumerate(name):
-            if not char.isdigit():
-                return name[i:]
-        return "fm"
+        return parse_program_name(program_name)[1]
 
     def get_program_display_name(self, program_name: str) -> str:
         """Get human-readable display name for a program"""
@@ -350,41 +704,44 @@ class SchedulerService:
         type_name = PROGRAM_TYPE_NAMES.get(prog_type, prog_type)
         return f"{type_name} @ {volume}%"
 
-    def _get_favorite_sequence(self, program_type: str) -> list[tuple[str, int, Optional[int]]]:
-        """Get the favorite playlist sequence for a program type
-        Returns list of (favorite_id, sleep_duration, volume_override)
-        Based on original scripts - timings match audio clip durations
-        """
-        sequences = {
-            # Business Ad: 75ad.py - playlist 32 (14s), 35 (15s), then music
-            "ad": [("32", 14, 85), ("35", 15, 85), ("36", 0, None)],
-            # Flea Market Ad: 75fm.py - same as ad
-            "fm": [("32", 14, 85), ("35", 15, 85), ("36", 0, None)],
-            # Social Media: 75sm.py - playlist 30 (23s), 31 (27s), then music
-            "sm": [("30", 23, 85), ("31", 27, 85), ("36", 0, None)],
-            # Parking: 75parking.py - playlist 41 (17s), 44 (24s), then music
-            "parking": [("41", 17, 85), ("44", 24, 85), ("36", 0, None)],
-            # Gift Shop (TIGS): 75TIGS.py - playlist 43 (35s), then music
-            "TIGS": [("43", 35, 85), ("36", 0, None)],
-            # Fire Show Ad: 85adfire.py - playlist 40 (22s), then music
-            "adfire": [("40", 22, 85), ("36", 0, None)],
-            # Fire Parking: 75fireparking.py - playlist 41 (17s), 44 (24s), then music
-            "fireparking": [("41", 17, 85), ("44", 24, 85), ("36", 0, None)],
-        }
-        return sequences.get(program_type, [("36", 0, None)])
-
-    async def _log_execution(self, program_name: str, status: str, error_message: str = None):
+    async def _log_execution(self, program_name: str, status: str, error_message: str = None,
+                             job: Optional[ProgramJob] = None):
         """Log program execution to database"""
         query = execution_logs.insert().values(
             program_name=program_name,
             executed_at=datetime.now(self.timezone),
             status=status,
-            error_message=error_message
+            error_message=error_message,
+            started_at=job.started_at if job else None,
+            finished_at=job.finished_at if job else None,
+            scheduled_at=job.scheduled_at if job else None,
+            handler_at=job.handler_at if job else None,
+            first_load_at=job.first_load_at if job else None,
+            first_play_at=job.first_play_at if job else None
         )
         await database.execute(query)
+        event_bus.publish("program_finished", {
+            "program": program_name,
+            "status": status,
+            "error_message": error_message
+        })
 
     def get_next_job(self) -> Optional[dict]:
         """Get the next scheduled job"""
+        if self.dispatcher_mode:
+            upcoming = self._timetable.next_after(datetime.now(self.timezone))
+            if not upcoming:
+                return None
+            fire_at, entries = upcoming
+            program = entries[0][1]
+            return {
+                "program": program,
+                "display_name": self.get_program_display_name(program),
+                "time": fire_at.strftime("%H:%M"),
+                "day": fire_at.strftime("%A"),
+                "datetime": fire_at.isoformat()
+            }
+
         if not self.scheduler:
             return None
 
@@ -392,8 +749,8 @@ class SchedulerService:
         if not jobs:
             return None
 
-        # Filter out system jobs
-        regular_jobs = [j for j in jobs if j.id not in [self._fire_show_job_id, self._midnight_reset_job_id]]
+        # Filter out system and pre-warm jobs
+        regular_jobs = [j for j in jobs if self._is_slot_job(j)]
         if not regular_jobs:
             return None
 
@@ -409,16 +766,26 @@ class SchedulerService:
             }
         return None
 
+    def _get_slot_count(self) -> int:
+        """Number of scheduled slots in the active mode"""
+        if self.dispatcher_mode:
+            return len(self._timetable)
+        if not self.scheduler:
+            return 0
+        return len([j for j in self.scheduler.get_jobs() if self._is_slot_job(j)])
+
     def get_status(self) -> dict:
         """Get scheduler status"""
         return {
             "is_running": self.is_running,
             "current_program": self.current_program,
             "current_program_display": self.get_program_display_name(self.current_program) if self.current_program else None,
-            "job_count": len(self.scheduler.get_jobs()) if self.scheduler else 0,
+            "job_count": self._get_slot_count(),
             "next_job": self.get_next_job(),
             "fire_show_mode": self.get_fire_show_status(),
-            "pause_status": self.get_pause_status()
+            "pause_status": self.get_pause_status(),
+            "last_reconcile": self.last_reconcile,
+            "program_plans": program_registry.get_stats()
         }
 
 
@@ -3,15 +3,119 @@ import base64
 import ssl
 import certifi
 import asyncio
+import logging
+import random
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional
 from ..config import get_settings
+from .token_store import TokenStore
+from .rate_limiter import RateLimiter, RateLimitedError, PRIORITY_INTERACTIVE
+from .event_bus import event_bus
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Create SSL context using certifi's CA bundle
 ssl_context = ssl.create_default_context(cafile=certifi.where())
 
+# Sonos endpoints - SONOS_API_BASE_URL sends both to a stand-in server
+OAUTH_URL = (settings.sonos_api_base_url or "https://api.sonos.com") + "/login/v3/oauth/access"
+CONTROL_URL = (settings.sonos_api_base_url or "https://api.ws.sonos.com") + "/control/api/v1"
+
+# Refresh this many seconds before the token actually expires
+TOKEN_EXPIRY_MARGIN = 300
+# Background renewal fires this many seconds before token_expires_at
+TOKEN_RENEWAL_LEAD = 120
+# Minimum wait between background renewal attempts
+TOKEN_RENEWAL_RETRY = 30
+
+# Statuses worth retrying - rate limiting and transient server errors
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Absolute time.monotonic() deadline for Sonos calls made in the current task
+_request_deadline: ContextVar[Optional[float]] = ContextVar("sonos_request_deadline", default=None)
+
+# Priority of Sonos calls made in the current task (see rate_limiter)
+_request_priority: ContextVar[str] = ContextVar("sonos_request_priority", default=PRIORITY_INTERACTIVE)
+
+# Token bucket (refill per second, burst capacity) per endpoint scope
+SONOS_RATE_LIMITS = {
+    "household": (2.0, 10),
+    "group": (5.0, 20),
+    "player": (10.0, 30),
+}
+
+# How long player volumes are trusted to still be equal after a per-player
+# write before a uniform change must re-normalize them player by player
+VOLUME_NORMALIZE_TTL = 3600
+
+# Error codes Sonos returns when a group ID no longer exists
+GROUP_GONE_ERRORS = ("ERROR_RESOURCE_GONE", "groupCoordinatorChanged", "ERROR_INVALID_OBJECT_ID")
+
+
+class SonosAPIError(Exception):
+    """Raised when a Sonos Control API request returns a non-200 status"""
+
+    def __init__(self, message: str, status: int = 0, text: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.text = text
+
+    @property
+    def is_group_gone(self) -> bool:
+        """True if the error means the target group no longer exists"""
+        return self.status in (404, 410) or any(code in self.text for code in GROUP_GONE_ERRORS)
+
+
+class DeadlineExceededError(SonosAPIError):
+    """Raised instead of sending a request once the step deadline has passed"""
+
+
+class RetryPolicy:
+    """Retry settings for one idempotency class of request"""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float,
+                 jitter: float = 0.5, retry_after_cap: float = 5.0, retry_unsafe: bool = True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_after_cap = retry_after_cap
+        # Whether 5xx/timeouts are retried - they may mean the request was applied
+        self.retry_unsafe = retry_unsafe
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before the next attempt"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.retry_after_cap)
+            except ValueError:
+                pass  # HTTP-date form, fall back to backoff
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay - random.uniform(0, delay * self.jitter)
+
+
+# Policies keyed by idempotency class
+RETRY_POLICIES = {
+    # GETs - always safe to repeat
+    "read": RetryPolicy(
+        settings.sonos_retry_max_attempts, settings.sonos_retry_base_delay, 2.0,
+        retry_after_cap=settings.sonos_retry_after_cap
+    ),
+    # Volume/favorite/play/pause POSTs - repeating sets the same state
+    "write": RetryPolicy(
+        settings.sonos_retry_max_attempts, settings.sonos_retry_base_delay, 2.0,
+        retry_after_cap=settings.sonos_retry_after_cap
+    ),
+    # createGroup - only retried when Sonos says it was not processed (429)
+    "unsafe": RetryPolicy(
+        2, settings.sonos_retry_base_delay, 1.0,
+        retry_after_cap=settings.sonos_retry_after_cap, retry_unsafe=False
+    ),
+}
+
 
 class SonosAPI:
     """Async wrapper for Sonos Control API"""
@@ -22,6 +126,37 @@ class SonosAPI:
         self.household_id: Optional[str] = None
         self.current_group_id: Optional[str] = None
         self._session: Optional[aiohttp.ClientSession] = None
+        # Shared in-flight token refresh and background renewal task
+        self._refresh_task: Optional[asyncio.Future] = None
+        self._renewal_task: Optional[asyncio.Task] = None
+        # On-disk copy of token/household so restarts skip the OAuth round trip
+        self._token_store = TokenStore(
+            settings.sonos_token_cache_path,
+            f"{settings.sonos_client_id}:{settings.sonos_refresh_token}"
+        )
+        self._load_persisted_state()
+        # Topology cache - last /groups response and when it was fetched
+        self._topology: Optional[dict] = None
+        self._topology_fetched_at: float = 0
+        self.topology_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self.retry_stats = {"retries": 0, "gave_up": 0, "by_reason": {}}
+        # Volume planner - when all players were last set to the same level
+        self._volumes_normalized_at: float = 0
+        self.volume_plan_stats = {
+            "plans": 0, "group_volume": 0, "per_player": 0, "calls_saved": 0, "unchanged_skipped": 0
+        }
+        # Last-known volume per player ID -> (volume, time.time() it was confirmed)
+        self._volume_cache: dict[str, tuple[int, float]] = {}
+        self.rate_limiter = RateLimiter(SONOS_RATE_LIMITS) if settings.sonos_rate_limit_enabled else None
+
+    def _load_persisted_state(self):
+        """Restore a still-valid token and household ID from the token store"""
+        data = self._token_store.load()
+        if data.get("access_token"):
+            self.access_token = data["access_token"]
+            self.token_expires_at = data["token_expires_at"]
+            logger.info("Reusing persisted Sonos access token")
+        self.household_id = data.get("household_id")
 
     async def get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
@@ -35,9 +170,19 @@ class SonosAPI:
             await self._session.close()
 
     async def refresh_access_token(self) -> str:
-        """Refresh the OAuth access token"""
+        """Refresh the OAuth access token
+
+        Concurrent callers share a single in-flight refresh request.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_access_token())
+        # Shield so one cancelled caller doesn't abort the refresh for the others
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh_access_token(self) -> str:
+        """Perform the OAuth refresh request"""
         session = await self.get_session()
-        url = "https://api.sonos.com/login/v3/oauth/access"
+        url = OAUTH_URL
         payload = {
             "grant_type": "refresh_token",
             "refresh_token": settings.sonos_refresh_token
@@ -56,7 +201,10 @@ class SonosAPI:
             data = await response.json()
             self.access_token = data["access_token"]
             # Token typically expires in 1 hour, refresh 5 minutes early
-            self.token_expires_at = time.time() + 3300
+            expires_in = int(data.get("expires_in", 3600))
+            self.token_expires_at = time.time() + max(expires_in - TOKEN_EXPIRY_MARGIN, expires_in // 2)
+            logger.info(f"Sonos access token refreshed, valid for {expires_in}s")
+            self._token_store.save(access_token=self.access_token, token_expires_at=self.token_expires_at)
             return self.access_token
 
     async def ensure_valid_token(self) -> str:
@@ -69,6 +217,42 @@ class SonosAPI:
         """Force token to be refreshed on next request"""
         self.access_token = None
         self.token_expires_at = 0
+        self._token_store.clear_token()
+
+    async def _handle_rejected_token(self, rejected_token: Optional[str]):
+        """Refresh after a 401 unless another caller already replaced the token"""
+        if self.access_token == rejected_token:
+            self.invalidate_token()
+        await self.ensure_valid_token()
+
+    def start_token_renewal(self):
+        """Start the background task that renews the token before it expires"""
+        if self._renewal_task is None or self._renewal_task.done():
+            self._renewal_task = asyncio.create_task(self._token_renewal_loop())
+            logger.info("Sonos token renewal started")
+
+    async def stop_token_renewal(self):
+        """Stop the background token renewal task"""
+        if self._renewal_task and not self._renewal_task.done():
+            self._renewal_task.cancel()
+            try:
+                await self._renewal_task
+            except asyncio.CancelledError:
+                pass
+        self._renewal_task = None
+
+    async def _token_renewal_loop(self):
+        """Renew the token TOKEN_RENEWAL_LEAD seconds ahead of token_expires_at"""
+        while True:
+            delay = self.token_expires_at - TOKEN_RENEWAL_LEAD - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            try:
+                await self.refresh_access_token()
+            except Exception as e:
+                logger.error(f"Background token renewal failed: {e}")
+            await asyncio.sleep(TOKEN_RENEWAL_RETRY)
 
     async def get_headers(self) -> dict:
         """Get headers with valid auth token"""
@@ -78,54 +262,206 @@ class SonosAPI:
             "Authorization": f"Bearer {token}"
         }
 
+    @contextmanager
+    def deadline(self, seconds: float):
+        """Bound all Sonos calls (including retries) in this block to `seconds`"""
+        token = _request_deadline.set(time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            _request_deadline.reset(token)
+
+    @contextmanager
+    def priority(self, priority: str):
+        """Run Sonos calls in this block at the given rate limiter priority"""
+        token = _request_priority.set(priority)
+        try:
+            yield
+        finally:
+            _request_priority.reset(token)
+
+    def get_rate_limiter_stats(self) -> Optional[dict]:
+        """Get token bucket levels and counters"""
+        return self.rate_limiter.get_stats() if self.rate_limiter else None
+
+    def _idempotency_class(self, method: str, url: str) -> str:
+        """Classify a request for the retry policy"""
+        if method == "GET":
+            return "read"
+        if url.endswith("/createGroup"):
+            return "unsafe"
+        return "write"
+
+    def _count_retry(self, reason: str):
+        """Record a retry in the retry counters"""
+        self.retry_stats["retries"] += 1
+        by_reason = self.retry_stats["by_reason"]
+        by_reason[reason] = by_reason.get(reason, 0) + 1
+
+    def get_retry_stats(self) -> dict:
+        """Get retry counters"""
+        return {**self.retry_stats, "by_reason": dict(self.retry_stats["by_reason"])}
+
     async def _request_with_retry(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
-        """Make a request with automatic retry on 401 errors"""
+        """Make a request with automatic retry
+
+        401s are retried once after a token refresh. 429/5xx responses and
+        connection errors are retried per RETRY_POLICIES, honoring Retry-After
+        and any deadline set with `deadline()`.
+        """
         session = await self.get_session()
-        headers = await self.get_headers()
-
-        async with session.request(method, url, headers=headers, ssl=ssl_context, **kwargs) as response:
-            if response.status == 401:
-                # Token is invalid, refresh and retry once
-                self.invalidate_token()
-                headers = await self.get_headers()
-                async with session.request(method, url, headers=headers, ssl=ssl_context, **kwargs) as retry_response:
-                    text = await retry_response.text()
-                    if retry_response.status != 200:
-                        raise Exception(f"Request failed after retry: {retry_response.status} - {text}")
-                    try:
-                        return await retry_response.json()
-                    except:
-                        return {"status": "ok"}
-
-            text = await response.text()
-            if response.status != 200:
-                raise Exception(f"Request failed: {response.status} - {text}")
+        policy = RETRY_POLICIES[self._idempotency_class(method, url)]
+        deadline = _request_deadline.get()
+        token_refreshed = False
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self._check_deadline(method, url, deadline)
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(url, _request_priority.get(), deadline)
+            headers = await self.get_headers()
+            sent_token = self.access_token
+            timeout = settings.sonos_request_timeout
+            if deadline is not None:
+                timeout = min(timeout, self._check_deadline(method, url, deadline))
+            retry_after = None
+
             try:
-                return await response.json()
-            except:
-                return {"status": "ok"}
+                async with session.request(
+                    method, url, headers=headers, ssl=ssl_context,
+                    timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+                ) as response:
+                    if response.status == 401 and not token_refreshed:
+                        # Token is invalid, refresh (shared with concurrent callers) and retry once
+                        token_refreshed = True
+                        attempt -= 1
+                        await self._handle_rejected_token(sent_token)
+                        continue
+
+                    text = await response.text()
+                    if response.status == 200:
+                        try:
+                            return await response.json()
+                        except:
+                            return {"status": "ok"}
+
+                    prefix = "Request failed after retry" if attempt > 1 or token_refreshed else "Request failed"
+                    message = f"{prefix}: {response.status} - {text}"
+                    retryable = response.status == 429 or (
+                        response.status in RETRYABLE_STATUSES and policy.retry_unsafe
+                    )
+                    if not retryable or attempt >= policy.max_attempts:
+                        if retryable:
+                            self.retry_stats["gave_up"] += 1
+                        self._raise_for_status(url, response.status, text, message)
+                    reason = str(response.status)
+                    retry_after = response.headers.get("Retry-After")
+                    error = SonosAPIError(message, status=response.status, text=text)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not policy.retry_unsafe or attempt >= policy.max_attempts:
+                    self.retry_stats["gave_up"] += 1
+                    raise
+                reason = type(e).__name__
+                error = e
+
+            delay = policy.delay(attempt, retry_after)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                self.retry_stats["gave_up"] += 1
+                logger.warning(f"{method} {url} not retried - step deadline reached ({reason})")
+                raise error
+
+            self._count_retry(reason)
+            logger.warning(
+                f"{method} {url} failed ({reason}), retry {attempt}/{policy.max_attempts - 1} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def _check_deadline(self, method: str, url: str, deadline: Optional[float]) -> Optional[float]:
+        """Get the seconds left before the deadline, failing fast once none are left"""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"{method} {url} not sent - step deadline exceeded")
+        return remaining
+
+    def _raise_for_status(self, url: str, status: int, text: str, message: str):
+        """Raise a SonosAPIError, dropping cached topology if the group is gone"""
+        error = SonosAPIError(message, status=status, text=text)
+        if "/groups/" in url and error.is_group_gone:
+            self.invalidate_topology()
+        raise error
 
     async def get_household_id(self) -> str:
         """Get the household ID"""
         if self.household_id:
             return self.household_id
 
-        data = await self._request_with_retry("GET", "https://api.ws.sonos.com/control/api/v1/households")
+        data = await self._request_with_retry("GET", f"{CONTROL_URL}/households")
         self.household_id = data["households"][0]["id"]
+        self._token_store.save(household_id=self.household_id)
         return self.household_id
 
-    async def get_groups(self) -> list[dict]:
-        """Get all speaker groups"""
+    def _topology_is_fresh(self) -> bool:
+        """Check if the cached /groups response is still within its TTL"""
+        return (
+            self._topology is not None
+            and time.time() - self._topology_fetched_at < settings.group_cache_ttl
+        )
+
+    def invalidate_topology(self):
+        """Drop the cached group list and resolved group ID"""
+        if self._topology is not None or self.current_group_id is not None:
+            self.topology_stats["invalidations"] += 1
+        self._topology = None
+        self._topology_fetched_at = 0
+        self.current_group_id = None
+
+    async def get_topology(self, refresh: bool = False) -> dict:
+        """Get the household /groups response (groups and players), cached for group_cache_ttl"""
+        if not refresh and self._topology_is_fresh():
+            self.topology_stats["hits"] += 1
+            return self._topology
+
+        self.topology_stats["misses"] += 1
         household_id = await self.get_household_id()
-        url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
+        url = f"{CONTROL_URL}/households/{household_id}/groups"
         data = await self._request_with_retry("GET", url)
+        if self._group_layout(data) != self._group_layout(self._topology):
+            event_bus.publish("topology", {"groups": self._group_layout(data)})
+        self._topology = data
+        self._topology_fetched_at = time.time()
+        return data
+
+    def _group_layout(self, topology: Optional[dict]) -> list[dict]:
+        """Reduce a /groups response to group IDs and their sorted player IDs"""
+        if not topology:
+            return []
+        return sorted(
+            ({"id": group["id"], "playerIds": sorted(group.get("playerIds", []))}
+             for group in topology.get("groups", [])),
+            key=lambda group: group["id"]
+        )
+
+    def get_topology_stats(self) -> dict:
+        """Get topology cache hit/miss counters"""
+        age = time.time() - self._topology_fetched_at if self._topology is not None else None
+        return {
+            **self.topology_stats,
+            "ttl": settings.group_cache_ttl,
+            "age": round(age, 1) if age is not None else None,
+            "group_id": self.current_group_id,
+        }
+
+    async def get_groups(self, refresh: bool = False) -> list[dict]:
+        """Get all speaker groups"""
+        data = await self.get_topology(refresh=refresh)
         return data.get("groups", [])
 
-    async def get_players(self) -> list[dict]:
+    async def get_players(self, refresh: bool = False) -> list[dict]:
         """Get all players in the household"""
-        household_id = await self.get_household_id()
-        url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
-        data = await self._request_with_retry("GET", url)
+        data = await self.get_topology(refresh=refresh)
         return data.get("players", [])
 
     async def find_existing_group(self, player_ids: list[str]) -> Optional[str]:
@@ -142,7 +478,7 @@ class SonosAPI:
         start_time = time.time()
         target_set = set(player_ids)
         while time.time() - start_time < timeout:
-            groups = await self.get_groups()
+            groups = await self.get_groups(refresh=True)
             for group in groups:
                 if target_set.issubset(set(group.get("playerIds", []))):
                     return group["id"]
@@ -152,10 +488,12 @@ class SonosAPI:
     async def create_group(self, player_ids: list[str]) -> str:
         """Create a new group with specified players"""
         household_id = await self.get_household_id()
-        url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups/createGroup"
+        url = f"{CONTROL_URL}/households/{household_id}/groups/createGroup"
         payload = {"playerIds": player_ids}
 
         data = await self._request_with_retry("POST", url, json=payload)
+        # Topology changed - drop the cached group list
+        self.invalidate_topology()
         group_id = data.get("id")
         if group_id:
             self.current_group_id = group_id
@@ -178,6 +516,11 @@ class SonosAPI:
         """Ensure all speakers are grouped and return the group ID"""
         player_ids = list(settings.speakers.values())
 
+        # Reuse the resolved group while the topology cache is fresh
+        if self.current_group_id and self._topology_is_fresh():
+            self.topology_stats["hits"] += 1
+            return self.current_group_id
+
         # Check for existing group
         existing = await self.find_existing_group(player_ids)
         if existing:
@@ -187,35 +530,87 @@ class SonosAPI:
         # Create new group
         return await self.create_group(player_ids)
 
+    async def warm_up(self) -> dict:
+        """Prepare for an upcoming program so it can go straight to load + play
+
+        Refreshes the token if it would expire soon, re-reads the topology and
+        verifies/forms the group, and primes stale entries in the volume cache.
+        """
+        started = time.monotonic()
+        if self.token_expires_at - time.time() < TOKEN_EXPIRY_MARGIN:
+            await self.refresh_access_token()
+        await self.get_topology(refresh=True)
+        group_id = await self.ensure_group()
+        await self.get_all_volumes(use_cache=True)
+        return {"group_id": group_id, "duration": round(time.monotonic() - started, 3)}
+
     async def get_favorites(self) -> list[dict]:
         """Get all favorites/playlists"""
         household_id = await self.get_household_id()
-        url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/favorites"
+        url = f"{CONTROL_URL}/households/{household_id}/favorites"
         data = await self._request_with_retry("GET", url)
         return data.get("items", [])
 
     async def load_favorite(self, group_id: str, favorite_id: str) -> bool:
         """Load a favorite playlist into a group"""
-        url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/favorites"
+        url = f"{CONTROL_URL}/groups/{group_id}/favorites"
         payload = {"favoriteId": favorite_id}
         await self._request_with_retry("POST", url, json=payload)
         return True
 
+    def _cache_volume(self, player_id: str, volume: int):
+        """Record a confirmed player volume, publishing a volume event if it changed"""
+        previous = self._volume_cache.get(player_id)
+        self._volume_cache[player_id] = (volume, time.time())
+        if previous is None or previous[0] != volume:
+            speaker_name = next((name for name, pid in settings.speakers.items() if pid == player_id), None)
+            event_bus.publish("volume", {"speaker": speaker_name, "player_id": player_id, "volume": volume})
+
+    def get_cached_volume(self, player_id: str) -> Optional[int]:
+        """Get a player's last-known volume if it is within volume_cache_ttl"""
+        entry = self._volume_cache.get(player_id)
+        if entry and time.time() - entry[1] < settings.volume_cache_ttl:
+            return entry[0]
+        return None
+
+    def get_volume_ages(self) -> dict:
+        """Get seconds since each speaker's volume was last confirmed (None if unknown)"""
+        now = time.time()
+        ages = {}
+        for name, player_id in settings.speakers.items():
+            entry = self._volume_cache.get(player_id)
+            ages[name] = round(now - entry[1], 1) if entry else None
+        return ages
+
+    def invalidate_volumes(self):
+        """Forget all cached player volumes"""
+        self._volume_cache.clear()
+
     async def get_player_volume(self, player_id: str) -> int:
         """Get volume for a specific player"""
-        url = f"https://api.ws.sonos.com/control/api/v1/players/{player_id}/playerVolume"
+        url = f"{CONTROL_URL}/players/{player_id}/playerVolume"
         data = await self._request_with_retry("GET", url)
-        return data.get("volume", 0)
+        volume = data.get("volume", 0)
+        self._cache_volume(player_id, volume)
+        return volume
 
-    async def get_all_volumes(self) -> dict:
-        """Get volumes for all speakers"""
-        import logging
-        logger = logging.getLogger(__name__)
+    async def get_all_volumes(self, use_cache: bool = False) -> dict:
+        """Get volumes for all speakers
 
+        With use_cache=True, players with a fresh cached volume are not queried.
+        A player that can't be read reports None, but a request shed by the rate
+        limiter raises RateLimitedError so callers don't mistake throttling for data.
+        """
         async def get_vol(name: str, player_id: str):
+            if use_cache:
+                cached = self.get_cached_volume(player_id)
+                if cached is not None:
+                    return (name, cached)
             try:
                 vol = await self.get_player_volume(player_id)
                 return (name, vol)
+            except RateLimitedError:
+                raise
             except Exception as e:
                 logger.error(f"Error getting volume for {name}: {e}")
                 return (name, None)
@@ -226,18 +621,95 @@ class SonosAPI:
 
     async def set_player_volume(self, player_id: str, volume: int) -> bool:
         """Set volume for a specific player"""
-        url = f"https://api.ws.sonos.com/control/api/v1/players/{player_id}/playerVolume"
+        url = f"{CONTROL_URL}/players/{player_id}/playerVolume"
         payload = {"volume": volume}
+        # Players may no longer all be at the same level
+        self._volumes_normalized_at = 0
+        self._volume_cache.pop(player_id, None)
         await self._request_with_retry("POST", url, json=payload)
+        self._cache_volume(player_id, volume)
         return True
 
-    async def set_all_volumes(self, volume: int) -> bool:
-        """Set volume for all speakers"""
-        tasks = [
-            self.set_player_volume(player_id, volume)
-            for player_id in settings.speakers.values()
-        ]
-        await asyncio.gather(*tasks)
+    def _all_speakers_group_id(self) -> Optional[str]:
+        """Get the resolved group ID if the cached topology shows it holds exactly the configured speakers"""
+        if not self.current_group_id or self._topology is None:
+            return None
+        target_set = set(settings.speakers.values())
+        for group in self._topology.get("groups", []):
+            if group["id"] == self.current_group_id:
+                return group["id"] if set(group.get("playerIds", [])) == target_set else None
+        return None
+
+    def plan_volumes(self, volumes: dict, normalize: bool = True) -> dict:
+        """Plan how to apply target volumes (player ID -> level)
+
+        A uniform level across exactly the grouped speakers becomes a single
+        groupVolume call. Sonos scales group volume proportionally, so that is
+        only exact once the players are known to be level; with normalize=True
+        the first uniform change is sent per player as a normalization pass.
+        """
+        levels = set(volumes.values())
+        group_id = self._all_speakers_group_id()
+        normalized = time.time() - self._volumes_normalized_at < VOLUME_NORMALIZE_TTL
+        if (
+            len(levels) == 1
+            and group_id
+            and set(volumes) == set(settings.speakers.values())
+            and (normalized or not normalize)
+        ):
+            return {"mode": "group", "group_id": group_id, "volume": levels.pop(), "calls": 1}
+        return {"mode": "players", "volumes": volumes, "calls": len(volumes)}
+
+    async def apply_volumes(self, volumes: dict, normalize: bool = True, force: bool = False) -> dict:
+        """Apply target volumes (player ID -> level) with the fewest Sonos calls
+
+        Players whose cached volume already matches are skipped unless force=True.
+        """
+        if not force:
+            changed = {
+                player_id: volume for player_id, volume in volumes.items()
+                if self.get_cached_volume(player_id) != volume
+            }
+            self.volume_plan_stats["unchanged_skipped"] += len(volumes) - len(changed)
+            self.volume_plan_stats["calls_saved"] += len(volumes) - len(changed)
+            volumes = changed
+
+        plan = self.plan_volumes(volumes, normalize)
+        self.volume_plan_stats["plans"] += 1
+        if not volumes:
+            return plan
+
+        if plan["mode"] == "group":
+            try:
+                await self.set_group_volume(plan["group_id"], plan["volume"])
+                for player_id in volumes:
+                    self._cache_volume(player_id, plan["volume"])
+                self.volume_plan_stats["group_volume"] += 1
+                self.volume_plan_stats["calls_saved"] += len(volumes) - 1
+                return plan
+            except SonosAPIError as e:
+                if not e.is_group_gone:
+                    raise
+                logger.warning("Group gone while setting group volume, falling back to per-player")
+                plan = {"mode": "players", "volumes": volumes, "calls": len(volumes)}
+
+        if volumes:
+            await asyncio.gather(*[
+                self.set_player_volume(player_id, volume)
+                for player_id, volume in volumes.items()
+            ])
+        self.volume_plan_stats["per_player"] += 1
+        if len(set(volumes.values())) == 1 and set(volumes) == set(settings.speakers.values()):
+            self._volumes_normalized_at = time.time()
+        return plan
+
+    def get_volume_plan_stats(self) -> dict:
+        """Get volume planner counters"""
+        return dict(self.volume_plan_stats)
+
+    async def set_all_volumes(self, volume: int, force: bool = False) -> bool:
+        """Set volume for all speakers (force=True resends even if the cache says unchanged)"""
+        await self.apply_volumes({player_id: volume for player_id in settings.speakers.values()}, force=force)
         return True
 
     async def set_per_speaker_volumes(self, volumes: dict) -> bool:
@@ -245,42 +717,43 @@ class SonosAPI:
         volumes: dict mapping speaker name to volume level
         e.g. {"STAGE": 1, "BATHROOM_DOORS": 85, ...}
         """
-        tasks = []
-        for speaker_name, volume in volumes.items():
-            player_id = settings.speakers.get(speaker_name)
-            if player_id:
-                tasks.append(self.set_player_volume(player_id, volume))
-        if tasks:
-            await asyncio.gather(*tasks)
+        targets = {
+            settings.speakers[speaker_name]: volume
+            for speaker_name, volume in volumes.items()
+            if speaker_name in settings.speakers
+        }
+        await self.apply_volumes(targets)
         return True
 
     async def set_group_volume(self, group_id: str, volume: int) -> bool:
         """Set volume for a group"""
-        url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/groupVolume"
+        url = f"{CONTROL_URL}/groups/{group_id}/groupVolume"
         payload = {"volume": volume}
+        # Per-player levels are rescaled by Sonos - callers re-cache if they know the result
+        self.invalidate_volumes()
         await self._request_with_retry("POST", url, json=payload)
         return True
 
     async def play(self, group_id: str) -> bool:
         """Start playback for a group"""
-        url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback/play"
+        url = f"{CONTROL_URL}/groups/{group_id}/playback/play"
         await self._request_with_retry("POST", url)
         return True
 
     async def pause(self, group_id: str) -> bool:
         """Pause playback for a group"""
-        url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback/pause"
+        url = f"{CONTROL_URL}/groups/{group_id}/playback/pause"
         await self._request_with_retry("POST", url)
         return True
 
     async def get_playback_status(self, group_id: str) -> dict:
         """Get playback status for a group"""
-        url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback"
+        url = f"{CONTROL_URL}/groups/{group_id}/playback"
         return await self._request_with_retry("GET", url)
 
     async def get_playback_metadata(self, group_id: str) -> dict:
         """Get current track metadata for a group"""
-        url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playbackMetadata"
+        url = f"{CONTROL_URL}/groups/{group_id}/playbackMetadata"
         return await self._request_with_retry("GET", url)
 
     async def play_favorite_with_volume(self, favorite_id: str, volume: int) -> bool:
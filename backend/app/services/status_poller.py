@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from ..config import get_settings
+from .sonos_api import sonos_api
+from .scheduler_service import scheduler_service
+from .rate_limiter import PRIORITY_POLL
+from .event_bus import event_bus
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class PlaybackStatusPoller:
+    """Background poller that keeps one shared playback status snapshot
+
+    Every /playback/status request reads the snapshot instead of calling
+    Sonos, so Sonos traffic no longer grows with the number of open dashboards.
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[dict] = None
+        self.snapshot_at: float = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        # Scheduler state changes usually mean playback changed too
+        event_bus.add_listener(self._on_event)
+
+    def _on_event(self, event: dict):
+        """Refresh early when a program starts/finishes or pause/fire show toggles"""
+        if event["type"] in ("program_started", "program_finished", "pause", "fire_show"):
+            self.request_refresh()
+
+    def start(self):
+        """Start the background poll loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+            logger.info("Playback status poller started")
+
+    async def stop(self):
+        """Stop the background poll loop"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def request_refresh(self):
+        """Wake the poller early, e.g. right after a playback command"""
+        self._wake.set()
+
+    def get_interval(self) -> float:
+        """Poll cadence - fast while a program runs, slow while paused or idle"""
+        if scheduler_service.current_program:
+            return settings.status_poll_interval_active
+        if scheduler_service.is_paused() or (self.snapshot and not self.snapshot["is_playing"]):
+            return settings.status_poll_interval_idle
+        return settings.status_poll_interval
+
+    async def _poll_loop(self):
+        """Refresh the snapshot at the adaptive cadence"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Playback status poll failed: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.get_interval())
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh(self) -> dict:
+        """Query Sonos and replace the shared snapshot"""
+        with sonos_api.priority(PRIORITY_POLL):
+            # Get current group
+            group_id = await sonos_api.ensure_group()
+
+            # Get playback info
+            status = await sonos_api.get_playback_status(group_id)
+
+            # Try to get track metadata (may fail if nothing playing)
+            track_name = None
+            artist = None
+            album = None
+            image_url = None
+            container_name = None
+
+            try:
+                metadata = await sonos_api.get_playback_metadata(group_id)
+                current_item = metadata.get("currentItem", {})
+                track = current_item.get("track", {})
+                track_name = track.get("name")
+                artist_info = track.get("artist")
+                artist = artist_info.get("name") if isinstance(artist_info, dict) else None
+                album_info = track.get("album")
+                album = album_info.get("name") if isinstance(album_info, dict) else None
+                image_url = track.get("imageUrl")
+                container = metadata.get("container", {})
+                container_name = container.get("name") if isinstance(container, dict) else None
+            except Exception:
+                pass  # Metadata not available, continue without it
+
+        snapshot = {
+            "is_playing": status.get("playbackState") == "PLAYBACK_STATE_PLAYING",
+            "track_name": track_name,
+            "artist": artist,
+            "album": album,
+            "image_url": image_url,
+            "station": container_name,
+            "group_id": group_id,
+        }
+        if snapshot != self.snapshot:
+            event_bus.publish("playback", snapshot)
+        self.snapshot = snapshot
+        self.snapshot_at = time.time()
+        return self.snapshot
+
+    async def get_snapshot(self) -> tuple[dict, float]:
+        """Get the shared snapshot and its age in seconds, fetching once if none exists yet"""
+        if self.snapshot is None:
+            await self.refresh()
+        return self.snapshot, time.time() - self.snapshot_at
+
+
+# Global instance
+status_poller = PlaybackStatusPoller()
@@ -0,0 +1,94 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+import pytz
+
+# Day names in week order (Monday = 0, matching datetime.weekday())
+WEEK_DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Largest DST shift - entries this far behind the current wall clock may still
+# be ahead in absolute time, so lookups start that far back
+MAX_DST_SHIFT_MINUTES = 60
+
+
+class Timetable:
+    """Immutable weekly timetable compiled from schedule slots
+
+    Entries are kept in parallel sorted arrays keyed by minute-of-week in
+    venue wall-clock time, so finding the next entry is a bisect. Slots
+    sharing a minute are grouped into one entry. Reloads build a new
+    Timetable and swap it in; an instance is never mutated.
+    """
+
+    def __init__(self, slots: Iterable[tuple[int, str, str, str]], timezone: pytz.BaseTzInfo):
+        """slots: (slot_id, day_of_week, "HH:MM", program_name) tuples"""
+        self.timezone = timezone
+        # Slot ID -> (minute-of-week, program) for reconcile diffs
+        self.slots: dict[int, tuple[int, str]] = {}
+        by_minute: dict[int, list[tuple[int, str]]] = {}
+        for slot_id, day_of_week, time_str, program_name in slots:
+            day = day_of_week.lower()
+            if day not in WEEK_DAYS:
+                continue
+            hour, minute = map(int, time_str.split(":"))
+            minute_of_week = WEEK_DAYS.index(day) * MINUTES_PER_DAY + hour * 60 + minute
+            self.slots[slot_id] = (minute_of_week, program_name)
+            by_minute.setdefault(minute_of_week, []).append((slot_id, program_name))
+
+        self.minutes: list[int] = sorted(by_minute)
+        self.entries: list[tuple[tuple[int, str], ...]] = [
+            tuple(sorted(by_minute[m])) for m in self.minutes
+        ]
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _localize(self, naive: datetime) -> datetime:
+        """Attach the venue timezone to a wall-clock time, resolving DST edges
+
+        Times skipped by a spring-forward transition fire at the same offset
+        past the transition (02:30 becomes 03:30); times repeated by a
+        fall-back transition fire on their first occurrence.
+        """
+        try:
+            return self.timezone.localize(naive, is_dst=None)
+        except pytz.NonExistentTimeError:
+            return self.timezone.normalize(self.timezone.localize(naive, is_dst=False))
+        except pytz.AmbiguousTimeError:
+            return self.timezone.localize(naive, is_dst=True)
+
+    def next_after(self, after: datetime) -> Optional[tuple[datetime, tuple[tuple[int, str], ...]]]:
+        """Get the next fire time strictly after `after` and the (slot_id, program) entries due then"""
+        if not self.minutes:
+            return None
+
+        local = after.astimezone(self.timezone)
+        week_start = datetime(local.year, local.month, local.day) - timedelta(days=local.weekday())
+        now_minute = local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+        count = len(self.minutes)
+        # Index k addresses entry k % count in week k // count relative to this
+        # one, so a look-back past Monday 00:00 lands in last week's entries
+        look_back = now_minute - MAX_DST_SHIFT_MINUTES - 1
+        if look_back >= 0:
+            start = bisect_right(self.minutes, look_back)
+        else:
+            start = bisect_right(self.minutes, look_back + MINUTES_PER_WEEK) - count
+        best = None
+        best_wall = None
+        for k in range(start, start + 2 * count):
+            week, index = divmod(k, count)
+            wall = week_start + timedelta(weeks=week, minutes=self.minutes[index])
+            # Entries later than the best candidate's wall time plus a DST shift can't beat it
+            if best_wall is not None and wall > best_wall + timedelta(minutes=MAX_DST_SHIFT_MINUTES):
+                break
+            fire_at = self._localize(wall)
+            if fire_at <= after:
+                continue
+            if best is None or fire_at < best[0]:
+                best = (fire_at, self.entries[index])
+                best_wall = wall
+        return best
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Owner read/write only
+TOKEN_FILE_MODE = 0o600
+
+
+class TokenStore:
+    """Small JSON file store for the Sonos access token and household ID
+
+    Lets a restarted process reuse a still-valid token instead of paying an
+    OAuth refresh and GET /households before the first command.
+    """
+
+    def __init__(self, path: Optional[str], credentials: str):
+        self.path = path
+        # Fingerprint of the OAuth credentials - cached values from a
+        # different client/refresh token are ignored
+        self.fingerprint = hashlib.sha256(credentials.encode()).hexdigest()[:16]
+
+    def load(self) -> dict:
+        """Load persisted values, or an empty dict if missing/stale"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return {}
+        if data.get("fingerprint") != self.fingerprint:
+            return {}
+        if data.get("token_expires_at", 0) <= time.time():
+            data.pop("access_token", None)
+            data.pop("token_expires_at", None)
+        return data
+
+    def save(self, **values):
+        """Merge values into the store and write it atomically"""
+        if not self.path:
+            return
+        data = self.load()
+        data.update(values)
+        self._write(data)
+
+    def _write(self, data: dict):
+        """Write data to the store file via a temp file + rename
+
+        The file holds a live access token, so it is readable by the owner only.
+        """
+        data["fingerprint"] = self.fingerprint
+        tmp_path = f"{self.path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, TOKEN_FILE_MODE)
+            # O_CREAT's mode doesn't apply to a leftover temp file from an earlier run
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, TOKEN_FILE_MODE)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write token cache {self.path}: {e}")
+
+    def clear_token(self):
+        """Drop the persisted access token (e.g. after Sonos rejected it)"""
+        data = self.load()
+        if "access_token" in data or "token_expires_at" in data:
+            data.pop("access_token", None)
+            data.pop("token_expires_at", None)
+            self._write(data)
+
+    def clear(self):
+        """Remove the store entirely"""
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove token cache {self.path}: {e}")
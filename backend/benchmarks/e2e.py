@@ -0,0 +1,432 @@
+"""End-to-end benchmarks for program execution and the API hot paths
+
+Starts the backend in-process (the real FastAPI app and lifespan, served by
+uvicorn on a free port) against a temp database and benchmarks/fake_sonos.py,
+then measures:
+
+  programs  run_program() per program type: time to first play (first play
+            command - or pause, for pause.py - reaching Sonos), Sonos calls
+            issued and wall time. Step delays are recorded but not slept, so
+            wall time excludes the deliberate waits between announcements.
+            "cold" is the first run of each program (plan compile, and for
+            the first program the token fetch and group discovery).
+  api       throughput of /playback/status, /speakers and /schedule under
+            --clients concurrent dashboard clients for --duration seconds
+            each. Clients run in a separate process and revalidate
+            /schedule with If-None-Match like the dashboard does.
+  schedule  load_schedule_from_db() for --slots synthetic schedules: the
+            first reconcile (every slot added) and a no-change reconcile.
+
+Results are written to --output as JSON. With --compare BASELINE.json every
+metric is compared against a saved run and changes worse than --threshold
+percent are reported as regressions (exit status 1).
+
+Usage (from backend/):
+    python -m benchmarks.e2e [--output e2e.json] [--compare baseline.json]
+        [--runs 5] [--clients 20] [--duration 5] [--slots 350,5000]
+        [--latency lognormal:40,0.5] [--scheduler-mode cron] [--json]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fake_sonos import FakeSonos, free_port
+
+# One program per type, as the default schedule names them
+PROGRAMS = (
+    "75ad.py", "75fm.py", "75sm.py", "75parking.py", "75TIGS.py",
+    "85adfire.py", "75fireparking.py", "pause.py",
+)
+
+ENDPOINTS = ("/api/v1/playback/status", "/api/v1/speakers", "/api/v1/schedule")
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Metrics where a larger value is an improvement; everything else is a cost
+HIGHER_IS_BETTER = ("req_per_s",)
+
+# Counters that scale with the run's settings, and single-sample maxima, aren't compared
+NOT_COMPARED = ("requests", "jobs", "skipped_sleep_s", "max_ms")
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[max(0, round(0.95 * len(ordered)) - 1)] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def synthetic_slots(count: int) -> list[tuple[str, str, str, str]]:
+    """count (day_of_week, time, program_name, block_type) rows spread evenly over the week"""
+    minutes = 7 * 24 * 60
+    rows = []
+    for index in range(count):
+        minute = index * minutes // count
+        day, minute = divmod(minute, 24 * 60)
+        rows.append((
+            DAYS[day], f"{minute // 60:02d}:{minute % 60:02d}",
+            PROGRAMS[index % len(PROGRAMS)], "DAY",
+        ))
+    return rows
+
+
+# --- programs ---------------------------------------------------------------
+
+def refill_rate_limits(sonos_api):
+    """Give the client-side Sonos rate limiter full buckets again"""
+    from app.services.rate_limiter import RateLimiter
+    from app.services.sonos_api import SONOS_RATE_LIMITS
+
+    if sonos_api.rate_limiter:
+        sonos_api.rate_limiter = RateLimiter(SONOS_RATE_LIMITS)
+
+
+async def bench_programs(fake: FakeSonos, runs: int) -> dict:
+    from app.services.program_jobs import ProgramJob
+    from app.services.scheduler_service import scheduler_service
+    from app.services.sonos_api import sonos_api
+
+    slept = []
+
+    async def record_sleep(job, seconds: float) -> bool:
+        slept.append(seconds)
+        return job.cancel_requested
+
+    original_sleep = ProgramJob.sleep
+    ProgramJob.sleep = record_sleep
+    results = {}
+    try:
+        for program in PROGRAMS:
+            first_play, wall, calls = [], [], []
+            for _ in range(runs):
+                slept.clear()
+                # Real slots are minutes apart, so each run starts with a full rate limit budget
+                refill_rate_limits(sonos_api)
+                fake.reset_stats()
+                started = time.perf_counter()
+                await scheduler_service.run_program(program, manual=True)
+                wall.append(time.perf_counter() - started)
+                mark = fake.first_at.get("play") or fake.first_at.get("pause")
+                first_play.append(mark - started if mark else float("nan"))
+                calls.append(fake.requests)
+            results[program] = {
+                "cold_first_play_ms": round(first_play[0] * 1000, 2),
+                "cold_wall_ms": round(wall[0] * 1000, 2),
+                "first_play": summarize(first_play[1:] or first_play),
+                "wall": summarize(wall[1:] or wall),
+                "calls": statistics.median(calls[1:] or calls),
+                "skipped_sleep_s": round(sum(slept), 1),
+            }
+    finally:
+        ProgramJob.sleep = original_sleep
+    return results
+
+
+# --- api --------------------------------------------------------------------
+
+async def _client_load(base: str, path: str, clients: int, duration: float) -> dict:
+    import aiohttp
+
+    latencies, statuses = [], {}
+
+    async def client(session):
+        etag = None
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            headers = {"If-None-Match": etag} if etag else {}
+            started = time.perf_counter()
+            async with session.get(base + path, headers=headers) as response:
+                await response.read()
+                etag = response.headers.get("ETag", etag)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(base + path) as response:
+            await response.read()
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "latency": summarize(latencies),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def client_load(base: str, path: str, clients: int, duration: float) -> dict:
+    """Run `clients` dashboard clients polling `path` (in a worker process)"""
+    return asyncio.run(_client_load(base, path, clients, duration))
+
+
+async def bench_api(base: str, clients: int, duration: float) -> dict:
+    # Load is generated from another process so it doesn't share the server's loop and GIL
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as pool:
+        for path in ENDPOINTS:
+            results[path] = await loop.run_in_executor(pool, client_load, base, path, clients, duration)
+    return results
+
+
+# --- schedule ---------------------------------------------------------------
+
+async def replace_schedule(rows: list) -> float:
+    """Replace all slots and reconcile; returns the reconcile time in seconds"""
+    from app.database import bulk_insert_schedule_slots
+    from app.services.schedule_cache import schedule_cache
+    from app.services.scheduler_service import scheduler_service
+
+    await bulk_insert_schedule_slots(rows, replace=True)
+    schedule_cache.bump()
+    started = time.perf_counter()
+    await scheduler_service.load_schedule_from_db()
+    return time.perf_counter() - started
+
+
+async def reset_schedule_via_api(base: str):
+    """Restore the default schedule through POST /schedule/reset, then POST /schedule/reload
+
+    Also checks both routes are reachable - they must not be shadowed by
+    /schedule/{day} - and that a reset invalidates clients' schedule ETags.
+    """
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base}/api/v1/schedule") as response:
+            etag = response.headers["ETag"]
+        async with session.post(f"{base}/api/v1/schedule/reset") as response:
+            if response.status != 200:
+                raise RuntimeError(f"POST /schedule/reset returned {response.status}: {await response.text()}")
+        async with session.get(f"{base}/api/v1/schedule", headers={"If-None-Match": etag}) as response:
+            if response.status != 200:
+                raise RuntimeError(f"GET /schedule after a reset returned {response.status} for the old ETag")
+        async with session.post(f"{base}/api/v1/schedule/reload") as response:
+            if response.status != 200 or "reconcile" not in await response.json(content_type=None):
+                raise RuntimeError(f"POST /schedule/reload returned {response.status}: {await response.text()}")
+
+
+async def bench_schedule(sizes: list[int], repeat: int) -> dict:
+    from app.services.scheduler_service import scheduler_service
+
+    results = {}
+    for size in sizes:
+        build, unchanged = [], []
+        for _ in range(repeat):
+            await replace_schedule([])
+            build.append(await replace_schedule(synthetic_slots(size)))
+            started = time.perf_counter()
+            await scheduler_service.load_schedule_from_db()
+            unchanged.append(time.perf_counter() - started)
+        results[str(size)] = {
+            "build": summarize(build),
+            "unchanged": summarize(unchanged),
+            "jobs": len(scheduler_service.scheduler.get_jobs()),
+        }
+    return results
+
+
+# --- harness ----------------------------------------------------------------
+
+async def run_backend(args, fake: FakeSonos, port: int) -> dict:
+    import uvicorn
+    from app.main import app
+    from app.services.scheduler_service import scheduler_service
+    from app.services.sonos_api import sonos_api
+    from app.services.status_poller import status_poller
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+            raise RuntimeError("Backend failed to start")
+        await asyncio.sleep(0.05)
+
+    results = {}
+    try:
+        # No scheduled program may fire (or prewarm the group) during the run
+        scheduler_service.paused_until = datetime.now(scheduler_service.timezone) + timedelta(days=1)
+
+        # Programs: nothing scheduled and no status polling, so every Sonos call is the program's
+        await status_poller.stop()
+        await replace_schedule([])
+        results["programs"] = await bench_programs(fake, args.runs)
+
+        # API: the default schedule, with the poller keeping the shared snapshot fresh
+        base = f"http://127.0.0.1:{port}"
+        await reset_schedule_via_api(base)
+        refill_rate_limits(sonos_api)
+        status_poller.start()
+        results["api"] = await bench_api(base, args.clients, args.duration)
+        await status_poller.stop()
+
+        results["schedule"] = await bench_schedule(args.slots, args.runs)
+    finally:
+        server.should_exit = True
+        await serving
+    return results
+
+
+def run(args) -> dict:
+    fake_port = free_port()
+    api_port = free_port()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read once (FakeSonos reads the speakers), so set the environment first
+        os.environ["SONOS_API_BASE_URL"] = f"http://127.0.0.1:{fake_port}"
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["SONOS_TOKEN_CACHE_PATH"] = ""
+        if args.scheduler_mode:
+            os.environ["SCHEDULER_MODE"] = args.scheduler_mode
+
+        # Seeded so latency samples repeat between a run and its baseline
+        fake = FakeSonos(latency=args.latency, seed=args.seed)
+        fake.start_in_thread(port=fake_port)
+        try:
+            results = asyncio.run(run_backend(args, fake, api_port))
+        finally:
+            fake.stop_thread()
+
+    from app.config import get_settings
+    results["config"] = {
+        "latency": args.latency,
+        "seed": args.seed,
+        "runs": args.runs,
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "slots": args.slots,
+        "scheduler_mode": get_settings().scheduler_mode,
+        "python": sys.version.split()[0],
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return results
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """Numeric metrics as {"programs.75sm.py.first_play.median_ms": value}, skipping config"""
+    metrics = {}
+    for key, value in results.items():
+        if not prefix and key in ("config", "comparison"):
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Per-metric change against a baseline run; "regression" marks changes worse than threshold %"""
+    current, previous = flatten(results), flatten(baseline)
+    rows = []
+    for name, value in current.items():
+        before = previous.get(name)
+        if before is None or ".statuses." in name or name.rsplit(".", 1)[-1] in NOT_COMPARED:
+            continue
+        change = (value - before) / before * 100 if before else 0.0
+        worse = -change if name.rsplit(".", 1)[-1] in HIGHER_IS_BETTER else change
+        rows.append({
+            "metric": name,
+            "baseline": before,
+            "current": value,
+            "change_pct": round(change, 1),
+            "regression": worse > threshold,
+        })
+    return rows
+
+
+def print_results(results: dict):
+    config = results["config"]
+    print(f"programs ({config['runs']} runs each, latency {config['latency']}; warm = runs after the first)")
+    print(f"{'program':<20}{'cold play':>11}{'play p50':>10}{'play p95':>10}{'wall p50':>10}"
+          f"{'calls':>7}{'slept s':>9}")
+    for program, r in results["programs"].items():
+        print(f"{program:<20}{r['cold_first_play_ms']:>11.1f}{r['first_play']['median_ms']:>10.1f}"
+              f"{r['first_play']['p95_ms']:>10.1f}{r['wall']['median_ms']:>10.1f}"
+              f"{r['calls']:>7}{r['skipped_sleep_s']:>9}")
+
+    print(f"\napi ({config['clients']} clients, {config['duration_s']}s per endpoint)")
+    print(f"{'endpoint':<28}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}  statuses")
+    for path, r in results["api"].items():
+        statuses = ", ".join(f"{status}: {count}" for status, count in r["statuses"].items())
+        print(f"{path:<28}{r['req_per_s']:>9.1f}{r['latency']['median_ms']:>9.1f}"
+              f"{r['latency']['p95_ms']:>9.1f}  {statuses}")
+
+    print(f"\nload_schedule_from_db ({config['scheduler_mode']} mode)")
+    print(f"{'slots':>7}{'jobs':>7}{'build p50':>11}{'unchanged p50':>15}")
+    for size, r in results["schedule"].items():
+        print(f"{size:>7}{r['jobs']:>7}{r['build']['median_ms']:>11.1f}{r['unchanged']['median_ms']:>15.1f}")
+
+
+def print_comparison(rows: list[dict], threshold: float, results: dict, baseline: dict):
+    regressions = [row for row in rows if row["regression"]]
+    changed = [
+        key for key, value in results["config"].items()
+        if key not in ("created_at",) and baseline.get("config", {}).get(key) != value
+    ]
+    if changed:
+        print(f"\nnote: baseline was run with different settings ({', '.join(changed)})")
+    print(f"\ncompared {len(rows)} metrics with baseline, threshold {threshold}%: "
+          f"{len(regressions)} regression(s)")
+    for row in regressions:
+        print(f"  REGRESSION {row['metric']}: {row['baseline']} -> {row['current']} ({row['change_pct']:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with a saved results file")
+    parser.add_argument("--threshold", type=float, default=15.0, help="percent change counted as a regression")
+    parser.add_argument("--runs", type=int, default=5, help="runs per program and per schedule size")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent dashboard clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load per endpoint")
+    parser.add_argument("--slots", default="350,5000", help="comma-separated schedule sizes")
+    parser.add_argument("--latency", default="lognormal:40,0.5", help="fake Sonos latency spec")
+    parser.add_argument("--seed", type=int, default=1, help="fake Sonos latency seed")
+    parser.add_argument("--scheduler-mode", choices=("cron", "dispatcher"), help="override SCHEDULER_MODE")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args()
+    args.slots = [int(size) for size in args.slots.split(",") if size]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    result = run(args)
+    if baseline is not None:
+        result["comparison"] = compare(result, baseline, args.threshold)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_results(result)
+        if baseline is not None:
+            print_comparison(result["comparison"], args.threshold, result, baseline)
+
+    if baseline is not None and any(row["regression"] for row in result["comparison"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
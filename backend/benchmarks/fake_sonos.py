@@ -0,0 +1,544 @@
+"""Local stand-in for the Sonos OAuth and Control API
+
+Implements the endpoints the backend and the legacy scripts use - oauth
+access, households, groups, createGroup, favorites, playerVolume,
+groupVolume, playback and playbackMetadata - with in-memory state: players
+start ungrouped, createGroup regroups them, favorites load into groups,
+player and group volumes behave like Sonos (group volume scales players
+proportionally) and play/pause changes the playback state.
+
+Latency, injected errors and 429s are configurable, so client behaviour
+(retries, rate limiting, caching) can be measured without speakers.
+
+Latency specs (milliseconds): "none", "constant:40", "uniform:20,80",
+"normal:40,10", "lognormal:40,0.5" (median, sigma). Per-endpoint overrides
+use --endpoint-latency NAME=SPEC with the endpoint names in ENDPOINTS.
+
+Usage (from backend/):
+    python -m benchmarks.fake_sonos [--port 8765] [--latency lognormal:40,0.5]
+        [--error-rate 0.01] [--throttle-rate 0.01] [--rate-limit 20]
+
+then start the backend (or scheduler.py / program_runner.py) with
+SONOS_API_BASE_URL=http://127.0.0.1:8765. GET /_fake/stats returns request
+counters; POST /_fake/reset clears them and the speaker state; POST
+/_fake/config takes {"latency", "error_rate", "throttle_rate", "rate_limit"}.
+"""
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from aiohttp import web
+
+from app.config import get_settings
+
+HOUSEHOLD_ID = "Sonos_FAKE_HOUSEHOLD"
+
+CONTROL_PREFIX = "/control/api/v1"
+
+# Endpoint names used for stats, marks and per-endpoint latency
+ENDPOINTS = (
+    "oauth", "households", "groups", "create_group", "household_favorites", "load_favorite",
+    "get_player_volume", "set_player_volume", "get_group_volume", "set_group_volume",
+    "play", "pause", "playback_status", "playback_metadata",
+)
+
+# Favorites the venue's programs use, plus the main playlist
+DEFAULT_FAVORITES = {
+    "28": "Announcement 28", "29": "Announcement 29 (Spanish)", "30": "Social Media 1",
+    "31": "Social Media 2", "32": "Business Ad 1", "35": "Business Ad 2", "36": "Main Playlist",
+    "40": "Fire Show Ad", "41": "Parking 1", "43": "Gift Shop", "44": "Parking 2",
+}
+
+INITIAL_VOLUME = 20
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    """Pick an unused port, so SONOS_API_BASE_URL can be set before app settings load"""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Build a sampler (rng -> seconds) from a latency spec in milliseconds"""
+    kind, _, args = spec.partition(":")
+    try:
+        params = [float(value) for value in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec {spec!r}")
+    if kind in ("none", "") and not params:
+        return lambda rng: 0.0
+    if kind == "constant" and len(params) == 1:
+        return lambda rng: params[0] / 1000
+    if kind == "uniform" and len(params) == 2:
+        return lambda rng: rng.uniform(params[0], params[1]) / 1000
+    if kind == "normal" and len(params) == 2:
+        return lambda rng: max(0.0, rng.gauss(params[0], params[1])) / 1000
+    if kind == "lognormal" and len(params) == 2 and params[0] > 0:
+        # Median in milliseconds and sigma of the underlying normal
+        return lambda rng: rng.lognormvariate(math.log(params[0]), params[1]) / 1000
+    raise ValueError(f"Invalid latency spec {spec!r}")
+
+
+class FakeSonos:
+    """Stateful Sonos stand-in served by aiohttp"""
+
+    def __init__(self, players: Optional[dict] = None, latency: str = "none",
+                 endpoint_latency: Optional[dict] = None, connect_cost: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 rate_limit: Optional[float] = None, retry_after: float = 1.0,
+                 favorites: Optional[dict] = None, seed: Optional[int] = None):
+        self.players = dict(players or get_settings().speakers)
+        self.favorites = dict(favorites or DEFAULT_FAVORITES)
+        self.connect_cost = connect_cost
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._group_seq = itertools.count(1)
+        self._tokens: set[str] = set()
+        self._transports = set()
+        self.configure(latency=latency, endpoint_latency=endpoint_latency or {},
+                       error_rate=error_rate, throttle_rate=throttle_rate, rate_limit=rate_limit or 0)
+        self.reset_state()
+        self.reset_stats()
+        self._runner = None
+        self._loop = None
+        self._thread = None
+
+    # -------------------------
+    # Configuration and state
+    # -------------------------
+    def configure(self, latency: Optional[str] = None, endpoint_latency: Optional[dict] = None,
+                  error_rate: Optional[float] = None, throttle_rate: Optional[float] = None,
+                  rate_limit: Optional[float] = None):
+        """Change latency and fault injection; arguments left as None are unchanged"""
+        if latency is not None:
+            self.latency_spec = latency
+            self._latency = parse_latency(latency)
+        if endpoint_latency is not None:
+            unknown = set(endpoint_latency) - set(ENDPOINTS)
+            if unknown:
+                raise ValueError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            self.endpoint_latency_spec = dict(endpoint_latency)
+            self._endpoint_latency = {name: parse_latency(spec) for name, spec in endpoint_latency.items()}
+        if error_rate is not None:
+            self.error_rate = error_rate
+        if throttle_rate is not None:
+            self.throttle_rate = throttle_rate
+        if rate_limit is not None:
+            # Token bucket shared by all clients, one second of burst (0 disables)
+            self.rate_limit = rate_limit or None
+            self._bucket = rate_limit or 0.0
+            self._bucket_at = time.monotonic()
+
+    def reset_state(self):
+        """Ungroup every player, stop playback and reset volumes"""
+        self.groups: dict[str, dict] = {}
+        for player_id in self.players.values():
+            self._new_group([player_id])
+        self.volumes = {player_id: INITIAL_VOLUME for player_id in self.players.values()}
+
+    def reset_stats(self):
+        """Clear request counters and first-call marks"""
+        self.requests = 0
+        self.connections = 0
+        self.counts = {name: 0 for name in ENDPOINTS}
+        self.injected = {"errors": 0, "throttled": 0}
+        self.latency_total = 0.0
+        # perf_counter() of the first call to each endpoint since the last reset
+        self.first_at: dict[str, float] = {}
+
+    def get_stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "endpoints": {name: count for name, count in self.counts.items() if count},
+            "injected": dict(self.injected),
+            "latency_ms_total": round(self.latency_total * 1000, 1),
+            "config": {
+                "latency": self.latency_spec,
+                "endpoint_latency": self.endpoint_latency_spec,
+                "error_rate": self.error_rate,
+                "throttle_rate": self.throttle_rate,
+                "rate_limit": self.rate_limit,
+            },
+            "groups": [
+                {"id": g["id"], "playerIds": g["playerIds"], "playbackState": g["playbackState"],
+                 "favorite": g["favoriteId"]}
+                for g in self.groups.values()
+            ],
+            "volumes": {name: self.volumes[pid] for name, pid in self.players.items()},
+        }
+
+    def _new_group(self, player_ids: list[str]) -> dict:
+        group = {
+            "id": f"{player_ids[0]}:{next(self._group_seq)}",
+            "name": ", ".join(self._player_name(pid) for pid in player_ids),
+            "coordinatorId": player_ids[0],
+            "playerIds": list(player_ids),
+            "playbackState": "PLAYBACK_STATE_IDLE",
+            "favoriteId": None,
+        }
+        self.groups[group["id"]] = group
+        return group
+
+    def _player_name(self, player_id: str) -> str:
+        return next((name for name, pid in self.players.items() if pid == player_id), player_id)
+
+    # -------------------------
+    # Request pipeline
+    # -------------------------
+    def _take_token(self) -> bool:
+        """Take one request from the rate limit bucket"""
+        if not self.rate_limit:
+            return True
+        now = time.monotonic()
+        self._bucket = min(self.rate_limit, self._bucket + (now - self._bucket_at) * self.rate_limit)
+        self._bucket_at = now
+        if self._bucket >= 1:
+            self._bucket -= 1
+            return True
+        return False
+
+    async def _delay(self, seconds: float):
+        # call_later rather than asyncio.sleep, which benchmarks may scale in-process
+        if seconds <= 0:
+            return
+        future = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(seconds, future.set_result, None)
+        await future
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        name = request.match_info.route.name
+        if name is None or name.startswith("fake_"):
+            return await handler(request)
+
+        self.requests += 1
+        self.counts[name] += 1
+        delay = self._endpoint_latency.get(name, self._latency)(self._rng)
+        if request.transport not in self._transports:
+            self._transports.add(request.transport)
+            self.connections += 1
+            delay += self.connect_cost
+        self.latency_total += delay
+        await self._delay(delay)
+
+        if not self._take_token() or self._rng.random() < self.throttle_rate:
+            self.injected["throttled"] += 1
+            return web.json_response(
+                {"errorCode": "ERROR_RATE_LIMITED", "reason": "Too many requests"},
+                status=429, headers={"Retry-After": f"{self.retry_after:g}"}
+            )
+        if self._rng.random() < self.error_rate:
+            self.injected["errors"] += 1
+            return web.json_response({"errorCode": "ERROR_INTERNAL", "reason": "Injected error"}, status=503)
+
+        if name != "oauth":
+            auth = request.headers.get("Authorization", "")
+            if not auth.startswith("Bearer ") or auth[7:] not in self._tokens:
+                return web.json_response({"fault": {"faultstring": "Invalid access token"}}, status=401)
+
+        response = await handler(request)
+        self.first_at.setdefault(name, time.perf_counter())
+        return response
+
+    def _group(self, request) -> dict:
+        group = self.groups.get(request.match_info["group"])
+        if group is None:
+            raise web.HTTPGone(
+                text='{"errorCode": "ERROR_RESOURCE_GONE", "reason": "Group not found"}',
+                content_type="application/json"
+            )
+        return group
+
+    def _player(self, request) -> str:
+        player_id = request.match_info["player"]
+        if player_id not in self.volumes:
+            raise web.HTTPNotFound(
+                text='{"errorCode": "ERROR_INVALID_OBJECT_ID", "reason": "Player not found"}',
+                content_type="application/json"
+            )
+        return player_id
+
+    def _household(self, request):
+        if request.match_info["household"] != HOUSEHOLD_ID:
+            raise web.HTTPNotFound(
+                text='{"errorCode": "ERROR_INVALID_OBJECT_ID", "reason": "Household not found"}',
+                content_type="application/json"
+            )
+
+    async def _json(self, request) -> dict:
+        try:
+            return await request.json()
+        except Exception:
+            raise web.HTTPBadRequest(
+                text='{"errorCode": "ERROR_INVALID_SYNTAX", "reason": "Invalid JSON"}',
+                content_type="application/json"
+            )
+
+    # -------------------------
+    # Endpoints
+    # -------------------------
+    async def oauth(self, request):
+        form = await request.post()
+        if form.get("grant_type") != "refresh_token" or not request.headers.get("Authorization"):
+            return web.json_response({"error": "invalid_request"}, status=400)
+        token = f"fake-{uuid.uuid4().hex}"
+        self._tokens.add(token)
+        return web.json_response({
+            "access_token": token, "token_type": "Bearer", "expires_in": 86400,
+            "refresh_token": form.get("refresh_token"), "scope": "playback-control-all",
+        })
+
+    async def households(self, request):
+        return web.json_response({"households": [{"id": HOUSEHOLD_ID}]})
+
+    async def get_groups(self, request):
+        self._household(request)
+        return web.json_response({
+            "groups": [
+                {key: group[key] for key in ("id", "name", "coordinatorId", "playerIds", "playbackState")}
+                for group in self.groups.values()
+            ],
+            "players": [
+                {"id": pid, "name": name, "capabilities": ["PLAYBACK", "CLOUD"]}
+                for name, pid in self.players.items()
+            ],
+        })
+
+    async def create_group(self, request):
+        self._household(request)
+        player_ids = (await self._json(request)).get("playerIds") or []
+        unknown = [pid for pid in player_ids if pid not in self.volumes]
+        if unknown:
+            return web.json_response(
+                {"errorCode": "ERROR_INVALID_PARAMETER", "reason": f"Unknown players {unknown}"}, status=400
+            )
+        for group_id, group in list(self.groups.items()):
+            group["playerIds"] = [pid for pid in group["playerIds"] if pid not in player_ids]
+            if not group["playerIds"]:
+                del self.groups[group_id]
+        group = self._new_group(player_ids)
+        return web.json_response({key: group[key] for key in ("id", "name", "coordinatorId", "playerIds")})
+
+    async def household_favorites(self, request):
+        self._household(request)
+        return web.json_response({
+            "version": "fake-1",
+            "items": [
+                {"id": fid, "name": name, "description": "Playlist",
+                 "resource": {"type": "PLAYLIST", "id": {"objectId": f"playlist:{fid}"}}}
+                for fid, name in self.favorites.items()
+            ],
+        })
+
+    async def load_favorite(self, request):
+        group = self._group(request)
+        body = await self._json(request)
+        favorite_id = str(body.get("favoriteId"))
+        if favorite_id not in self.favorites:
+            return web.json_response(
+                {"errorCode": "ERROR_INVALID_PARAMETER", "reason": "Unknown favoriteId"}, status=400
+            )
+        group["favoriteId"] = favorite_id
+        group["playbackState"] = (
+            "PLAYBACK_STATE_PLAYING" if body.get("playOnCompletion") else "PLAYBACK_STATE_PAUSED"
+        )
+        return web.json_response({})
+
+    async def get_player_volume(self, request):
+        player_id = self._player(request)
+        return web.json_response({"volume": self.volumes[player_id], "muted": False, "fixed": False})
+
+    async def set_player_volume(self, request):
+        player_id = self._player(request)
+        volume = (await self._json(request)).get("volume")
+        if not isinstance(volume, int) or not 0 <= volume <= 100:
+            return web.json_response({"errorCode": "ERROR_INVALID_PARAMETER", "reason": "Invalid volume"}, status=400)
+        self.volumes[player_id] = volume
+        return web.json_response({})
+
+    def _group_volume(self, group: dict) -> int:
+        levels = [self.volumes[pid] for pid in group["playerIds"]]
+        return round(sum(levels) / len(levels)) if levels else 0
+
+    async def get_group_volume(self, request):
+        group = self._group(request)
+        return web.json_response({"volume": self._group_volume(group), "muted": False, "fixed": False})
+
+    async def set_group_volume(self, request):
+        group = self._group(request)
+        volume = (await self._json(request)).get("volume")
+        if not isinstance(volume, int) or not 0 <= volume <= 100:
+            return web.json_response({"errorCode": "ERROR_INVALID_PARAMETER", "reason": "Invalid volume"}, status=400)
+        # Like Sonos, keep the players' relative levels
+        current = self._group_volume(group)
+        for pid in group["playerIds"]:
+            scaled = volume if current == 0 else round(self.volumes[pid] * volume / current)
+            self.volumes[pid] = max(0, min(100, scaled))
+        return web.json_response({})
+
+    async def play(self, request):
+        group = self._group(request)
+        if group["favoriteId"] is None:
+            return web.json_response(
+                {"errorCode": "ERROR_PLAYBACK_NO_CONTENT", "reason": "Nothing loaded"}, status=400
+            )
+        group["playbackState"] = "PLAYBACK_STATE_PLAYING"
+        return web.json_response({})
+
+    async def pause(self, request):
+        group = self._group(request)
+        group["playbackState"] = "PLAYBACK_STATE_PAUSED"
+        return web.json_response({})
+
+    async def playback_status(self, request):
+        group = self._group(request)
+        return web.json_response({
+            "playbackState": group["playbackState"],
+            "positionMillis": 0,
+            "playModes": {"repeat": True, "repeatOne": False, "shuffle": False, "crossfade": False},
+            "availablePlaybackActions": {"canPlay": True, "canPause": True, "canSkip": True},
+        })
+
+    async def playback_metadata(self, request):
+        group = self._group(request)
+        favorite_id = group["favoriteId"]
+        if favorite_id is None:
+            return web.json_response({})
+        name = self.favorites[favorite_id]
+        return web.json_response({
+            "container": {"name": name, "type": "playlist", "id": {"objectId": f"playlist:{favorite_id}"}},
+            "currentItem": {"track": {"name": f"{name} - Track 1", "type": "track",
+                                      "artist": {"name": "Fake Artist"}, "durationMillis": 180000}},
+        })
+
+    async def fake_stats(self, request):
+        return web.json_response(self.get_stats())
+
+    async def fake_reset(self, request):
+        self.reset_state()
+        self.reset_stats()
+        return web.json_response({"ok": True})
+
+    async def fake_config(self, request):
+        body = await self._json(request)
+        try:
+            self.configure(**{key: body[key] for key in
+                              ("latency", "endpoint_latency", "error_rate", "throttle_rate", "rate_limit")
+                              if key in body})
+        except (TypeError, ValueError) as e:
+            return web.json_response({"error": str(e)}, status=400)
+        return web.json_response(self.get_stats()["config"])
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        c = CONTROL_PREFIX
+        routes = [
+            ("POST", "/login/v3/oauth/access", self.oauth, "oauth"),
+            ("GET", f"{c}/households", self.households, "households"),
+            ("GET", f"{c}/households/{{household}}/groups", self.get_groups, "groups"),
+            ("POST", f"{c}/households/{{household}}/groups/createGroup", self.create_group, "create_group"),
+            ("GET", f"{c}/households/{{household}}/favorites", self.household_favorites, "household_favorites"),
+            ("POST", f"{c}/groups/{{group}}/favorites", self.load_favorite, "load_favorite"),
+            ("GET", f"{c}/players/{{player}}/playerVolume", self.get_player_volume, "get_player_volume"),
+            ("POST", f"{c}/players/{{player}}/playerVolume", self.set_player_volume, "set_player_volume"),
+            ("GET", f"{c}/groups/{{group}}/groupVolume", self.get_group_volume, "get_group_volume"),
+            ("POST", f"{c}/groups/{{group}}/groupVolume", self.set_group_volume, "set_group_volume"),
+            ("POST", f"{c}/groups/{{group}}/playback/play", self.play, "play"),
+            ("POST", f"{c}/groups/{{group}}/playback/pause", self.pause, "pause"),
+            ("GET", f"{c}/groups/{{group}}/playback", self.playback_status, "playback_status"),
+            ("GET", f"{c}/groups/{{group}}/playbackMetadata", self.playback_metadata, "playback_metadata"),
+            ("GET", "/_fake/stats", self.fake_stats, "fake_stats"),
+            ("POST", "/_fake/reset", self.fake_reset, "fake_reset"),
+            ("POST", "/_fake/config", self.fake_config, "fake_config"),
+        ]
+        for method, path, handler, name in routes:
+            app.router.add_route(method, path, handler, name=name)
+        return app
+
+    # -------------------------
+    # Serving
+    # -------------------------
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on the running loop; returns the base URL"""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on a background thread with its own loop; returns the base URL"""
+        ready = threading.Event()
+        result = {}
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            result["url"] = self._loop.run_until_complete(self.start(host, port))
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="fake-sonos", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return result["url"]
+
+    def stop_thread(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="none", help="latency spec for every endpoint")
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="NAME=SPEC",
+                        help="latency spec for one endpoint (repeatable)")
+    parser.add_argument("--connect-cost", type=float, default=0.0, help="extra seconds per new connection")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests/second before 429s")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeSonos(
+        latency=args.latency,
+        endpoint_latency=dict(item.split("=", 1) for item in args.endpoint_latency),
+        connect_cost=args.connect_cost, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit, retry_after=args.retry_after, seed=args.seed,
+    )
+
+    async def serve():
+        url = await fake.start(args.host, args.port)
+        print(f"Fake Sonos listening on {url} - run clients with SONOS_API_BASE_URL={url}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark per-slot start latency of the legacy scheduler's program runner
+
+Runs a scripts/ program repeatedly through program_runner.run() in both
+"subprocess" and "inprocess" mode and measures, per slot, the time from the
+scheduler handing off the slot until the first favorite load (the first
+audible step) and the first play command reach Sonos.
+
+Sonos is replaced by benchmarks/fake_sonos.py, which the scripts reach
+through SONOS_API_BASE_URL. A sitecustomize module scales the scripts'
+asyncio.sleep() calls, identically in both modes. Each request costs --rtt
+seconds, and each new connection an extra --connect-cost to stand in for
+the TCP/TLS handshake.
+
+Usage (from backend/):
+    python -m benchmarks.legacy_start_latency [--script 65sm.py] [--slots 10] [--json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fake_sonos import FakeSonos
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Loaded by every Python process started with the temp dir on PYTHONPATH
+SITECUSTOMIZE = '''
+import asyncio
+import os
+
+if os.environ.get("BENCH_SLEEP_SCALE"):
+    _scale = float(os.environ["BENCH_SLEEP_SCALE"])
+    _sleep = asyncio.sleep
+
+    async def _scaled_sleep(delay, result=None):
+        return await _sleep(delay * _scale, result)
+
+    asyncio.sleep = _scaled_sleep
+'''
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 1),
+        "p95_ms": round(ordered[max(0, round(0.95 * len(ordered)) - 1)] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+@contextlib.contextmanager
+def quiet_stdout():
+    """Silence the scripts' progress prints, in this process and in children"""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+
+def bench_mode(program_runner, fake: FakeSonos, mode: str, script: str, slots: int) -> dict:
+    load, play, total, requests, connections = [], [], [], [], []
+    for _ in range(slots):
+        fake.reset_stats()
+        started = time.perf_counter()
+        with quiet_stdout():
+            program_runner.run(f"scripts/{script}", mode=mode)
+        finished = time.perf_counter()
+        load.append(fake.first_at["load_favorite"] - started)
+        play.append(fake.first_at["play"] - started)
+        total.append(finished - started)
+        requests.append(fake.requests)
+        connections.append(fake.connections)
+    return {
+        "cold_first_load_ms": round(load[0] * 1000, 1),
+        "first_load": summarize(load[1:] or load),
+        "first_play": summarize(play[1:] or play),
+        "total": summarize(total[1:] or total),
+        "requests_per_slot": statistics.median(requests[1:] or requests),
+        "new_connections_per_slot": statistics.median(connections[1:] or connections),
+    }
+
+
+def run(script: str, slots: int, rtt: float, connect_cost: float) -> dict:
+    fake = FakeSonos(latency=f"constant:{rtt * 1000}", connect_cost=connect_cost)
+    base = fake.start_in_thread()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Sleep scaling for child processes...
+        Path(tmp, "sitecustomize.py").write_text(SITECUSTOMIZE)
+        # ...and a `python` on PATH that is this interpreter, not a shim
+        bin_dir = Path(tmp, "bin")
+        bin_dir.mkdir()
+        (bin_dir / "python").symlink_to(sys.executable)
+        os.environ["SONOS_API_BASE_URL"] = base
+        os.environ["BENCH_SLEEP_SCALE"] = "0"
+        os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [tmp, os.environ.get("PYTHONPATH")]))
+        os.environ["PATH"] = os.pathsep.join([str(bin_dir), os.environ["PATH"]])
+        os.environ["PYTHONDONTWRITEBYTECODE"] = "1"
+
+        # ...and for this process, where the in-process runner executes scripts
+        exec(compile(SITECUSTOMIZE, "sitecustomize", "exec"), {})
+
+        os.chdir(REPO_ROOT)
+        sys.path.insert(0, str(REPO_ROOT))
+        import program_runner
+
+        results = {
+            "script": script,
+            "slots": slots,
+            "rtt_ms": rtt * 1000,
+            "connect_cost_ms": connect_cost * 1000,
+            "subprocess": bench_mode(program_runner, fake, "subprocess", script, slots),
+            "inprocess": bench_mode(program_runner, fake, "inprocess", script, slots),
+        }
+        program_runner.close()
+    fake.stop_thread()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="65sm.py", help="program under scripts/ to run")
+    parser.add_argument("--slots", type=int, default=10, help="slots to run per mode")
+    parser.add_argument("--rtt", type=float, default=0.05, help="seconds added to every request")
+    parser.add_argument("--connect-cost", type=float, default=0.1, help="seconds added per new connection")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args()
+
+    result = run(args.script, args.slots, args.rtt, args.connect_cost)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['script']}: {result['slots']} slots per mode, rtt {result['rtt_ms']:.0f}ms, "
+          f"connect {result['connect_cost_ms']:.0f}ms (warm slots; cold = first slot)")
+    print(f"{'mode':<12}{'cold load':>11}{'load p50':>10}{'load p95':>10}{'play p50':>10}"
+          f"{'total p50':>11}{'requests':>10}{'new conns':>11}")
+    for mode in ("subprocess", "inprocess"):
+        r = result[mode]
+        print(f"{mode:<12}{r['cold_first_load_ms']:>11.1f}{r['first_load']['median_ms']:>10.1f}"
+              f"{r['first_load']['p95_ms']:>10.1f}{r['first_play']['median_ms']:>10.1f}"
+              f"{r['total']['median_ms']:>11.1f}{r['requests_per_slot']:>10}{r['new_connections_per_slot']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Benchmark SQLite pragmas and indexes on a large execution log table
+
+Builds a throwaway database with the app schema and ~1M execution_logs rows,
+then times the app's hot queries twice: with SQLite defaults and no secondary
+indexes ("before"), and with SQLITE_PRAGMAS and the metadata indexes applied
+("after").
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_tuning [--rows 1000000] [--repeat 5] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+
+from app.database import metadata, apply_sqlite_pragmas
+from app.data.default_schedule import default_slot_rows
+
+STATUSES = ["success", "success", "success", "success", "failed", "cancelled", "skipped"]
+PROGRAMS = ["65sm.py", "65ad.py", "65fm.py", "65parking.py", "75adfire.py", "75fireparking.py", "pause.py"]
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+QUERIES = {
+    "recent_logs": (
+        "SELECT * FROM execution_logs ORDER BY executed_at DESC LIMIT 50",
+        (),
+    ),
+    "timing_window_7d": (
+        "SELECT * FROM execution_logs WHERE scheduled_at IS NOT NULL "
+        "AND first_play_at IS NOT NULL AND executed_at >= ?",
+        "since_7d",
+    ),
+    "logs_last_day": (
+        "SELECT COUNT(*) FROM execution_logs WHERE executed_at >= ?",
+        "since_1d",
+    ),
+    "day_schedule": (
+        "SELECT * FROM schedule_slots WHERE day_of_week = ? ORDER BY time",
+        ("friday",),
+    ),
+    "active_slots": (
+        "SELECT * FROM schedule_slots WHERE is_active = 1",
+        (),
+    ),
+}
+
+
+def create_schema(path: str):
+    """Create the app tables without secondary indexes"""
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+    engine.dispose()
+
+
+def populate(path: str, rows: int, now: datetime):
+    """Fill execution_logs with rows spread over the past year, plus the default schedule"""
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO schedule_slots (day_of_week, time, program_name, block_type, is_active) "
+        "VALUES (?, ?, ?, ?, 1)",
+        default_slot_rows()
+    )
+
+    def generate():
+        for _ in range(rows):
+            executed = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            scheduled = executed - timedelta(seconds=rng.random())
+            first_play = executed + timedelta(seconds=rng.random() * 3)
+            timed = rng.random() < 0.8
+            yield (
+                rng.choice(PROGRAMS),
+                executed.strftime(TIME_FORMAT),
+                rng.choice(STATUSES),
+                scheduled.strftime(TIME_FORMAT) if timed else None,
+                first_play.strftime(TIME_FORMAT) if timed else None,
+            )
+
+    conn.executemany(
+        "INSERT INTO execution_logs (program_name, executed_at, status, scheduled_at, first_play_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        generate()
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_queries(conn: sqlite3.Connection, params: dict, repeat: int) -> dict:
+    """Median milliseconds per query over `repeat` runs (after one warm-up)"""
+    results = {}
+    for name, (sql, args) in QUERIES.items():
+        args = params[args] if isinstance(args, str) else args
+        conn.execute(sql, args).fetchall()
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            samples.append((time.perf_counter() - started) * 1000)
+        results[name] = round(statistics.median(samples), 3)
+    return results
+
+
+def time_log_inserts(conn: sqlite3.Connection, count: int) -> float:
+    """Mean milliseconds per committed single-row log insert, as the scheduler writes them"""
+    started = time.perf_counter()
+    for _ in range(count):
+        conn.execute(
+            "INSERT INTO execution_logs (program_name, executed_at, status) VALUES (?, ?, ?)",
+            ("65sm.py", datetime.now().strftime(TIME_FORMAT), "success")
+        )
+        conn.commit()
+    return round((time.perf_counter() - started) * 1000 / count, 3)
+
+
+def run(rows: int, repeat: int, inserts: int) -> dict:
+    now = datetime.now()
+    params = {
+        "since_7d": ((now - timedelta(days=7)).strftime(TIME_FORMAT),),
+        "since_1d": ((now - timedelta(days=1)).strftime(TIME_FORMAT),),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        create_schema(path)
+        started = time.perf_counter()
+        populate(path, rows, now)
+        populate_s = round(time.perf_counter() - started, 2)
+
+        conn = sqlite3.connect(path)
+        before = time_queries(conn, params, repeat)
+        before["log_insert"] = time_log_inserts(conn, inserts)
+        conn.close()
+
+        conn = sqlite3.connect(path)
+        apply_sqlite_pragmas(conn)
+        started = time.perf_counter()
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                columns = ", ".join(column.name for column in index.columns)
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {index.name} ON {table.name} ({columns})")
+        conn.commit()
+        index_s = round(time.perf_counter() - started, 2)
+        after = time_queries(conn, params, repeat)
+        after["log_insert"] = time_log_inserts(conn, inserts)
+        conn.close()
+
+    return {
+        "rows": rows,
+        "populate_seconds": populate_s,
+        "index_build_seconds": index_s,
+        "before_ms": before,
+        "after_ms": after,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="execution_logs rows to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query")
+    parser.add_argument("--inserts", type=int, default=200, help="single-row log inserts to time")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat, args.inserts)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['rows']:,} log rows (populate {result['populate_seconds']}s, "
+          f"index build {result['index_build_seconds']}s)")
+    print(f"{'query':<20}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, before in result["before_ms"].items():
+        after = result["after_ms"][name]
+        speedup = f"{before / after:.1f}x" if after else "-"
+        print(f"{name:<20}{before:>12.3f}{after:>12.3f}{speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
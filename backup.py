@@ -1,6 +1,7 @@
 import schedule
 import time
 import subprocess
+import program_runner
 import logging
 import os
 
@@ -19,7 +20,7 @@ def run_script(script):
     try:
         print(f"Running script: {script}")
         logging.info(f"Running script: {script}")
-        subprocess.run(["python", f"scripts/{script}"], check=True)
+        program_runner.run(f"scripts/{script}")
         print(f"Script {script} ran successfully.")
         logging.info(f"Script {script} ran successfully.")
     except subprocess.CalledProcessError as e:
@@ -57,6 +57,14 @@ class ApiClient {
     });
   }
 
+  // Apply create/update/delete operations across days in one transaction
+  async batchSchedule(operations: unknown[]) {
+    return this.request('/api/v1/schedule/batch', {
+      method: 'PATCH',
+      body: JSON.stringify({ operations }),
+    });
+  }
+
   async resetSchedule() {
     return this.request('/api/v1/schedule/reset', { method: 'POST' });
   }
@@ -92,7 +100,18 @@ class ApiClient {
   }
 
   async runProgram(programName: string) {
-    return this.request(`/api/v1/playback/run-program/${programName}`, {
+    return this.request<{ message: string; job_id: string }>(
+      `/api/v1/playback/run-program/${programName}`,
+      { method: 'POST' }
+    );
+  }
+
+  async getJob(jobId: string) {
+    return this.request(`/api/v1/playback/jobs/${jobId}`);
+  }
+
+  async cancelJob(jobId: string) {
+    return this.request(`/api/v1/playback/jobs/${jobId}/cancel`, {
       method: 'POST',
     });
   }
@@ -151,8 +170,10 @@ class ApiClient {
     return this.request<unknown>('/api/v1/system/status');
   }
 
-  async getExecutionLogs(limit: number = 50) {
-    return this.request<{ logs: unknown[] }>(`/api/v1/system/logs?limit=${limit}`);
+  // Filters: status (comma-separated), program, since, until; pass next_cursor as cursor for the next page
+  async getExecutionLogs(limit: number = 50, filters: Record<string, string> = {}) {
+    const params = new URLSearchParams({ limit: String(limit), ...filters });
+    return this.request<{ logs: unknown[]; next_cursor: string | null }>(`/api/v1/system/logs?${params}`);
   }
 
   async restartScheduler() {
@@ -193,6 +214,23 @@ class ApiClient {
       { method: 'POST' }
     );
   }
+
+  // Server-Sent Events - calls onEvent(type, data) for each pushed state change.
+  // EventSource reconnects on its own and resumes via Last-Event-ID. After a
+  // server restart missed events can't be replayed, so the server sends
+  // "resync" instead; it is always delivered so callers refetch their state.
+  subscribeEvents(
+    types: string[],
+    onEvent: (type: string, data: unknown) => void
+  ): () => void {
+    const source = new EventSource(`${this.baseUrl}/api/v1/events`);
+    [...types, 'resync'].forEach((type) => {
+      source.addEventListener(type, (event) => {
+        onEvent(type, JSON.parse((event as MessageEvent).data));
+      });
+    });
+    return () => source.close();
+  }
 }
 
 export const api = new ApiClient(API_BASE_URL);
@@ -90,8 +90,22 @@ export function Dashboard() {
 
   useEffect(() => {
     fetchStatus();
-    const interval = setInterval(fetchStatus, 5000);
-    return () => clearInterval(interval);
+    // Refresh when the server pushes a state change; slow fallback poll
+    // only covers things without events (clock, logs)
+    let debounce: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = api.subscribeEvents(
+      ['playback', 'program_started', 'program_finished', 'fire_show', 'pause'],
+      () => {
+        clearTimeout(debounce);
+        debounce = setTimeout(fetchStatus, 250);
+      }
+    );
+    const interval = setInterval(fetchStatus, 60000);
+    return () => {
+      unsubscribe();
+      clearTimeout(debounce);
+      clearInterval(interval);
+    };
   }, []);
 
   const handlePlay = async () => {
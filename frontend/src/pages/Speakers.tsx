@@ -43,9 +43,19 @@ export function Speakers() {
 
   useEffect(() => {
     fetchData();
-    // Auto-refresh every 5 seconds
-    const interval = setInterval(fetchData, 5000);
-    return () => clearInterval(interval);
+    // Refresh when the server pushes a volume or grouping change
+    // (a program step changes several volumes at once, so coalesce them)
+    let debounce: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = api.subscribeEvents(['volume', 'topology'], () => {
+      clearTimeout(debounce);
+      debounce = setTimeout(fetchData, 250);
+    });
+    const interval = setInterval(fetchData, 60000);
+    return () => {
+      unsubscribe();
+      clearTimeout(debounce);
+      clearInterval(interval);
+    };
   }, []);
 
   const handleGroupAll = async () => {
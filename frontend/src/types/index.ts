@@ -46,6 +46,7 @@ export interface Speaker {
   is_online: boolean;
   is_grouped: boolean;
   volume?: number;
+  volume_age?: number | null;  // seconds since the volume was last confirmed
 }
 
 export interface SpeakerLayout {
@@ -68,6 +69,7 @@ export interface PlaybackStatus {
   station: string | null;
   is_paused_until_midnight: boolean;
   paused_until: string | null;
+  snapshot_age?: number;  // seconds since the server-side status snapshot was taken
 }
 
 // System Types
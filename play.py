@@ -1,10 +1,15 @@
 import requests
 import base64
 import time
+import os
+
+# SONOS_API_BASE_URL points every request at a stand-in server (see backend/benchmarks/fake_sonos.py)
+SONOS_AUTH_URL = os.environ.get("SONOS_API_BASE_URL") or "https://api.sonos.com"
+SONOS_CONTROL_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.ws.sonos.com") + "/control/api/v1"
 
 def refresh_token(refresh_token_value, client_id, client_secret):
     print("Refreshing access token...")
-    url = "https://api.sonos.com/login/v3/oauth/access"
+    url = f"{SONOS_AUTH_URL}/login/v3/oauth/access"
     payload = {
         "grant_type": "refresh_token",
         "refresh_token": refresh_token_value
@@ -33,7 +38,7 @@ def get_household_id(access_token):
         "Authorization": f"Bearer {access_token}"
     }
 
-    get_households_url = "https://api.ws.sonos.com/control/api/v1/households"
+    get_households_url = f"{SONOS_CONTROL_URL}/households"
     households_response = requests.get(get_households_url, headers=headers)
     if households_response.status_code != 200:
         raise Exception(f"Error getting households: {households_response.text}")
@@ -50,7 +55,7 @@ def get_group_id(household_id, access_token):
         "Authorization": f"Bearer {access_token}"
     }
 
-    get_groups_url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
+    get_groups_url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups"
     groups_response = requests.get(get_groups_url, headers=headers)
     if groups_response.status_code != 200:
         raise Exception(f"Error getting groups: {groups_response.text}")
@@ -67,7 +72,7 @@ def load_favorite_playlist(group_id, favorite_playlist_id, access_token):
         "Authorization": f"Bearer {access_token}"
     }
 
-    load_favorite_url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/favorites"
+    load_favorite_url = f"{SONOS_CONTROL_URL}/groups/{group_id}/favorites"
     payload = {"favoriteId": favorite_playlist_id}
     response = requests.post(load_favorite_url, headers=headers, json=payload)
     if response.status_code != 200:
@@ -81,7 +86,7 @@ def set_group_volume(group_id, volume, access_token):
         "Authorization": f"Bearer {access_token}"
     }
 
-    volume_url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/groupVolume"
+    volume_url = f"{SONOS_CONTROL_URL}/groups/{group_id}/groupVolume"
     volume_payload = {"volume": volume}
     volume_response = requests.post(volume_url, headers=headers, json=volume_payload)
     if volume_response.status_code != 200:
@@ -95,7 +100,7 @@ def play_group(group_id, access_token):
         "Authorization": f"Bearer {access_token}"
     }
 
-    play_url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback/play"
+    play_url = f"{SONOS_CONTROL_URL}/groups/{group_id}/playback/play"
     play_response = requests.post(play_url, headers=headers)
     if play_response.status_code != 200:
         raise Exception(f"Playback error {play_response.status_code}: {play_response.text}")
@@ -1,9 +1,14 @@
 import requests
 import base64
+import os
+
+# SONOS_API_BASE_URL points every request at a stand-in server (see backend/benchmarks/fake_sonos.py)
+SONOS_AUTH_URL = os.environ.get("SONOS_API_BASE_URL") or "https://api.sonos.com"
+SONOS_CONTROL_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.ws.sonos.com") + "/control/api/v1"
 
 def refresh_token(refresh_token_value, client_id, client_secret):
     print("Refreshing access token...")
-    url = "https://api.sonos.com/login/v3/oauth/access"
+    url = f"{SONOS_AUTH_URL}/login/v3/oauth/access"
     payload = {
         "grant_type": "refresh_token",
         "refresh_token": refresh_token_value
@@ -27,7 +32,7 @@ def get_household_id(access_token):
         "Content-Type": "application/json",
         "Authorization": f"Bearer {access_token}"
     }
-    get_households_url = "https://api.ws.sonos.com/control/api/v1/households"
+    get_households_url = f"{SONOS_CONTROL_URL}/households"
     households_response = requests.get(get_households_url, headers=headers)
     if households_response.status_code != 200:
         raise Exception(f"Error getting households: {households_response.text}")
@@ -42,7 +47,7 @@ def get_all_player_ids(household_id, access_token):
         "Content-Type": "application/json",
         "Authorization": f"Bearer {access_token}"
     }
-    get_groups_url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
+    get_groups_url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups"
     groups_response = requests.get(get_groups_url, headers=headers)
     if groups_response.status_code != 200:
         raise Exception(f"Error getting groups: {groups_response.text}")
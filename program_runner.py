@@ -0,0 +1,362 @@
+"""
+In-process runner for the scripts/ programs used by scheduler.py, backup.py
+and schedule_backup.py.
+
+run() is a drop-in for subprocess.run(["python", path], check=True): it blocks
+until the program finishes and raises subprocess.CalledProcessError on
+failure, so the schedulers' log lines stay the same.
+
+In "inprocess" mode (default) every program runs on one long-lived event
+loop thread. Scripts are imported once (and re-imported when the file
+changes), and their aiohttp session, OAuth token and household lookup are
+shared across runs instead of being rebuilt for every slot.
+
+Programs that have a row in the backend's programs table run from the
+compiled step plan for that row (backend/app/data/program_plans.py) instead
+of their script, so schedule and backend share one definition. Plans are
+cached by program and recompiled when the row changes; programs without a
+row keep running their scripts/ file.
+
+Set LEGACY_RUN_MODE=subprocess to go back to one Python process per slot.
+
+CLI: python program_runner.py <program>   e.g. python program_runner.py 65sm.py
+"""
+import asyncio
+import atexit
+import base64
+import importlib.util
+import inspect
+import os
+import runpy
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+import aiohttp
+import certifi
+import ssl
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(REPO_DIR, "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from app.data.program_plans import compile_plan, program_key  # noqa: E402
+
+RUN_MODE = os.environ.get("LEGACY_RUN_MODE", "inprocess")
+
+# SONOS_API_BASE_URL points every request at a stand-in server (see backend/benchmarks/fake_sonos.py)
+OAUTH_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.sonos.com") + "/login/v3/oauth/access"
+CONTROL_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.ws.sonos.com") + "/control/api/v1"
+
+# Same credentials and speakers as the scripts (and the backend's defaults)
+CLIENT_ID = os.environ.get("SONOS_CLIENT_ID", "1b66f808-68aa-47db-92dd-13ee474757ba")
+CLIENT_SECRET = os.environ.get("SONOS_CLIENT_SECRET", "61510ebb-aad5-4691-9efa-05c81260df92")
+REFRESH_TOKEN = os.environ.get("SONOS_REFRESH_TOKEN", "pWPbYeKxsAsQQGemUiAzuTTxltXOisfu")
+SPEAKERS = {
+    "BATHROOM_DOORS": "RINCON_804AF2A48D2F01400",
+    "STAGE": "RINCON_804AF2AB699401400",
+    "RIGHT_POLE_01": "RINCON_804AF2A52DDC01400",
+    "RIGHT_POLE_02": "RINCON_804AF2A52D7901400",
+    "RIGHT_POLE_03": "RINCON_C4387580DC4101400",
+    "LEFT_POLE_01": "RINCON_347E5C0E7E1601400",
+    "LEFT_POLE_02": "RINCON_C4387557F99B01400",
+    "LEFT_POLE_03": "RINCON_C4387580DDA001400",
+    "CENTER_POLE": "RINCON_C43875560E2801400",
+}
+
+# Seconds to wait for a newly created group to show up
+GROUP_POLL_TIMEOUT = 30
+GROUP_POLL_INTERVAL = 2
+
+# Refresh the shared token this many seconds before it expires
+TOKEN_EXPIRY_MARGIN = 300
+
+ssl_context = ssl.create_default_context(cafile=certifi.where())
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+_session = None
+_modules = {}  # script path -> (mtime, module)
+_tokens = {}  # (client_id, refresh token) -> (access token, expires at)
+_households = {}  # access token -> household id
+_plans = {}  # program key -> (programs row, compiled plan)
+
+
+# -------------------------
+# Shared session / token
+# -------------------------
+class _SharedSession:
+    """Async context manager handing a script the shared session without closing it"""
+
+    async def __aenter__(self):
+        return await _get_session()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _SharedAiohttp:
+    """Stands in for the aiohttp module inside a script: ClientSession() is shared"""
+
+    def ClientSession(self, *args, **kwargs):
+        return _SharedSession()
+
+    def __getattr__(self, name):
+        return getattr(aiohttp, name)
+
+
+async def _get_session():
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession()
+    return _session
+
+
+async def shared_refresh_token(refresh_token_value, client_id, client_secret, session):
+    """Same signature as the scripts' refresh_token, but reuses a valid token"""
+    key = (client_id, refresh_token_value)
+    cached = _tokens.get(key)
+    if cached and cached[1] - TOKEN_EXPIRY_MARGIN > time.time():
+        print("Using cached access token.")
+        return cached[0]
+
+    print("Refreshing access token...")
+    payload = {"grant_type": "refresh_token", "refresh_token": refresh_token_value}
+    credentials = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+    headers = {"accept": "application/json", "Authorization": f"Basic {credentials}"}
+    async with session.post(OAUTH_URL, headers=headers, data=payload, ssl=ssl_context) as response:
+        if response.status != 200:
+            text = await response.text()
+            raise Exception(f"Error refreshing token: {response.status} - {text}")
+        data = await response.json()
+    _tokens[key] = (data["access_token"], time.time() + data.get("expires_in", 86400))
+    print("Access token refreshed.")
+    return data["access_token"]
+
+
+def _shared_household_lookup(original):
+    """Wrap a script's get_household_id so each token looks the household up once"""
+    async def shared_get_household_id(access_token, session):
+        if access_token not in _households:
+            _households[access_token] = await original(access_token, session)
+        return _households[access_token]
+    return shared_get_household_id
+
+
+def invalidate():
+    """Forget the shared token and household, e.g. after a failed run"""
+    _tokens.clear()
+    _households.clear()
+
+
+# -------------------------
+# Compiled program plans
+# -------------------------
+def _database_path():
+    """Path of the backend's SQLite database (DATABASE_URL, as the backend resolves it)"""
+    url = os.environ.get("DATABASE_URL", "sqlite:///./sonos_cloud.db")
+    if not url.startswith("sqlite"):
+        return None
+    path = url.split(":///", 1)[-1]
+    return path if os.path.isabs(path) else os.path.join(BACKEND_DIR, path)
+
+
+def _fetch_program_row(key):
+    path = _database_path()
+    if not path or not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            "SELECT name, volume, program_type, favorite_ids, updated_at FROM programs "
+            "WHERE name IN (?, ?)", (key, f"{key}.py")
+        ).fetchone()
+    except sqlite3.Error:
+        return None  # No programs table yet
+    finally:
+        conn.close()
+
+
+def get_plan(path):
+    """Compiled plan for a script's program, or None if the program has no row"""
+    key = program_key(os.path.basename(path))
+    row = _fetch_program_row(key)
+    if row is None:
+        _plans.pop(key, None)
+        return None
+    cached = _plans.get(key)
+    if cached and cached[0] == row:
+        return cached[1]
+    _, volume, program_type, favorite_ids, _ = row
+    plan = compile_plan(key, favorite_ids, speakers=SPEAKERS, volume=volume, program_type=program_type)
+    _plans[key] = (row, plan)
+    return plan
+
+
+async def _control(session, access_token, method, path, payload=None):
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
+    async with session.request(method, CONTROL_URL + path, headers=headers, json=payload,
+                               ssl=ssl_context) as response:
+        if response.status != 200:
+            text = await response.text()
+            raise Exception(f"Error {method} {path}: {response.status} - {text}")
+        try:
+            return await response.json()
+        except Exception:
+            return {}
+
+
+async def _get_household_id(access_token, session):
+    data = await _control(session, access_token, "GET", "/households")
+    return data["households"][0]["id"]
+
+
+_plan_household_lookup = _shared_household_lookup(_get_household_id)
+
+
+async def _ensure_group(household_id, access_token, session):
+    """Group ID of the all-speakers group, creating it if needed"""
+    player_ids = set(SPEAKERS.values())
+    data = await _control(session, access_token, "GET", f"/households/{household_id}/groups")
+    for group in data.get("groups", []):
+        if set(group.get("playerIds", [])) == player_ids:
+            return group["id"]
+
+    print("Creating a new group with all players...")
+    created = await _control(session, access_token, "POST", f"/households/{household_id}/groups/createGroup",
+                             {"playerIds": list(SPEAKERS.values())})
+    if created.get("id"):
+        return created["id"]
+    deadline = time.time() + GROUP_POLL_TIMEOUT
+    while time.time() < deadline:
+        data = await _control(session, access_token, "GET", f"/households/{household_id}/groups")
+        for group in data.get("groups", []):
+            if player_ids.issubset(group.get("playerIds", [])):
+                return group["id"]
+        await asyncio.sleep(GROUP_POLL_INTERVAL)
+    raise Exception("Timed out waiting for the group to be created.")
+
+
+async def _run_plan(plan):
+    """Run a compiled plan with the shared session, token and household"""
+    session = await _get_session()
+    access_token = await shared_refresh_token(REFRESH_TOKEN, CLIENT_ID, CLIENT_SECRET, session)
+    household_id = await _plan_household_lookup(access_token, session)
+
+    if plan.is_pause:
+        data = await _control(session, access_token, "GET", f"/households/{household_id}/groups")
+        group_id = data["groups"][0]["id"]
+        await _control(session, access_token, "POST", f"/groups/{group_id}/playback/pause")
+        print("Playback paused.")
+        return
+
+    group_id = await _ensure_group(household_id, access_token, session)
+    for index, step in enumerate(plan.steps, 1):
+        await _control(session, access_token, "POST", f"/groups/{group_id}/favorites",
+                       {"favoriteId": step.favorite_id})
+        await asyncio.gather(*[
+            _control(session, access_token, "POST", f"/players/{player_id}/playerVolume", {"volume": level})
+            for player_id, level in step.volumes
+        ])
+        await _control(session, access_token, "POST", f"/groups/{group_id}/playback/play")
+        print(f"{plan.name}: step {index}/{len(plan.steps)} playing favorite {step.favorite_id}")
+        if step.delay > 0:
+            await asyncio.sleep(step.delay)
+
+
+# -------------------------
+# Script loading / running
+# -------------------------
+def _load(path):
+    """Import a script as a module, re-importing it if the file changed"""
+    mtime = os.path.getmtime(path)
+    cached = _modules.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    name = "legacy_" + os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    if inspect.iscoroutinefunction(getattr(module, "main", None)):
+        module.aiohttp = _SharedAiohttp()
+        if hasattr(module, "refresh_token"):
+            module.refresh_token = shared_refresh_token
+        if hasattr(module, "get_household_id"):
+            module.get_household_id = _shared_household_lookup(module.get_household_id)
+    _modules[path] = (mtime, module)
+    return module
+
+
+async def _run_script(path):
+    plan = get_plan(path)
+    if plan is not None:
+        await _run_plan(plan)
+        return
+
+    module = _load(path)
+    main = getattr(module, "main", None)
+    if inspect.iscoroutinefunction(main):
+        await main()
+    else:
+        # Synchronous scripts (pause.py) keep their logic under __main__
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: runpy.run_path(path, run_name="__main__")
+        )
+
+
+def _ensure_loop():
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="program-runner", daemon=True)
+            _loop_thread.start()
+            atexit.register(close)
+    return _loop
+
+
+def run(path, mode=None):
+    """Run scripts/<program>.py to completion, like subprocess.run(["python", path], check=True)"""
+    mode = mode or RUN_MODE
+    if mode == "subprocess":
+        subprocess.run(["python", path], check=True)
+        return
+
+    loop = _ensure_loop()
+    future = asyncio.run_coroutine_threadsafe(_run_script(path), loop)
+    try:
+        future.result()
+    except Exception:
+        traceback.print_exc()
+        invalidate()
+        raise subprocess.CalledProcessError(1, ["python", path])
+
+
+def close():
+    """Close the shared session and stop the event loop thread"""
+    global _loop, _session
+    if _loop is None:
+        return
+    if _session is not None:
+        asyncio.run_coroutine_threadsafe(_session.close(), _loop).result(timeout=5)
+        _session = None
+    _loop.call_soon_threadsafe(_loop.stop)
+    _loop_thread.join(timeout=5)
+    _loop = None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python program_runner.py <program>   e.g. 65sm.py")
+    program = sys.argv[1]
+    os.chdir(REPO_DIR)
+    try:
+        run(os.path.join("scripts", program if program.endswith(".py") else f"{program}.py"))
+    except subprocess.CalledProcessError:
+        sys.exit(1)
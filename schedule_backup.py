@@ -1,6 +1,7 @@
 import schedule
 import time
 import subprocess
+import program_runner
 import logging
 import os
 
@@ -524,7 +525,7 @@ def run_script(script: str):
         path = os.path.join(SCRIPTS_DIR, script)
         print(f"Running script: {path}")
         logging.info(f"Running script: {path}")
-        subprocess.run(["python", path], check=True)
+        program_runner.run(path)
         print(f"Script {script} ran successfully.")
         logging.info(f"Script {script} ran successfully.")
     except subprocess.CalledProcessError as e:
@@ -1,6 +1,7 @@
 import schedule
 import time
 import subprocess
+import program_runner
 import logging
 import os
 import signal
@@ -65,7 +66,7 @@ def run_script(script: str, scheduled_time: str | None = None):
         line = f"{nice} program {script} is playing now..."
         print(line)
         logging.info(line)
-        subprocess.run(["python", f"scripts/{script}"], check=True)
+        program_runner.run(f"scripts/{script}")
     except subprocess.CalledProcessError as e:
         err = f"[{label_time}] ERROR running {script}: {e}"
         print(err); logging.error(err)
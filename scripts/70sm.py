@@ -4,12 +4,17 @@ import base64
 import certifi
 import ssl
 import time
+import os
 
 ssl_context = ssl.create_default_context(cafile=certifi.where())
 
+# SONOS_API_BASE_URL points every request at a stand-in server (see backend/benchmarks/fake_sonos.py)
+SONOS_AUTH_URL = os.environ.get("SONOS_API_BASE_URL") or "https://api.sonos.com"
+SONOS_CONTROL_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.ws.sonos.com") + "/control/api/v1"
+
 async def refresh_token(refresh_token_value, client_id, client_secret, session):
     print("Refreshing access token...")
-    url = "https://api.sonos.com/login/v3/oauth/access"
+    url = f"{SONOS_AUTH_URL}/login/v3/oauth/access"
     payload = {"grant_type": "refresh_token", "refresh_token": refresh_token_value}
     credentials = f"{client_id}:{client_secret}"
     encoded = base64.b64encode(credentials.encode()).decode()
@@ -21,14 +26,14 @@ async def refresh_token(refresh_token_value, client_id, client_secret, session):
         return data["access_token"]
 
 async def get_household_id(access_token, session):
-    url = "https://api.ws.sonos.com/control/api/v1/households"
+    url = f"{SONOS_CONTROL_URL}/households"
     headers = {"Authorization": f"Bearer {access_token}"}
     async with session.get(url, headers=headers, ssl=ssl_context) as resp:
         data = await resp.json()
         return data["households"][0]["id"]
 
 async def get_groups(household_id, access_token, session):
-    url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
+    url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups"
     headers = {"Authorization": f"Bearer {access_token}"}
     async with session.get(url, headers=headers, ssl=ssl_context) as resp:
         data = await resp.json()
@@ -53,7 +58,7 @@ async def poll_for_group(household_id, access_token, player_ids, session, timeou
     raise Exception("Timed out waiting for group formation.")
 
 async def create_group(household_id, player_ids, access_token, session):
-    url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups/createGroup"
+    url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups/createGroup"
     headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
     payload = {"playerIds": player_ids}
     async with session.post(url, headers=headers, json=payload, ssl=ssl_context) as resp:
@@ -61,7 +66,7 @@ async def create_group(household_id, player_ids, access_token, session):
         return data.get("id") or await poll_for_group(household_id, access_token, player_ids, session)
 
 async def load_favorite_playlist(group_id, favorite_id, access_token, session):
-    url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/favorites"
+    url = f"{SONOS_CONTROL_URL}/groups/{group_id}/favorites"
     headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
     payload = {"favoriteId": favorite_id}
     async with session.post(url, headers=headers, json=payload, ssl=ssl_context) as resp:
@@ -69,7 +74,7 @@ async def load_favorite_playlist(group_id, favorite_id, access_token, session):
             raise Exception(await resp.text())
 
 async def set_player_volume(player_id, volume, access_token, session):
-    url = f"https://api.ws.sonos.com/control/api/v1/players/{player_id}/playerVolume"
+    url = f"{SONOS_CONTROL_URL}/players/{player_id}/playerVolume"
     headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
     payload = {"volume": volume}
     async with session.post(url, headers=headers, json=payload, ssl=ssl_context) as resp:
@@ -77,7 +82,7 @@ async def set_player_volume(player_id, volume, access_token, session):
             raise Exception(await resp.text())
 
 async def play_group(group_id, access_token, session):
-    url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback/play"
+    url = f"{SONOS_CONTROL_URL}/groups/{group_id}/playback/play"
     headers = {"Authorization": f"Bearer {access_token}"}
     async with session.post(url, headers=headers, ssl=ssl_context) as resp:
         if resp.status != 200:
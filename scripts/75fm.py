@@ -4,15 +4,20 @@ import base64
 import certifi
 import ssl
 import time
+import os
 
 # Create an SSL context using certifi's CA bundle.
 ssl_context = ssl.create_default_context(cafile=certifi.where())
 
+# SONOS_API_BASE_URL points every request at a stand-in server (see backend/benchmarks/fake_sonos.py)
+SONOS_AUTH_URL = os.environ.get("SONOS_API_BASE_URL") or "https://api.sonos.com"
+SONOS_CONTROL_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.ws.sonos.com") + "/control/api/v1"
+
 # ----------------- ASYNC GROUPING AND PLAYBACK FUNCTIONS -----------------
 
 async def refresh_token(refresh_token_value, client_id, client_secret, session):
     print("Refreshing access token...")
-    url = "https://api.sonos.com/login/v3/oauth/access"
+    url = f"{SONOS_AUTH_URL}/login/v3/oauth/access"
     payload = {"grant_type": "refresh_token", "refresh_token": refresh_token_value}
     credentials = f"{client_id}:{client_secret}"
     credentials_encoded = base64.b64encode(credentials.encode()).decode()
@@ -28,7 +33,7 @@ async def refresh_token(refresh_token_value, client_id, client_secret, session):
 async def get_household_id(access_token, session):
     print("Retrieving household ID...")
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
-    url = "https://api.ws.sonos.com/control/api/v1/households"
+    url = f"{SONOS_CONTROL_URL}/households"
     async with session.get(url, headers=headers, ssl=ssl_context) as response:
         if response.status != 200:
             text = await response.text()
@@ -40,7 +45,7 @@ async def get_household_id(access_token, session):
 
 async def get_groups(household_id, access_token, session):
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
-    url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
+    url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups"
     async with session.get(url, headers=headers, ssl=ssl_context) as response:
         if response.status != 200:
             text = await response.text()
@@ -75,7 +80,7 @@ async def create_group(household_id, player_ids, access_token, session):
         "Authorization": f"Bearer {access_token}",
         "accept": "application/json"
     }
-    url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups/createGroup"
+    url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups/createGroup"
     payload = {"playerIds": player_ids}
     print(f"Create group request: householdId={household_id}, playerIds={player_ids}")
     async with session.post(url, headers=headers, json=payload, ssl=ssl_context) as response:
@@ -100,7 +105,7 @@ async def create_group(household_id, player_ids, access_token, session):
 async def load_favorite_playlist(group_id, favorite_playlist_id, access_token, session):
     print(f"Loading favorite playlist with ID: {favorite_playlist_id}...")
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
-    url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/favorites"
+    url = f"{SONOS_CONTROL_URL}/groups/{group_id}/favorites"
     payload = {"favoriteId": favorite_playlist_id}
     async with session.post(url, headers=headers, json=payload, ssl=ssl_context) as response:
         if response.status != 200:
@@ -111,7 +116,7 @@ async def load_favorite_playlist(group_id, favorite_playlist_id, access_token, s
 async def set_player_volume(player_id, volume, access_token, session):
     print(f"Setting volume to {volume} for player {player_id}...")
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
-    url = f"https://api.ws.sonos.com/control/api/v1/players/{player_id}/playerVolume"
+    url = f"{SONOS_CONTROL_URL}/players/{player_id}/playerVolume"
     payload = {"volume": volume}
     async with session.post(url, headers=headers, json=payload, ssl=ssl_context) as response:
         if response.status != 200:
@@ -122,7 +127,7 @@ async def set_player_volume(player_id, volume, access_token, session):
 async def play_group(group_id, access_token, session):
     print(f"Starting playback for group {group_id}...")
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {access_token}"}
-    url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback/play"
+    url = f"{SONOS_CONTROL_URL}/groups/{group_id}/playback/play"
     async with session.post(url, headers=headers, ssl=ssl_context) as response:
         if response.status != 200:
             text = await response.text()
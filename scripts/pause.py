@@ -1,10 +1,15 @@
 import requests
 import base64
 import time
+import os
+
+# SONOS_API_BASE_URL points every request at a stand-in server (see backend/benchmarks/fake_sonos.py)
+SONOS_AUTH_URL = os.environ.get("SONOS_API_BASE_URL") or "https://api.sonos.com"
+SONOS_CONTROL_URL = (os.environ.get("SONOS_API_BASE_URL") or "https://api.ws.sonos.com") + "/control/api/v1"
 
 def refresh_token(refresh_token_value, client_id, client_secret):
     print("Refreshing access token...")
-    url = "https://api.sonos.com/login/v3/oauth/access"
+    url = f"{SONOS_AUTH_URL}/login/v3/oauth/access"
     payload = {
         "grant_type": "refresh_token",
         "refresh_token": refresh_token_value
@@ -27,7 +32,7 @@ def get_household_id(access_token):
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
-    url = "https://api.ws.sonos.com/control/api/v1/households"
+    url = f"{SONOS_CONTROL_URL}/households"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
         raise Exception(f"Error getting households: {response.text}")
@@ -41,7 +46,7 @@ def get_group_id(household_id, access_token):
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
-    url = f"https://api.ws.sonos.com/control/api/v1/households/{household_id}/groups"
+    url = f"{SONOS_CONTROL_URL}/households/{household_id}/groups"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
         raise Exception(f"Error getting groups: {response.text}")
@@ -56,7 +61,7 @@ def pause_playback(group_id, access_token):
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
-    url = f"https://api.ws.sonos.com/control/api/v1/groups/{group_id}/playback/pause"
+    url = f"{SONOS_CONTROL_URL}/groups/{group_id}/playback/pause"
     response = requests.post(url, headers=headers)
     if response.status_code == 200:
         print("Playback paused successfully.")